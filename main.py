@@ -1,5 +1,6 @@
 import sys
 import os # Importation de os pour les opérations de chemin
+import multiprocessing
 
 # Déterminer le répertoire de base de l'application.
 # Si l'application est exécutée par PyInstaller en mode 'onefile', sys._MEIPASS pointe
@@ -27,6 +28,9 @@ from main.launcher import ZombieRoolLauncher
 
 # --- DÉBUT DE L'APPLICATION ---
 if __name__ == "__main__":
+    # Les processus de l'optimiseur de monde relancent l'exécutable PyInstaller : ils doivent s'arrêter ici
+    multiprocessing.freeze_support()
+
     # Créer l'instance de l'application PyQt
     app = QApplication(sys.argv)
     
@@ -0,0 +1,281 @@
+# ZombieRoolLauncher/main/archive_formats.py
+import os
+import io
+import time
+import zlib
+import struct
+import hashlib
+import tarfile
+import zipfile
+import tempfile
+
+try:
+    import zstandard # Optional: needed for .tar.zst archives and zstd-compressed ZIP entries
+except ImportError:
+    zstandard = None
+
+# Size of the blocks used when streaming archive entries
+CHUNK_SIZE = 1024 * 1024 # 1 MB
+
+# Archive formats accepted in the "format" field of a catalog entry
+FORMAT_ZIP = "zip"
+FORMAT_TAR_ZSTD = "tar.zst"
+SUPPORTED_FORMATS = (FORMAT_ZIP, FORMAT_TAR_ZSTD)
+
+# ZIP compression method 93 (zstd), natively supported by zipfile starting with Python 3.14
+ZIP_ZSTANDARD = getattr(zipfile, 'ZIP_ZSTANDARD', 93)
+ZIP_ZSTANDARD_NATIVE = hasattr(zipfile, 'ZIP_ZSTANDARD')
+
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+ZIP_MAGIC = b'PK'
+
+# Entries bigger than this are spooled to disk instead of memory when their CRC must be computed
+SPOOL_MAX_MEMORY = 64 * 1024 * 1024
+
+
+class UnsupportedArchiveError(Exception):
+    """Raised when an archive uses a format or compression this installation cannot read."""
+
+
+def _require_zstandard():
+    if zstandard is None:
+        raise UnsupportedArchiveError("This archive is zstd-compressed. Install the 'zstandard' package to open it.")
+
+
+def detect_archive_format(path, declared_format=None):
+    """
+    Returns the format of an archive: the one declared in the catalog if any,
+    otherwise guessed from the first bytes of the file.
+    """
+    if declared_format in SUPPORTED_FORMATS:
+        return declared_format
+    with open(path, 'rb') as f:
+        magic = f.read(4)
+    if magic == ZSTD_MAGIC:
+        return FORMAT_TAR_ZSTD
+    if magic.startswith(ZIP_MAGIC) or path.lower().endswith('.zip'):
+        return FORMAT_ZIP
+    if path.lower().endswith(('.tar.zst', '.tzst')):
+        return FORMAT_TAR_ZSTD
+    return FORMAT_ZIP
+
+
+class _BoundedReader(io.RawIOBase):
+    """Read-only view over the next `size` bytes of a file object."""
+    def __init__(self, fp, size):
+        self.fp = fp
+        self.remaining = size
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self.remaining <= 0:
+            return 0
+        data = self.fp.read(min(len(buffer), self.remaining))
+        buffer[:len(data)] = data
+        self.remaining -= len(data)
+        return len(data)
+
+    def close(self):
+        self.fp.close()
+        super().close()
+
+
+def open_zip_entry(zip_ref, info):
+    """
+    Opens a ZIP entry for reading. Entries compressed with method 93 (zstd) are decoded
+    with the 'zstandard' package when zipfile cannot handle them itself.
+    """
+    if info.compress_type != ZIP_ZSTANDARD or ZIP_ZSTANDARD_NATIVE:
+        return zip_ref.open(info, 'r')
+    _require_zstandard()
+    fp = open(zip_ref.filename, 'rb')
+    fp.seek(info.header_offset)
+    header = fp.read(30)
+    if len(header) != 30 or header[:4] != b'PK\x03\x04':
+        fp.close()
+        raise zipfile.BadZipFile(f"Bad local file header for '{info.filename}'")
+    name_length, extra_length = struct.unpack('<HH', header[26:30])
+    fp.seek(name_length + extra_length, os.SEEK_CUR)
+    raw = io.BufferedReader(_BoundedReader(fp, info.compress_size), CHUNK_SIZE)
+    return zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True, closefd=True)
+
+
+class ArchiveEntry:
+    """A regular file stored in an archive: its name, size, CRC32 and a way to read it."""
+    def __init__(self, name, size, crc32, opener):
+        self.name = name
+        self.size = size
+        self.stored_crc32 = crc32 # Recorded by the archive (ZIP central directory), None for tar entries
+        self._crc32 = crc32
+        self._opener = opener
+        self._spool = None
+
+    @property
+    def crc32(self):
+        """
+        CRC32 of the entry. ZIP entries carry it in the central directory; for tar entries
+        it is computed by reading the entry once into a spool that later reads reuse.
+        """
+        if self._crc32 is None:
+            self._spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+            crc = 0
+            with self._opener() as source:
+                while True:
+                    block = source.read(CHUNK_SIZE)
+                    if not block:
+                        break
+                    crc = zlib.crc32(block, crc)
+                    self._spool.write(block)
+            self._crc32 = crc & 0xFFFFFFFF
+        return self._crc32
+
+    def open(self):
+        if self._spool is not None:
+            self._spool.seek(0)
+            return _NonClosingReader(self._spool)
+        return self._opener()
+
+    def release(self):
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+
+
+class _NonClosingReader:
+    """Context manager around a spool that must stay open after being read."""
+    def __init__(self, fp):
+        self.fp = fp
+
+    def read(self, size=-1):
+        return self.fp.read(size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def _open_tar_zst_stream(path):
+    _require_zstandard()
+    fp = open(path, 'rb')
+    reader = zstandard.ZstdDecompressor().stream_reader(fp, read_across_frames=True, closefd=True)
+    return tarfile.open(fileobj=reader, mode='r|')
+
+
+def iter_archive_entries(path, archive_format=None):
+    """
+    Yields an ArchiveEntry for every regular file of a ZIP or .tar.zst archive.
+    Tar archives are streamed: an entry must be read before moving on to the next one.
+    """
+    archive_format = detect_archive_format(path, archive_format)
+    if archive_format == FORMAT_TAR_ZSTD:
+        with _open_tar_zst_stream(path) as tar_ref:
+            for member in tar_ref:
+                if not member.isfile():
+                    continue # Directories, links and devices are never installed
+                entry = ArchiveEntry(member.name, member.size, None, lambda m=member: tar_ref.extractfile(m))
+                try:
+                    yield entry
+                finally:
+                    entry.release()
+    else:
+        with zipfile.ZipFile(path, 'r') as zip_ref:
+            for info in zip_ref.infolist():
+                if info.is_dir():
+                    continue
+                yield ArchiveEntry(info.filename, info.file_size, info.CRC, lambda i=info: open_zip_entry(zip_ref, i))
+
+
+def list_archive_names(path, archive_format=None):
+    """Returns the names of all entries (files and folders) of a ZIP or .tar.zst archive."""
+    archive_format = detect_archive_format(path, archive_format)
+    if archive_format == FORMAT_TAR_ZSTD:
+        with _open_tar_zst_stream(path) as tar_ref:
+            return [member.name + ('/' if member.isdir() else '') for member in tar_ref]
+    with zipfile.ZipFile(path, 'r') as zip_ref:
+        return zip_ref.namelist()
+
+
+def extract_entry_atomically(entry, destination_path):
+    """
+    Writes an archive entry next to its destination, then swaps it into place.
+    Returns the (crc32, sha256 hex digest) of the written data.
+    Raises zipfile.BadZipFile, leaving the destination untouched, if the data does not match the
+    CRC32 recorded by the archive (zipfile checks it, the zstd decoder of open_zip_entry does not).
+    """
+    os.makedirs(os.path.dirname(destination_path), exist_ok=True)
+    temp_path = f"{destination_path}.zrl-part"
+    crc = 0
+    sha256 = hashlib.sha256()
+    try:
+        with entry.open() as source, open(temp_path, 'wb') as target:
+            while True:
+                block = source.read(CHUNK_SIZE)
+                if not block:
+                    break
+                crc = zlib.crc32(block, crc)
+                sha256.update(block)
+                target.write(block)
+        if entry.stored_crc32 is not None and crc & 0xFFFFFFFF != entry.stored_crc32:
+            raise zipfile.BadZipFile(f"Bad CRC-32 for file '{entry.name}'")
+        os.replace(temp_path, destination_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return crc & 0xFFFFFFFF, sha256.hexdigest()
+
+
+def get_output_formats():
+    """
+    Formats the upload tab can produce: {key: (archive format, zip compression)}.
+    zstd ZIPs can only be written when zipfile supports method 93 (Python 3.14+).
+    """
+    formats = {"zip": (FORMAT_ZIP, zipfile.ZIP_DEFLATED)}
+    if zstandard is not None:
+        formats["tar.zst"] = (FORMAT_TAR_ZSTD, None)
+    if ZIP_ZSTANDARD_NATIVE:
+        formats["zip-zstd"] = (FORMAT_ZIP, ZIP_ZSTANDARD)
+    return formats
+
+
+def repack_archive(source_zip_path, destination_path, output_format, level=10):
+    """
+    Rewrites a map ZIP into another supported output format (see get_output_formats).
+    Entry names and contents are kept as they are.
+    """
+    archive_format, zip_compression = get_output_formats()[output_format]
+    with zipfile.ZipFile(source_zip_path, 'r') as source_zip:
+        if archive_format == FORMAT_TAR_ZSTD:
+            compressor = zstandard.ZstdCompressor(level=level, threads=-1)
+            with open(destination_path, 'wb') as raw_output, \
+                 compressor.stream_writer(raw_output, closefd=False) as zstd_output, \
+                 tarfile.open(fileobj=zstd_output, mode='w|') as tar_ref:
+                for info in source_zip.infolist():
+                    tar_info = tarfile.TarInfo(info.filename.rstrip('/'))
+                    tar_info.mtime = int(time.mktime(info.date_time + (0, 0, -1)))
+                    if info.is_dir():
+                        tar_info.type = tarfile.DIRTYPE
+                        tar_info.mode = 0o755
+                        tar_ref.addfile(tar_info)
+                        continue
+                    tar_info.size = info.file_size
+                    tar_info.mode = 0o644
+                    with open_zip_entry(source_zip, info) as source:
+                        tar_ref.addfile(tar_info, source)
+        else:
+            with zipfile.ZipFile(destination_path, 'w', compression=zip_compression, compresslevel=level) as output_zip:
+                for info in source_zip.infolist():
+                    output_info = zipfile.ZipInfo(info.filename, info.date_time)
+                    output_info.compress_type = zip_compression
+                    if info.is_dir():
+                        output_zip.writestr(output_info, b"")
+                        continue
+                    with open_zip_entry(source_zip, info) as source, output_zip.open(output_info, 'w') as target:
+                        while True:
+                            block = source.read(CHUNK_SIZE)
+                            if not block:
+                                break
+                            target.write(block)
@@ -0,0 +1,174 @@
+# ZombieRoolLauncher/main/catalog_shards.py
+import os
+import gzip
+import json
+import hashlib
+from urllib.parse import quote
+
+import requests
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from main.constants import CACHE_DIR_PATH, CATALOG_BASE_URL
+from main.incremental_install import get_checksum_index_path
+
+# Sharded catalog published next to updates.json (paths relative to the repository root):
+#   catalog/index.json          one summary per map
+#   catalog/index.json.gz       the same, gzip-compressed: what launchers download first
+#   catalog/maps/<map id>.json  full entry of a map, fetched when it is installed or verified
+# The launcher, mod, admins and content pack sections are edited by hand in updates.json, without
+# the index being published again: launchers always read them from updates.json.
+# The "schema" field of the index is checked before it is used; an unknown schema falls back to updates.json.
+CATALOG_DIR = "catalog"
+CATALOG_INDEX_PATH = f"{CATALOG_DIR}/index.json"
+CATALOG_INDEX_GZIP_PATH = f"{CATALOG_INDEX_PATH}.gz"
+CATALOG_SCHEMA_VERSION = 2 # Schema 1 also copied the hand-edited sections of updates.json
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+# Details already fetched, named by their SHA-256: a map version is only downloaded once
+CATALOG_DETAILS_DIR = os.path.join(CACHE_DIR_PATH, 'catalog_details')
+
+SUMMARY_DESCRIPTION_LENGTH = 200 # Characters of the description kept in the index (list and search)
+SUMMARY_WORLD_KEYS = ("version_name", "game_mode") # Shown on the catalog rows
+
+
+def get_map_detail_path(map_id):
+    return f"{CATALOG_DIR}/maps/{map_id}.json"
+
+
+def _dump_detail(map_info):
+    """Serialized detail document. Keys are sorted so an unchanged entry keeps the same hash."""
+    return json.dumps(map_info, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+
+
+def _summarize_map(map_info, detail_sha256):
+    summary = {key: map_info[key] for key in ("id", "name", "latest_version", "author", "thumbnail_url", "tags") if map_info.get(key)}
+    description = map_info.get('description') or ""
+    summary["description"] = description if len(description) <= SUMMARY_DESCRIPTION_LENGTH \
+        else description[:SUMMARY_DESCRIPTION_LENGTH].rstrip() + "..."
+    world = {key: value for key, value in (map_info.get('world') or {}).items() if key in SUMMARY_WORLD_KEYS}
+    if world:
+        summary["world"] = world
+    summary["detail_sha256"] = detail_sha256
+    return summary
+
+
+def build_catalog_shards(updates_data):
+    """
+    Splits the content of updates.json into the sharded catalog.
+    Returns {repository path: file content} for the index and every map detail document.
+    """
+    files = {}
+    map_summaries = []
+    for map_info in updates_data.get('maps', []):
+        if not map_info.get('id'):
+            continue
+        detail = _dump_detail(map_info)
+        files[get_map_detail_path(map_info['id'])] = detail
+        map_summaries.append(_summarize_map(map_info, hashlib.sha256(detail.encode('utf-8')).hexdigest()))
+
+    index = {
+        "schema": CATALOG_SCHEMA_VERSION,
+        "maps": map_summaries
+    }
+    files[CATALOG_INDEX_PATH] = json.dumps(index, ensure_ascii=False, separators=(',', ':'))
+    return files
+
+
+def compress_catalog_index(index_text):
+    """gzip form of the index. mtime is fixed so an unchanged index gives the same bytes."""
+    return gzip.compress(index_text.encode('utf-8'), compresslevel=9, mtime=0)
+
+
+def parse_catalog_index(content):
+    """Parses a downloaded index, gzip-compressed or plain JSON (an HTTP layer may already have decompressed it)."""
+    if content[:2] == GZIP_MAGIC:
+        content = gzip.decompress(content)
+    return json.loads(content)
+
+
+def is_map_summary(map_info):
+    """True for a map entry of the index whose detail document was not loaded yet."""
+    return bool(map_info.get('detail_sha256')) and 'download_url' not in map_info
+
+
+def _get_detail_cache_path(detail_sha256):
+    return os.path.join(CATALOG_DETAILS_DIR, f"{detail_sha256}.json")
+
+
+def load_cached_map_detail(summary):
+    """Full entry of a map from the detail cache, or None if this version was never fetched."""
+    try:
+        with open(_get_detail_cache_path(summary['detail_sha256']), 'r', encoding='utf-8') as f:
+            return dict(json.load(f), detail_sha256=summary['detail_sha256'])
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def fetch_map_detail(summary, base_url=CATALOG_BASE_URL):
+    """
+    Downloads the detail document of a map, checks it against the hash of the index and caches it.
+    Returns the full entry. Raises ValueError if the document does not match the index (one of
+    them is stale: the catalog has to be refreshed).
+    """
+    cached = load_cached_map_detail(summary)
+    if cached is not None:
+        return cached
+    url = f"{base_url}maps/{quote(summary['id'])}.json"
+    response = requests.get(url, timeout=15)
+    response.raise_for_status()
+    if hashlib.sha256(response.content).hexdigest() != summary['detail_sha256']:
+        raise ValueError(f"Catalog details of '{summary['id']}' do not match the catalog index. Refresh the map catalog.")
+    detail = json.loads(response.content)
+    os.makedirs(CATALOG_DETAILS_DIR, exist_ok=True)
+    temp_path = f"{_get_detail_cache_path(summary['detail_sha256'])}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(response.content)
+    os.replace(temp_path, _get_detail_cache_path(summary['detail_sha256']))
+    print(f"DEBUG: Fetched catalog details of map '{summary['id']}'.")
+    return dict(detail, detail_sha256=summary['detail_sha256'])
+
+
+def get_catalog_index_maps(index):
+    """
+    The maps of a catalog index, for the 'maps' of updates_data. They stay summaries (see
+    is_map_summary) until their details are needed: fetch_map_detail reads the detail cache
+    first, so reading thousands of cached files is not paid on every startup.
+    """
+    if index.get('schema') != CATALOG_SCHEMA_VERSION:
+        raise ValueError(f"Unsupported catalog schema: {index.get('schema')}")
+    maps = index.get('maps', [])
+    print(f"DEBUG: Catalog index: {len(maps)} maps.")
+    return maps
+
+
+def load_installed_map_details(updates_data, saves_dir):
+    """
+    Copy of updates_data where the maps installed by the launcher in saves_dir have their full
+    entry (verification needs their hashes). Blocking: call it from a worker thread.
+    """
+    maps = []
+    for map_info in (updates_data or {}).get('maps', []):
+        world_dir = os.path.join(saves_dir or "", map_info.get('name', ""))
+        if is_map_summary(map_info) and saves_dir and os.path.exists(get_checksum_index_path(world_dir)):
+            map_info = fetch_map_detail(map_info)
+        maps.append(map_info)
+    return dict(updates_data or {}, maps=maps)
+
+
+class MapDetailThread(QThread):
+    """Fetches the detail documents of catalog maps (see fetch_map_detail) off the GUI thread."""
+    details_ready = pyqtSignal(list) # Full map entries
+    detail_error = pyqtSignal(str)
+
+    def __init__(self, summaries):
+        super().__init__()
+        self.summaries = list(summaries)
+
+    def run(self):
+        try:
+            self.details_ready.emit([fetch_map_detail(summary) for summary in self.summaries])
+        except (requests.exceptions.RequestException, ValueError, OSError) as e:
+            print(f"DEBUG: MapDetailThread error: {e}")
+            self.detail_error.emit(str(e))
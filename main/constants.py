@@ -12,11 +12,21 @@ __version__ = "4.2.0" # Updated version
 # "https://raw.githubusercontent.com/...". Do not use a classic "github.com" URL.
 UPDATES_JSON_URL = "https://raw.githubusercontent.com/Cryo60/ZombieRoolLauncher/refs/heads/main/updates.json"
 
+# Sharded catalog published next to updates.json: a small index plus one detail file per map
+# (see main/catalog_shards.py). Launchers read the index first and fall back to updates.json.
+CATALOG_BASE_URL = "https://raw.githubusercontent.com/Cryo60/ZombieRoolLauncher/refs/heads/main/catalog/"
+CATALOG_INDEX_URL = f"{CATALOG_BASE_URL}index.json"
+CATALOG_INDEX_GZIP_URL = f"{CATALOG_BASE_URL}index.json.gz" # Compressed form, downloaded first
+
 # File name prefix of the mod as it typically appears in the mods folder (for local detection)
 # Adapt this name to match the actual format of your mod files.
 # Ex: if your mod is named 'ZombieRool-1.3.0.jar', you could use 'ZombieRool-'
 MOD_FILE_PREFIX = "ZombieRool-"
 
+# Mod id declared in the mod's META-INF/mods.toml. The installed version is read from the jar's
+# metadata, so a renamed jar is still recognized.
+MOD_ID = "zombierool"
+
 # GitHub Repository Information for Map Uploads (YOU MUST CONFIGURE THESE!)
 # Replace with your GitHub organization/user name and repository name
 # Example: "Cryo60" and "ZombieRoolLauncher"
@@ -36,3 +46,6 @@ def get_config_file_base_path():
 
 # Full path to the configuration file
 CONFIG_FILE_PATH = os.path.join(get_config_file_base_path(), 'config.json')
+
+# Directory holding the launcher's local caches and indexes (checksums, manifests...)
+CACHE_DIR_PATH = os.path.join(get_config_file_base_path(), 'cache')
@@ -0,0 +1,150 @@
+# ZombieRoolLauncher/main/content_manifest.py
+import os
+import json
+import time
+import hashlib
+
+from main.constants import CACHE_DIR_PATH
+from main.archive_formats import iter_archive_entries, extract_entry_atomically
+from main.incremental_install import safe_join
+
+# Folder (inside the cache directory) holding the installed manifests of content packs
+CONTENT_MANIFEST_DIR = os.path.join(CACHE_DIR_PATH, 'content_manifests')
+
+
+def _instance_key(mods_dir):
+    """Short, stable key identifying a mods folder (one set of manifests per instance)."""
+    return hashlib.sha1(os.path.normcase(os.path.abspath(mods_dir)).encode('utf-8')).hexdigest()[:16]
+
+
+def get_content_manifest_path(mods_dir, pack_id):
+    """Returns the path of the installed manifest of a content pack for a given mods folder."""
+    safe_id = "".join(c if c.isalnum() or c in "-_." else "_" for c in pack_id)
+    return os.path.join(CONTENT_MANIFEST_DIR, _instance_key(mods_dir), f"{safe_id}.json")
+
+
+def load_content_manifest(mods_dir, pack_id):
+    """Loads the installed manifest of a content pack, or None if it was never installed."""
+    manifest_path = get_content_manifest_path(mods_dir, pack_id)
+    if not os.path.exists(manifest_path):
+        return None
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"Error loading content manifest '{manifest_path}': {e}")
+        return None
+
+
+def save_content_manifest(mods_dir, manifest):
+    manifest_path = get_content_manifest_path(mods_dir, manifest['id'])
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    temp_path = f"{manifest_path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=4)
+    os.replace(temp_path, manifest_path)
+
+
+def list_installed_content_packs(mods_dir):
+    """Returns the manifests of every content pack installed into a mods folder."""
+    manifests_dir = os.path.dirname(get_content_manifest_path(mods_dir, "_"))
+    manifests = []
+    if os.path.isdir(manifests_dir):
+        for filename in sorted(os.listdir(manifests_dir)):
+            if filename.endswith(".json"):
+                manifest = load_content_manifest(mods_dir, filename[:-len(".json")])
+                if manifest:
+                    manifests.append(manifest)
+    return manifests
+
+
+def _is_unchanged(mods_dir, relative_path, recorded, entry):
+    """
+    True if the archive entry matches what the manifest says was installed
+    and the installed file has not been touched since.
+    """
+    if not recorded or recorded.get('size') != entry.size or recorded.get('crc32') != entry.crc32:
+        return False
+    local_path = safe_join(mods_dir, relative_path)
+    if not local_path or not os.path.isfile(local_path):
+        return False
+    st = os.stat(local_path)
+    return st.st_size == recorded['size'] and st.st_mtime_ns == recorded.get('mtime_ns')
+
+
+def install_content_pack(archive_path, mods_dir, pack_info, force_paths=()):
+    """
+    Installs (or upgrades) a content pack into mods_dir and records what was written
+    in the pack's installed manifest.
+
+    Jars whose CRC32/size match the previous manifest and are still intact on disk are
+    left alone, new or changed jars are written, and jars installed by an older version
+    of the pack that are no longer part of it are deleted.
+    force_paths lists jars (relative paths) to rewrite anyway, e.g. the ones a
+    verification found corrupted even though their size and mtime did not change.
+    Returns a dict of statistics: written, skipped, removed.
+    """
+    previous = load_content_manifest(mods_dir, pack_info['id']) or {}
+    previous_files = previous.get('files', {})
+    new_files = {}
+    stats = {"written": 0, "skipped": 0, "removed": 0}
+
+    for entry in iter_archive_entries(archive_path, pack_info.get('format')):
+        local_path = safe_join(mods_dir, entry.name)
+        if local_path is None:
+            print(f"WARNING: Skipping unsafe content pack entry '{entry.name}'.")
+            continue
+        relative_path = os.path.relpath(local_path, mods_dir).replace(os.sep, '/')
+
+        recorded = previous_files.get(relative_path)
+        if relative_path not in force_paths and _is_unchanged(mods_dir, relative_path, recorded, entry):
+            new_files[relative_path] = recorded
+            stats["skipped"] += 1
+            continue
+
+        crc, sha256 = extract_entry_atomically(entry, local_path)
+        st = os.stat(local_path)
+        new_files[relative_path] = {
+            "sha256": sha256,
+            "crc32": crc,
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns
+        }
+        stats["written"] += 1
+
+    # Remove the jars left behind by the previous version of the pack
+    for relative_path in set(previous_files) - set(new_files):
+        local_path = safe_join(mods_dir, relative_path)
+        if local_path and os.path.isfile(local_path):
+            os.remove(local_path)
+            stats["removed"] += 1
+            print(f"DEBUG: Removed stale content pack file: {relative_path}")
+
+    save_content_manifest(mods_dir, {
+        "id": pack_info['id'],
+        "name": pack_info.get('name', pack_info['id']),
+        "version": pack_info.get('version', ""),
+        "installed_at": int(time.time()),
+        "files": new_files
+    })
+    print(f"DEBUG: Content pack '{pack_info['id']}' installed into '{mods_dir}': {stats}")
+    return stats
+
+
+def uninstall_content_pack(mods_dir, pack_id):
+    """
+    Removes exactly the files listed in a content pack's installed manifest, then the manifest.
+    Returns the number of files deleted.
+    """
+    manifest = load_content_manifest(mods_dir, pack_id)
+    if not manifest:
+        return 0
+    removed = 0
+    for relative_path in manifest.get('files', {}):
+        local_path = safe_join(mods_dir, relative_path)
+        if local_path and os.path.isfile(local_path):
+            os.remove(local_path)
+            removed += 1
+    os.remove(get_content_manifest_path(mods_dir, pack_id))
+    print(f"DEBUG: Content pack '{pack_id}' uninstalled from '{mods_dir}' ({removed} files removed).")
+    return removed
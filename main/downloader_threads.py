@@ -2,9 +2,45 @@ import os
 import json
 import requests
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 from PyQt6.QtCore import QThread, pyqtSignal
 
+from main.constants import CACHE_DIR_PATH
+from main.catalog_shards import get_catalog_index_maps, parse_catalog_index
+
+# Sections of updates.json edited by hand (never in the catalog index), with the ETag of the
+# updates.json they were read from: an unchanged updates.json is not downloaded again
+UPDATES_SECTIONS_CACHE_PATH = os.path.join(CACHE_DIR_PATH, 'updates_sections.json')
+UPDATES_SECTIONS_FORMAT_VERSION = 1
+UPDATES_SECTIONS = ("launcher", "mod", "admins", "content_packs")
+
+
+def _load_updates_sections_cache():
+    """{"etag", "last_modified", "sections"} of the last updates.json downloaded, or None."""
+    try:
+        with open(UPDATES_SECTIONS_CACHE_PATH, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') == UPDATES_SECTIONS_FORMAT_VERSION and (data.get('etag') or data.get('last_modified')):
+            return data
+    except FileNotFoundError:
+        pass
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"DEBUG: Ignoring unreadable updates.json cache: {e}")
+    return None
+
+
+def _save_updates_sections_cache(update_data, etag, last_modified):
+    try:
+        os.makedirs(os.path.dirname(UPDATES_SECTIONS_CACHE_PATH), exist_ok=True)
+        temp_path = f"{UPDATES_SECTIONS_CACHE_PATH}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": UPDATES_SECTIONS_FORMAT_VERSION, "etag": etag, "last_modified": last_modified,
+                       "sections": {key: update_data[key] for key in UPDATES_SECTIONS if key in update_data}}, f, separators=(',', ':'))
+        os.replace(temp_path, UPDATES_SECTIONS_CACHE_PATH)
+    except IOError as e:
+        print(f"Error saving updates.json cache: {e}")
+
 # --- THREAD FOR NON-BLOCKING NETWORK OPERATIONS ---
 # It is crucial to perform network requests (downloading updates.json)
 # in a separate thread so as not to block the user interface (UI).
@@ -15,27 +51,79 @@ class UpdateCheckerThread(QThread):
     # Signal emitted in case of an error during the request
     error_occurred = pyqtSignal(str)
     
-    def __init__(self, url, cache_bust=False): # Add cache_bust parameter
+    def __init__(self, url, cache_bust=False, index_urls=()): # Add cache_bust parameter
         super().__init__()
         self.url = url
+        self.index_urls = index_urls # Forms of the sharded catalog index, by preference, tried before the full updates.json
         self.update_data = None # Will store JSON data after download
         self.cache_bust = cache_bust
 
+    def _get_fetch_url(self, url):
+        # Add a unique timestamp to the URL to bypass caching
+        return f"{url}?_={int(time.time() * 1000)}" if self.cache_bust else url
+
+    def _fetch_catalog_index(self):
+        """The maps of the sharded catalog index, or None to fall back to updates.json."""
+        for index_url in self.index_urls:
+            try:
+                start = time.perf_counter()
+                response = requests.get(self._get_fetch_url(index_url), timeout=10)
+                response.raise_for_status()
+                downloaded = time.perf_counter()
+                maps = get_catalog_index_maps(parse_catalog_index(response.content))
+                print(f"DEBUG: Catalog index '{index_url}': {len(response.content)} bytes, downloaded in "
+                      f"{(downloaded - start) * 1000:.0f} ms, parsed in {(time.perf_counter() - downloaded) * 1000:.1f} ms.")
+                return maps
+            except (requests.exceptions.RequestException, OSError, EOFError, ValueError) as e: # Bad gzip data, JSONDecodeError, unknown schema
+                print(f"DEBUG: Catalog index '{index_url}' not used: {e}")
+        return None
+
+    def _fetch_updates_json(self, cached_sections=None):
+        """
+        Downloads and parses updates.json. With cached_sections (see _load_updates_sections_cache),
+        the request carries their ETag: returns None if updates.json did not change since.
+        """
+        headers = {}
+        if cached_sections:
+            if cached_sections.get('etag'):
+                headers['If-None-Match'] = cached_sections['etag']
+            if cached_sections.get('last_modified'):
+                headers['If-Modified-Since'] = cached_sections['last_modified']
+        start = time.perf_counter()
+        response = requests.get(self._get_fetch_url(self.url), headers=headers, timeout=10) # Timeout to prevent too long a block
+        if headers and response.status_code == 304:
+            print(f"DEBUG: updates.json not modified ({(time.perf_counter() - start) * 1000:.0f} ms).")
+            return None
+        response.raise_for_status() # Raises an exception for HTTP error codes (4xx or 5xx)
+        downloaded = time.perf_counter()
+        update_data = response.json() # Parses the JSON response
+        print(f"DEBUG: updates.json: {len(response.content)} bytes, downloaded in {(downloaded - start) * 1000:.0f} ms, "
+              f"parsed in {(time.perf_counter() - downloaded) * 1000:.1f} ms.")
+        _save_updates_sections_cache(update_data, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        return update_data
+
     def run(self):
         """
         Method executed when the thread is started.
-        It downloads the JSON file from the URL.
+        With the catalog index, the index and updates.json are requested at the same time:
+        the maps come from the index, the launcher, mod, admins and content pack sections from
+        updates.json (edited by hand, they are not in the index). An unchanged updates.json is
+        answered with a 304 and its sections are read from the cache.
         """
         try:
-            fetch_url = self.url
-            if self.cache_bust:
-                # Add a unique timestamp to the URL to bypass caching
-                fetch_url = f"{self.url}?_={int(time.time() * 1000)}"
-                print(f"DEBUG: Fetching updates.json with cache bust: {fetch_url}") # For debug/visibility
-
-            response = requests.get(fetch_url, timeout=10) # Timeout to prevent too long a block
-            response.raise_for_status() # Raises an exception for HTTP error codes (4xx or 5xx)
-            self.update_data = response.json() # Parses the JSON response
+            cached_sections = _load_updates_sections_cache() if self.index_urls else None
+            if cached_sections:
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    maps_future = executor.submit(self._fetch_catalog_index)
+                    updates_future = executor.submit(self._fetch_updates_json, cached_sections)
+                    maps, self.update_data = maps_future.result(), updates_future.result()
+                if self.update_data is None:
+                    if maps is not None:
+                        self.update_data = dict(cached_sections['sections'], maps=maps)
+                    else:
+                        self.update_data = self._fetch_updates_json() # The cache has no maps
+            else:
+                self.update_data = self._fetch_updates_json()
             
             # Debugging: Print information about the received data
             print(f"DEBUG: UpdateCheckerThread received data. Maps count: {len(self.update_data.get('maps', []))}")
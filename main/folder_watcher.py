@@ -0,0 +1,65 @@
+# ZombieRoolLauncher/main/folder_watcher.py
+import os
+
+from PyQt6.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+# Folders of an instance that are watched (keys of get_minecraft_sub_paths). Nothing displayed
+# by the launcher depends on the resourcepacks folder, so it is not watched.
+WATCHED_FOLDERS = ("mods", "saves")
+
+
+class InstanceFolderWatcher(QObject):
+    """
+    Watches the mods and saves folders of the active instance with the system's change
+    notifications (inotify, ReadDirectoryChangesW, FSEvents...), so changes
+    made by hand or by another launcher are noticed without listing the folders again.
+    Bursts of events (a mod pack update touches dozens of files) are batched into one signal.
+    """
+    folders_changed = pyqtSignal(list) # Changed folder kinds, e.g. ["mods"]
+
+    BATCH_DELAY_MS = 500
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self._on_directory_changed)
+        self.kinds_by_path = {} # {watched folder path: kind}
+        self.pending_kinds = set()
+        self.batch_timer = QTimer(self)
+        self.batch_timer.setSingleShot(True)
+        self.batch_timer.setInterval(self.BATCH_DELAY_MS)
+        self.batch_timer.timeout.connect(self._emit_pending)
+
+    def watch(self, minecraft_paths):
+        """Watches the folders of an instance (get_minecraft_sub_paths result) instead of the previous ones; None stops watching."""
+        if self.watcher.directories():
+            self.watcher.removePaths(self.watcher.directories())
+        self.kinds_by_path = {}
+        self.pending_kinds.clear()
+        self.batch_timer.stop()
+        for kind in WATCHED_FOLDERS:
+            path = (minecraft_paths or {}).get(kind)
+            if path and os.path.isdir(path):
+                path = os.path.abspath(path)
+                self.kinds_by_path[path] = kind
+                if not self.watcher.addPath(path):
+                    print(f"DEBUG: Cannot watch folder '{path}'.")
+        print(f"DEBUG: Watching instance folders: {self.watcher.directories()}")
+
+    def _on_directory_changed(self, path):
+        kind = self.kinds_by_path.get(os.path.abspath(path))
+        if kind is None:
+            return
+        # A folder deleted and created again is no longer watched by the system
+        if path not in self.watcher.directories() and os.path.isdir(path):
+            self.watcher.addPath(path)
+        self.pending_kinds.add(kind)
+        if not self.batch_timer.isActive():
+            self.batch_timer.start() # The events of the next BATCH_DELAY_MS are sent together
+
+    def _emit_pending(self):
+        kinds = sorted(self.pending_kinds)
+        self.pending_kinds.clear()
+        if kinds:
+            print(f"DEBUG: Instance folders changed: {kinds}")
+            self.folders_changed.emit(kinds)
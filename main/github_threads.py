@@ -2,30 +2,140 @@
 import os
 import json
 import time
+import shutil
+import tempfile
 
 from github import GithubException
 from PyQt6.QtCore import QVersionNumber, pyqtSignal # Add pyqtSignal here
 from PyQt6.QtCore import QThread # QThread est déjà importé via GitHubWorkerBase mais on le laisse pour la clarté si besoin direct
 
-from main.github_worker_base import GitHubWorkerBase
+from main.github_worker_base import GitHubWorkerBase, UPDATES_JSON_PATH
+from main.archive_formats import FORMAT_ZIP, FORMAT_TAR_ZSTD, detect_archive_format, get_output_formats, repack_archive
+from main.world_optimizer import optimize_map_archive
+from main.thumbnail_renderer import render_map_thumbnail
+from main.world_packer import WorldPacker
 from main.constants import GITHUB_REPO_OWNER, GITHUB_REPO_NAME, UPDATES_JSON_URL # Import UPDATES_JSON_URL for fetching updates.json within worker
 
 class GitHubUploaderThread(GitHubWorkerBase):
     upload_finished = pyqtSignal(dict) # Contains map_info and uploaded asset URLs
     # Inherits upload_progress (renamed from progress) and upload_error from GitHubWorkerBase
 
-    def __init__(self, github_token, map_info, map_zip_path, rp_zip_path=None, remote_updates_data=None):
+    def __init__(self, github_token, map_info, map_zip_path, rp_zip_path=None, remote_updates_data=None, output_format="zip",
+                 optimize_options=None, render_thumbnail=False):
         super().__init__(github_token)
         self.map_info = map_info
         self.map_zip_path = map_zip_path
+        self.source_map_path = map_zip_path # map_zip_path changes when the map is packed, optimized or recompressed
         self.rp_zip_path = rp_zip_path
         self.uploaded_assets = {} # To store {asset_name: download_url}
         self.remote_updates_data = remote_updates_data # Pass existing remote data for conflict check
+        self.output_format = output_format # Key of get_output_formats(): 'zip', 'tar.zst' or 'zip-zstd'
+        self.repacked_map_path = None # Temporary archive when the map is recompressed before upload
+        self.optimize_options = optimize_options # None, or keyword arguments of optimize_map_archive
+        self.optimized_map_path = None # Temporary archive when the world is optimized before upload
+        self.optimization_stats = None
+        self.render_thumbnail = render_thumbnail
+        self.thumbnail_path = None # Temporary top-down preview uploaded with the map
+        self.packed_map_path = None # Temporary ZIP of a world folder, when a later step needs an archive
+        self.map_asset_name = None
+
+    def _pack_world_folder(self):
+        """
+        World folders are streamed into the upload as they are packed. The optimizer and the
+        other archive formats work on a ZIP, so the folder is packed into one first for them.
+        """
+        if not os.path.isdir(self.map_zip_path) or (self.optimize_options is None and self.output_format == "zip"):
+            return
+        self.packed_map_path = os.path.join(tempfile.mkdtemp(prefix="zrl_pack_"), f"{os.path.basename(os.path.normpath(self.map_zip_path))}.zip")
+        self.progress_update.emit("Packing world folder...")
+        packer = WorldPacker(self.map_zip_path)
+        packer.compute_size(lambda done, total: self.progress_update.emit(f"Packing world folder: {done}/{total} files..."))
+        packer.write_to(self.packed_map_path)
+        self.map_zip_path = self.packed_map_path
+
+    def _upload_world_folder(self, release):
+        """Packs the world folder in parallel and streams the ZIP into the release asset."""
+        self.map_asset_name = f"{os.path.basename(os.path.normpath(self.map_zip_path))}.zip"
+        packer = WorldPacker(self.map_zip_path)
+        self.progress_update.emit("Preparing world folder...")
+        total_size = packer.compute_size(lambda done, total: self.progress_update.emit(f"Preparing world folder: {done}/{total} files..."))
+        self.progress_update.emit(f"Uploading map file: {self.map_asset_name}...")
+        last_percent = [-1]
+
+        def on_progress(sent, total):
+            percent = sent * 100 // total if total else 100
+            if percent != last_percent[0]:
+                last_percent[0] = percent
+                self.progress_update.emit(f"Uploading map file: {self.map_asset_name} ({percent}%)...")
+
+        with packer.open_stream(on_progress) as stream:
+            return release.upload_asset_from_memory(stream, total_size, name=self.map_asset_name, content_type="application/zip")
+
+    def _optimize_map_archive(self):
+        """Runs the world optimizer on the map ZIP when it was requested."""
+        if self.optimize_options is None:
+            return
+        if os.path.isdir(self.map_zip_path) or detect_archive_format(self.map_zip_path) != FORMAT_ZIP:
+            self.progress_update.emit("World optimization skipped: only ZIP maps can be optimized.")
+            return
+
+        self.optimized_map_path = os.path.join(tempfile.mkdtemp(prefix="zrl_optimize_"), os.path.basename(self.map_zip_path))
+        self.progress_update.emit("Optimizing world (removing empty chunks, recompressing regions)...")
+        self.optimization_stats = optimize_map_archive(
+            self.map_zip_path, self.optimized_map_path,
+            progress_callback=lambda done, total: self.progress_update.emit(f"Optimizing world: {done}/{total} region files..."),
+            **self.optimize_options)
+        saved = self.optimization_stats['size_before'] - self.optimization_stats['size_after']
+        self.progress_update.emit(f"World optimized: {self.optimization_stats['chunks_removed']} chunks removed, {saved // 1024} KB saved.")
+        self.map_zip_path = self.optimized_map_path
+
+    def _render_thumbnail(self):
+        """Renders the top-down thumbnail of the map. A failure only skips the thumbnail."""
+        if not self.render_thumbnail:
+            return
+        if not os.path.isdir(self.map_zip_path) and detect_archive_format(self.map_zip_path) != FORMAT_ZIP:
+            self.progress_update.emit("Thumbnail skipped: only ZIP maps can be rendered.")
+            return
+        self.progress_update.emit("Rendering map thumbnail...")
+        self.thumbnail_path = os.path.join(tempfile.mkdtemp(prefix="zrl_thumbnail_"), f"{self.map_info['id']}-thumbnail.png")
+        try:
+            if render_map_thumbnail(self.map_zip_path, self.thumbnail_path) is None:
+                self.progress_update.emit("Thumbnail skipped: no generated chunk found in the overworld.")
+        except Exception as e:
+            print(f"DEBUG: Thumbnail rendering failed: {e}")
+            self.progress_update.emit(f"Thumbnail skipped: {e}")
+
+    def _prepare_map_archive(self):
+        """
+        Recompresses the map ZIP into the selected output format if needed and records
+        the resulting archive format in map_info (published as the catalog 'format' field).
+        """
+        if os.path.isdir(self.map_zip_path):
+            self.map_info['format'] = FORMAT_ZIP # Packed into a ZIP while uploading
+            return
+        source_format = detect_archive_format(self.map_zip_path)
+        if source_format != FORMAT_ZIP or self.output_format == "zip":
+            self.map_info['format'] = source_format
+            return
+
+        archive_format, _ = get_output_formats()[self.output_format]
+        base_name = os.path.splitext(os.path.basename(self.map_zip_path))[0]
+        extension = ".tar.zst" if archive_format == FORMAT_TAR_ZSTD else ".zip"
+        self.repacked_map_path = os.path.join(tempfile.mkdtemp(prefix="zrl_repack_"), f"{base_name}{extension}")
+
+        self.progress_update.emit(f"Recompressing map with zstd ({self.output_format})...")
+        repack_archive(self.map_zip_path, self.repacked_map_path, self.output_format)
+        original_size = os.path.getsize(self.map_zip_path)
+        new_size = os.path.getsize(self.repacked_map_path)
+        self.progress_update.emit(f"Map recompressed: {original_size // 1024} KB -> {new_size // 1024} KB.")
+        self.map_zip_path = self.repacked_map_path
+        self.map_info['format'] = archive_format
 
     def run(self):
         if not self._authenticate_github():
             return
 
+        release = None # Deleted again if the publication fails once it exists
         try:
             # Add author to map_info before publication
             self.map_info['author'] = self.authenticated_user_login
@@ -68,6 +178,14 @@ class GitHubUploaderThread(GitHubWorkerBase):
                 if e.status != 404: # If not 404 (not found), it's another error
                     raise e # Re-raise if it's a real error, otherwise continue
 
+            # Strip empty chunks, then recompress the map if another archive format was requested.
+            # Done before the release exists: these steps are slow and can fail, and a failure must
+            # not leave a public release whose tag blocks a new attempt.
+            self._pack_world_folder()
+            self._optimize_map_archive()
+            self._render_thumbnail()
+            self._prepare_map_archive()
+
             self.progress_update.emit(f"Creating GitHub release: {release_title}...")
             release = self.repo.create_git_release(
                 tag=release_tag,
@@ -78,10 +196,14 @@ class GitHubUploaderThread(GitHubWorkerBase):
             )
             self.progress_update.emit(f"Release created: {release.html_url}")
 
-            # Upload map file
-            self.progress_update.emit(f"Uploading map file: {os.path.basename(self.map_zip_path)}...")
-            uploaded_map_asset = release.upload_asset(self.map_zip_path, name=os.path.basename(self.map_zip_path))
-            self.uploaded_assets[os.path.basename(self.map_zip_path)] = uploaded_map_asset.browser_download_url
+            # Upload map file (a world folder is packed on the fly)
+            if os.path.isdir(self.map_zip_path):
+                uploaded_map_asset = self._upload_world_folder(release)
+            else:
+                self.map_asset_name = os.path.basename(self.map_zip_path)
+                self.progress_update.emit(f"Uploading map file: {self.map_asset_name}...")
+                uploaded_map_asset = release.upload_asset(self.map_zip_path, name=self.map_asset_name)
+            self.uploaded_assets[self.map_asset_name] = uploaded_map_asset.browser_download_url
             self.progress_update.emit(f"Map file uploaded.")
 
             # Upload resource pack file if applicable
@@ -91,6 +213,13 @@ class GitHubUploaderThread(GitHubWorkerBase):
                 self.uploaded_assets[os.path.basename(self.rp_zip_path)] = uploaded_rp_asset.browser_download_url
                 self.progress_update.emit(f"Resource pack file uploaded.")
 
+            # Upload the thumbnail if one was rendered
+            if self.thumbnail_path and os.path.exists(self.thumbnail_path):
+                self.progress_update.emit("Uploading map thumbnail...")
+                uploaded_thumbnail = release.upload_asset(self.thumbnail_path, name=os.path.basename(self.thumbnail_path),
+                                                          content_type="image/png")
+                self.map_info['thumbnail_url'] = uploaded_thumbnail.browser_download_url
+
             # Update updates.json
             self.progress_update.emit("Updating updates.json...")
             self._update_remote_updates_json(release)
@@ -98,28 +227,44 @@ class GitHubUploaderThread(GitHubWorkerBase):
             self.upload_finished.emit(self.map_info)
 
         except GithubException as e:
+            if release is not None:
+                self._delete_failed_release(release, release_tag)
             self.error_occurred.emit(f"GitHub operation failed: {e.data.get('message', str(e))}. Please check your token permissions (should include 'Contents' read/write and 'Releases' for this repository).")
         except Exception as e:
+            if release is not None:
+                self._delete_failed_release(release, release_tag)
             self.error_occurred.emit(f"An unexpected error occurred during upload: {e}")
+        finally:
+            # Each temporary file lives alone in its own temporary folder
+            for temp_path in (self.packed_map_path, self.repacked_map_path, self.optimized_map_path, self.thumbnail_path):
+                if temp_path:
+                    shutil.rmtree(os.path.dirname(temp_path), ignore_errors=True)
+
+    def _delete_failed_release(self, release, release_tag):
+        """Removes the release of a failed publication and its tag, so the same version can be published again."""
+        try:
+            self.progress_update.emit(f"Publication failed: deleting release '{release_tag}'...")
+            release.delete_release()
+            self.repo.get_git_ref(f"tags/{release_tag}").delete()
+        except GithubException as e:
+            if e.status != 404: # The tag may not have been created
+                self.progress_update.emit(f"Warning: Could not delete release '{release_tag}': {e.data.get('message', str(e))}. Delete it on GitHub before publishing again.")
+                print(f"DEBUG: GitHubException during cleanup of release '{release_tag}' (Status: {e.status}, Data: {e.data})")
+        except Exception as e:
+            print(f"DEBUG: Cleanup of release '{release_tag}' failed: {e}")
 
     def _update_remote_updates_json(self, release_info):
         """
-        Reads updates.json from GitHub, modifies it with new map data,
-        and pushes it back to GitHub.
+        Reads updates.json from GitHub, modifies it with new map data, and pushes it back to
+        GitHub together with the sharded catalog (index and map detail files).
         """
-        updates_json_path = "updates.json" # Relative path on GitHub
-        current_json_content = None
-        updates_data = {}
-        updates_file_sha = None
+        updates_json_path = UPDATES_JSON_PATH
 
         try:
-            contents = self.repo.get_contents(updates_json_path, ref="main") # Assuming main branch
-            current_json_content = contents.decoded_content.decode('utf-8')
-            updates_data = json.loads(current_json_content)
-            updates_file_sha = contents.sha # Keep SHA for file update
-            self.progress_update.emit(f"'{updates_json_path}' loaded from GitHub.")
-        except GithubException as e:
-            if e.status == 404:
+            updates_data, ref, base_commit = self._read_updates_json()
+            if updates_data is not None:
+                self.progress_update.emit(f"'{updates_json_path}' loaded from GitHub.")
+            else:
                 self.progress_update.emit(f"WARNING: '{updates_json_path}' not found on GitHub. Creating a new base file.")
                 updates_data = {
                     "launcher": {"latest_version": "0.0.0", "download_url": ""},
@@ -128,8 +273,6 @@ class GitHubUploaderThread(GitHubWorkerBase):
                     "content_packs": [],
                     "admins": [self.authenticated_user_login] # Initialize with uploader as admin
                 }
-            else:
-                raise # Re-raise other GitHub exceptions
         except json.JSONDecodeError as e:
             raise Exception(f"ERROR: '{updates_json_path}' on GitHub is invalid (malformed JSON): {e}")
 
@@ -138,12 +281,25 @@ class GitHubUploaderThread(GitHubWorkerBase):
             "id": self.map_info['id'],
             "name": self.map_info['name'],
             "latest_version": self.map_info['latest_version'],
-            "download_url": self.uploaded_assets.get(os.path.basename(self.map_zip_path), ""),
+            "download_url": self.uploaded_assets.get(self.map_asset_name, ""),
             "description": self.map_info['description'],
             "author": self.map_info['author'] # Add the author field
         }
+        if self.map_info.get('format', FORMAT_ZIP) != FORMAT_ZIP:
+            new_map_entry["format"] = self.map_info['format'] # Tells the launcher how to unpack the map
+        if self.map_info.get('requires'):
+            new_map_entry["requires"] = self.map_info['requires'] # Mod version / content packs installed with the map
+        if self.map_info.get('world'):
+            new_map_entry["world"] = self.map_info['world'] # Game version, spawn, game mode... read from level.dat
+        if self.map_info.get('thumbnail_url'):
+            new_map_entry["thumbnail_url"] = self.map_info['thumbnail_url'] # Top-down preview rendered at publish time
+        if self.map_info.get('sha256') and self.map_zip_path == self.source_map_path:
+            new_map_entry["sha256"] = self.map_info['sha256'] # Computed when the file was picked, valid for the archive uploaded as is
+            new_map_entry["size"] = self.map_info['size']
         if self.rp_zip_path and os.path.exists(self.rp_zip_path):
             new_map_entry["resourcepack_url"] = self.uploaded_assets.get(os.path.basename(self.rp_zip_path), "")
+            if self.map_info.get('resourcepack_sha256'):
+                new_map_entry["resourcepack_sha256"] = self.map_info['resourcepack_sha256']
 
         # Check if the map already exists (by ID) and update it, otherwise add it
         found_map = False
@@ -159,25 +315,9 @@ class GitHubUploaderThread(GitHubWorkerBase):
             updates_data["maps"].append(new_map_entry)
             self.progress_update.emit(f"New map '{self.map_info['id']}' added to updates.json.")
         
-        # Commit and push the updated JSON
-        new_json_content = json.dumps(updates_data, indent=4, ensure_ascii=False) # ensure_ascii=False for UTF-8 chars
-        
+        # Commit and push the updated JSON and catalog
         commit_message = f"feat: Add/Update map {self.map_info['name']} (v{self.map_info['latest_version']}) via launcher"
-        if updates_file_sha: # File existed, update it
-            self.repo.update_file(
-                path=updates_json_path,
-                message=commit_message,
-                content=new_json_content,
-                sha=updates_file_sha,
-                branch="main" 
-            )
-        else: # File did not exist, create it
-            self.repo.create_file(
-                path=updates_json_path,
-                message=commit_message,
-                content=new_json_content,
-                branch="main"
-            )
+        self._commit_catalog(ref, base_commit, updates_data, commit_message)
         self.progress_update.emit(f"'{updates_json_path}' updated and pushed to GitHub successfully!")
 
 
@@ -195,17 +335,12 @@ class GitHubDeleterThread(GitHubWorkerBase):
 
         try:
             # Fetch updates.json to get map info and admin list
-            updates_json_path = "updates.json"
-            updates_data = {}
+            updates_json_path = UPDATES_JSON_PATH
             try:
-                contents = self.repo.get_contents(updates_json_path, ref="main")
-                updates_data = json.loads(contents.decoded_content.decode('utf-8'))
-            except GithubException as e:
-                if e.status == 404:
+                updates_data, ref, base_commit = self._read_updates_json()
+                if updates_data is None:
                     self.error_occurred.emit(f"Error: '{updates_json_path}' not found on GitHub. Cannot perform deletion checks.")
                     return
-                else:
-                    raise # Re-raise other GitHub exceptions
             except json.JSONDecodeError as e:
                 self.error_occurred.emit(f"ERROR: '{updates_json_path}' on GitHub is invalid (malformed JSON): {e}. Cannot perform deletion checks.")
                 return
@@ -271,7 +406,6 @@ class GitHubDeleterThread(GitHubWorkerBase):
 
             # 3. Update updates.json to remove the map entry
             self.progress_update.emit("Updating updates.json...")
-            updates_file_sha = contents.sha # Use the SHA from initial fetch
 
             # Filter out the map to be deleted
             if "maps" in updates_data:
@@ -285,17 +419,9 @@ class GitHubDeleterThread(GitHubWorkerBase):
                 else:
                     self.progress_update.emit(f"Map ID '{self.map_id_to_delete}' was not found in updates.json (it might have been deleted manually or previously).")
 
-            # Commit and push the updated JSON
-            new_json_content = json.dumps(updates_data, indent=4, ensure_ascii=False)
+            # Commit and push the updated JSON and catalog (the map's detail file is removed)
             commit_message = f"chore: Remove map {self.map_id_to_delete} via launcher"
-            
-            self.repo.update_file(
-                path=updates_json_path,
-                message=commit_message,
-                content=new_json_content,
-                sha=updates_file_sha,
-                branch="main" 
-            )
+            self._commit_catalog(ref, base_commit, updates_data, commit_message)
             self.progress_update.emit(f"'{updates_json_path}' updated and pushed to GitHub successfully!")
 
             self.deletion_finished.emit(self.map_id_to_delete)
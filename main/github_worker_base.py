@@ -1,8 +1,15 @@
 # ZombieRoolLauncher/main/github_worker_base.py
+import json
+import base64
+
 from PyQt6.QtCore import QThread, pyqtSignal # Add pyqtSignal here
-from github import Github, GithubException
+from github import Github, GithubException, InputGitTreeElement
 
 from main.constants import GITHUB_REPO_OWNER, GITHUB_REPO_NAME
+from main.catalog_shards import CATALOG_INDEX_PATH, CATALOG_INDEX_GZIP_PATH, build_catalog_shards, compress_catalog_index, get_map_detail_path
+
+UPDATES_JSON_PATH = "updates.json" # Relative path on GitHub
+CATALOG_BRANCH = "main"
 
 class GitHubWorkerBase(QThread):
     """
@@ -42,6 +49,67 @@ class GitHubWorkerBase(QThread):
             print(f"DEBUG: Unexpected authentication error: {e}")
             return False
 
+    def _read_updates_json(self):
+        """
+        Reads updates.json at the head of the main branch.
+        Returns (updates data, or None if the file does not exist, branch ref, head commit): the commit
+        made by _commit_catalog is based on this head, so a concurrent change makes it fail instead of being lost.
+        Raises json.JSONDecodeError if the file is malformed.
+        """
+        ref = self.repo.get_git_ref(f"heads/{CATALOG_BRANCH}")
+        base_commit = self.repo.get_git_commit(ref.object.sha)
+        try:
+            contents = self.repo.get_contents(UPDATES_JSON_PATH, ref=base_commit.sha)
+        except GithubException as e:
+            if e.status == 404:
+                return None, ref, base_commit
+            raise
+        return json.loads(contents.decoded_content.decode('utf-8')), ref, base_commit
+
+    def _get_published_detail_hashes(self, base_commit):
+        """{map id: detail SHA-256} of the catalog index published at base_commit (empty if there is none)."""
+        try:
+            contents = self.repo.get_contents(CATALOG_INDEX_PATH, ref=base_commit.sha)
+            index = json.loads(contents.decoded_content.decode('utf-8'))
+            return {summary['id']: summary.get('detail_sha256') for summary in index.get('maps', []) if summary.get('id')}
+        except GithubException as e:
+            if e.status == 404:
+                return {}
+            raise
+        except json.JSONDecodeError:
+            return {} # Rewritten from updates.json
+
+    def _commit_catalog(self, ref, base_commit, updates_data, commit_message):
+        """
+        Commits updates.json and the sharded catalog (index, plus the map detail documents that
+        changed or were removed) in a single commit on top of base_commit, then moves the branch.
+        """
+        files = build_catalog_shards(updates_data)
+        published_hashes = self._get_published_detail_hashes(base_commit)
+        index = json.loads(files[CATALOG_INDEX_PATH])
+        new_hashes = {summary['id']: summary['detail_sha256'] for summary in index['maps']}
+
+        elements = [
+            InputGitTreeElement(UPDATES_JSON_PATH, '100644', 'blob',
+                                content=json.dumps(updates_data, indent=4, ensure_ascii=False)), # ensure_ascii=False for UTF-8 chars
+            InputGitTreeElement(CATALOG_INDEX_PATH, '100644', 'blob', content=files[CATALOG_INDEX_PATH])
+        ]
+        # Binary content has to be uploaded as a blob first
+        gzip_blob = self.repo.create_git_blob(base64.b64encode(compress_catalog_index(files[CATALOG_INDEX_PATH])).decode('ascii'), "base64")
+        elements.append(InputGitTreeElement(CATALOG_INDEX_GZIP_PATH, '100644', 'blob', sha=gzip_blob.sha))
+        for map_id, detail_sha256 in new_hashes.items():
+            if published_hashes.get(map_id) != detail_sha256:
+                path = get_map_detail_path(map_id)
+                elements.append(InputGitTreeElement(path, '100644', 'blob', content=files[path]))
+        for map_id in published_hashes:
+            if map_id not in new_hashes:
+                elements.append(InputGitTreeElement(get_map_detail_path(map_id), '100644', 'blob', sha=None)) # Deletes the file
+        self.progress_update.emit(f"Committing the catalog ({len(elements) - 3} map detail files changed)...")
+
+        tree = self.repo.create_git_tree(elements, base_commit.tree)
+        commit = self.repo.create_git_commit(commit_message, tree, [base_commit])
+        ref.edit(commit.sha) # Not forced: fails if the branch moved since base_commit
+
     def run(self):
         # This method should be overridden by subclasses
         raise NotImplementedError("Subclasses must implement the 'run' method.")
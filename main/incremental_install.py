@@ -0,0 +1,215 @@
+# ZombieRoolLauncher/main/incremental_install.py
+import os
+import json
+import zlib
+import hashlib
+
+from main.constants import CACHE_DIR_PATH
+from main.archive_formats import CHUNK_SIZE, iter_archive_entries, extract_entry_atomically
+
+# Folder (inside the cache directory) holding one checksum index per installed world
+CHECKSUM_INDEX_DIR = os.path.join(CACHE_DIR_PATH, 'crc_index')
+
+
+def get_archive_root_prefix(names):
+    """
+    Returns the single root folder shared by every entry of an archive (e.g. 'MyMap/'),
+    or an empty string if the entries are not all inside one root folder.
+    """
+    root = None
+    for name in names:
+        name = name.replace('\\', '/').lstrip('/')
+        if not name:
+            continue
+        first, sep, _ = name.partition('/')
+        if not sep:
+            # A file lives directly at the root of the archive
+            return ""
+        if root is None:
+            root = first
+        elif first != root:
+            return ""
+    return f"{root}/" if root else ""
+
+
+def safe_join(base_dir, relative_path):
+    """
+    Joins an archive entry path to base_dir, refusing absolute paths and '..' components
+    so that a malicious archive cannot write outside of the destination ("zip slip").
+    Returns None if the entry is unsafe.
+    """
+    relative_path = relative_path.replace('\\', '/')
+    parts = [p for p in relative_path.split('/') if p not in ('', '.')]
+    if not parts or any(p == '..' for p in parts) or os.path.isabs(relative_path) or ':' in parts[0]:
+        return None
+    return os.path.join(base_dir, *parts)
+
+
+def compute_file_crc32(path):
+    """Computes the CRC32 of a local file, reading it in large blocks."""
+    crc = 0
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(CHUNK_SIZE)
+            if not block:
+                break
+            crc = zlib.crc32(block, crc)
+    return crc & 0xFFFFFFFF
+
+
+def get_checksum_index_path(dest_dir):
+    """Returns the path of the cached checksum index associated with an install folder."""
+    key = hashlib.sha1(os.path.normcase(os.path.abspath(dest_dir)).encode('utf-8')).hexdigest()
+    return os.path.join(CHECKSUM_INDEX_DIR, f"{key}.json")
+
+
+class ChecksumIndex:
+    """
+    Cached CRC32 of the files the launcher installed into a folder.
+    Each entry is keyed by the path relative to the folder and remembers the size and
+    mtime the file had when its CRC was computed, so unchanged files never need rehashing.
+    `installed` keeps the size and CRC32 each file had in the archive it was installed from,
+    which is what "Verify and Repair" checks the folder against.
+    """
+    FORMAT_VERSION = 1
+
+    def __init__(self, index_path, dest_dir):
+        self.index_path = index_path
+        self.dest_dir = dest_dir
+        self.files = {} # {relative_path: [size, mtime_ns, crc32]}
+        self.installed = {} # {relative_path: [size, crc32]} as published in the archive
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == self.FORMAT_VERSION and data.get('dest_dir') == os.path.abspath(self.dest_dir):
+                self.files = data.get('files', {})
+                self.installed = data.get('installed', {})
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"DEBUG: Ignoring unreadable checksum index '{self.index_path}': {e}")
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            temp_path = f"{self.index_path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    "version": self.FORMAT_VERSION,
+                    "dest_dir": os.path.abspath(self.dest_dir),
+                    "files": self.files,
+                    "installed": self.installed
+                }, f, separators=(',', ':'))
+            os.replace(temp_path, self.index_path)
+        except IOError as e:
+            print(f"Error saving checksum index: {e}")
+
+    def get_crc(self, relative_path, local_path, st=None):
+        """
+        Returns the CRC32 of a local file, using the cached value when the file's
+        size and mtime still match, and hashing (then caching) it otherwise.
+        """
+        st = st or os.stat(local_path)
+        cached = self.files.get(relative_path)
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            return cached[2]
+        crc = compute_file_crc32(local_path)
+        self.files[relative_path] = [st.st_size, st.st_mtime_ns, crc]
+        return crc
+
+    def record(self, relative_path, local_path, crc):
+        st = os.stat(local_path)
+        self.files[relative_path] = [st.st_size, st.st_mtime_ns, crc]
+
+    def forget(self, relative_path):
+        self.files.pop(relative_path, None)
+        self.installed.pop(relative_path, None)
+
+    def get_installed_files(self):
+        """
+        Returns {relative_path: [size, crc32]} of the files installed from the archive.
+        Indexes written before `installed` existed fall back to the cached CRCs.
+        """
+        if self.installed:
+            return self.installed
+        return {relative_path: [size, crc] for relative_path, (size, _, crc) in self.files.items()}
+
+
+def remove_empty_parents(path, stop_dir):
+    """Removes the now-empty folders between a deleted file and stop_dir."""
+    stop_dir = os.path.abspath(stop_dir)
+    parent = os.path.dirname(os.path.abspath(path))
+    while parent.startswith(stop_dir) and parent != stop_dir:
+        try:
+            os.rmdir(parent) # Only succeeds on empty folders
+        except OSError:
+            break
+        parent = os.path.dirname(parent)
+
+
+def incremental_extract_archive(archive_path, dest_dir, strip_prefix="", remove_stale=True,
+                                archive_format=None, skip_unchanged=True):
+    """
+    Installs the content of a ZIP or .tar.zst archive into dest_dir, writing only new or changed files.
+
+    For ZIP archives, the CRC32 and size of each entry are read from the central directory and
+    compared with the files already on disk (through a cached checksum index), so byte-identical
+    files are skipped without being decompressed. Tar entries carry no checksum, so theirs is
+    computed while streaming and only differing entries are written. Files that a previous install
+    wrote but that are no longer part of the archive are removed; files the launcher never installed
+    (e.g. player data created by the game) are left untouched.
+    With skip_unchanged=False every entry is rewritten (full reinstall).
+
+    Returns a dict of statistics: written, skipped, removed, bytes_written.
+    """
+    os.makedirs(dest_dir, exist_ok=True)
+    index = ChecksumIndex(get_checksum_index_path(dest_dir), dest_dir)
+    previously_installed = set(index.files)
+    stats = {"written": 0, "skipped": 0, "removed": 0, "bytes_written": 0}
+    archive_files = set()
+
+    try:
+        for entry in iter_archive_entries(archive_path, archive_format):
+            name = entry.name.replace('\\', '/')
+            if strip_prefix:
+                if not name.startswith(strip_prefix):
+                    continue
+                name = name[len(strip_prefix):]
+            local_path = safe_join(dest_dir, name)
+            if local_path is None:
+                print(f"WARNING: Skipping unsafe archive entry '{entry.name}'.")
+                continue
+            relative_path = os.path.relpath(local_path, dest_dir).replace(os.sep, '/')
+            archive_files.add(relative_path)
+
+            if skip_unchanged and os.path.isfile(local_path):
+                st = os.stat(local_path)
+                # Size differs: the file has changed, no need to hash it
+                if st.st_size == entry.size and index.get_crc(relative_path, local_path, st) == entry.crc32:
+                    index.installed[relative_path] = [entry.size, entry.crc32]
+                    stats["skipped"] += 1
+                    continue
+
+            crc, _ = extract_entry_atomically(entry, local_path)
+            index.record(relative_path, local_path, crc)
+            index.installed[relative_path] = [entry.size, crc]
+            stats["written"] += 1
+            stats["bytes_written"] += entry.size
+
+        if remove_stale:
+            for relative_path in previously_installed - archive_files:
+                local_path = safe_join(dest_dir, relative_path)
+                index.forget(relative_path)
+                if local_path and os.path.isfile(local_path):
+                    os.remove(local_path)
+                    remove_empty_parents(local_path, dest_dir)
+                    stats["removed"] += 1
+    finally:
+        # Keep the index in sync with what actually reached the disk, even after a failure
+        index.save()
+
+    print(f"DEBUG: Incremental install into '{dest_dir}': {stats}")
+    return stats
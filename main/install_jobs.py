@@ -0,0 +1,296 @@
+# ZombieRoolLauncher/main/install_jobs.py
+import os
+import uuid
+import shutil
+import tarfile
+import zipfile
+import threading
+
+from PyQt6.QtCore import QObject, QThread, QUrl, pyqtSignal
+
+from main.downloader_threads import FileDownloaderThread
+from main.archive_formats import UnsupportedArchiveError, detect_archive_format, list_archive_names
+from main.incremental_install import get_archive_root_prefix, incremental_extract_archive
+from main.content_manifest import install_content_pack
+from main.mods_index import ModsIndex, find_launcher_mod_jars
+from main.install_planner import COMPONENT_MOD, CONTENT_COMPONENT_PREFIX
+from main.multi_instance import link_or_copy, mirror_installed_files, mirror_content_pack
+from main.world_snapshots import create_world_snapshot
+from main.utils import clean_temp_dir
+
+
+# Held while the mod or a content pack is written into a mods folder: two map jobs needing the same
+# missing requirement (or a job and a manual update) would otherwise write the same jars, temporary
+# files and manifests at the same time
+mods_folder_lock = threading.RLock()
+
+
+def install_mod_jar(jar_path, mods_dir, move=True):
+    """
+    Installs the mod jar into mods_dir, deleting the other versions of the mod first
+    (found from the jar metadata, so renamed jars are removed too).
+    The jar is moved (the downloaded temp file) or, with move=False, linked/copied.
+    """
+    os.makedirs(mods_dir, exist_ok=True)
+    jar_name = os.path.basename(jar_path)
+    mods_index = ModsIndex()
+    for filename in find_launcher_mod_jars(mods_index.scan(mods_dir)):
+        if filename != jar_name:
+            os.remove(os.path.join(mods_dir, filename))
+            print(f"Old mod version deleted: {filename}")
+    mods_index.save()
+    destination_path = os.path.join(mods_dir, jar_name)
+    if move:
+        shutil.move(jar_path, destination_path)
+    else:
+        link_or_copy(jar_path, destination_path, allow_hardlink=True)
+    return destination_path
+
+
+def install_requirements(requirements, downloaded_paths):
+    """
+    Installs the mod and content packs a map needs (see install_planner), from their downloaded files.
+    They are installed before the map so a failure leaves no map without its dependencies.
+    Each piece is installed into the first instance that lacks it, then mirrored from there into the
+    other ones that lack it: one download serves every instance.
+    Installs are serialized by mods_folder_lock; a requirement another job installed meanwhile
+    is mostly skipped (unchanged jars are not rewritten).
+    """
+    if requirements:
+        with mods_folder_lock:
+            _install_requirements(requirements, downloaded_paths)
+
+
+def _install_requirements(requirements, downloaded_paths):
+    for step in requirements:
+        component = step['component']
+        path = downloaded_paths.get(component)
+        if not path or not os.path.exists(path):
+            raise Exception(f"The requirement '{component}' was not downloaded successfully.")
+        first_paths, *other_targets = step['targets']
+        if component == COMPONENT_MOD:
+            installed_jar = install_mod_jar(path, first_paths['mods'])
+            for target_paths in other_targets:
+                install_mod_jar(installed_jar, target_paths['mods'], move=False)
+        elif component.startswith(CONTENT_COMPONENT_PREFIX):
+            install_content_pack(path, first_paths['mods'], step['info'])
+            for target_paths in other_targets:
+                mirror_content_pack(first_paths['mods'], target_paths['mods'], step['info']['id'])
+
+
+def install_map_files(map_info, map_archive_path, rp_archive_path, minecraft_paths, incremental=True, extra_targets=(),
+                      snapshot_retention=None, install_world=True):
+    """
+    Installs a downloaded map archive into 'saves' and its resource pack (if any)
+    into 'resourcepacks'. Runs without any UI so it can be used from a worker thread.
+    extra_targets lists the sub paths of other instances that receive the same map: they are
+    filled from the first install, sharing file data through reflinks/hard links when possible.
+    With a snapshot_retention, every existing world is snapshotted before being overwritten
+    and only that many snapshots are kept per world.
+    install_world=False only installs the resource pack (a repair that did not need the map).
+    """
+    if install_world:
+        _install_world(map_info, map_archive_path, minecraft_paths, incremental, extra_targets, snapshot_retention)
+
+    # Install the resource pack if necessary
+    if rp_archive_path and os.path.exists(rp_archive_path):
+        rp_dir = minecraft_paths['resourcepacks']
+        os.makedirs(rp_dir, exist_ok=True)
+        destination_rp_path = os.path.join(rp_dir, os.path.basename(rp_archive_path))
+        if os.path.exists(destination_rp_path):
+            os.remove(destination_rp_path)
+        shutil.move(rp_archive_path, destination_rp_path)
+        for target_paths in extra_targets:
+            # Resource pack archives are never modified by the game: hard links are safe
+            link_or_copy(destination_rp_path, os.path.join(target_paths['resourcepacks'], os.path.basename(destination_rp_path)),
+                         allow_hardlink=True)
+        return True # Resource pack installed
+    return False
+
+
+def _install_world(map_info, map_archive_path, minecraft_paths, incremental, extra_targets, snapshot_retention):
+    """Decompresses the map archive into 'saves' (and the saves of the extra targets)."""
+    saves_dir = minecraft_paths['saves']
+    os.makedirs(saves_dir, exist_ok=True)
+
+    if not map_archive_path or not os.path.exists(map_archive_path):
+        raise Exception("Map ZIP file was not downloaded successfully or path is invalid.")
+
+    # The catalog's "format" field selects ZIP or .tar.zst; the file's magic bytes are the fallback
+    archive_format = detect_archive_format(map_archive_path, map_info.get('format'))
+    root_prefix = get_archive_root_prefix(list_archive_names(map_archive_path, archive_format))
+    world_dir = os.path.join(saves_dir, map_info['name'])
+    target_world_dirs = [os.path.join(target_paths['saves'], map_info['name']) for target_paths in extra_targets]
+    if snapshot_retention:
+        for existing_world_dir in [world_dir] + target_world_dirs:
+            create_world_snapshot(existing_world_dir, label=map_info.get('latest_version', '?'), retention=snapshot_retention)
+
+    # Incremental mode only rewrites the files whose CRC32 differs from what is already installed
+    incremental_extract_archive(map_archive_path, world_dir, strip_prefix=root_prefix,
+                                archive_format=archive_format, skip_unchanged=incremental)
+    for target_world_dir in target_world_dirs:
+        mirror_installed_files(world_dir, target_world_dir)
+
+
+class MapInstallThread(QThread):
+    """Runs install_map_files off the GUI thread."""
+    install_finished = pyqtSignal(bool) # True if a resource pack was installed too
+    install_error = pyqtSignal(str)
+    bad_archive = pyqtSignal() # The map archive is corrupted or not a ZIP
+
+    def __init__(self, map_info, map_archive_path, rp_archive_path, minecraft_paths, incremental=True, extra_targets=(),
+                 requirements=(), downloaded_paths=None, snapshot_retention=None, install_world=True):
+        super().__init__()
+        self.snapshot_retention = snapshot_retention
+        self.install_world = install_world
+        self.map_info = map_info
+        self.map_archive_path = map_archive_path
+        self.rp_archive_path = rp_archive_path
+        self.minecraft_paths = dict(minecraft_paths) # Snapshot, the user may change paths meanwhile
+        self.incremental = incremental
+        self.extra_targets = [dict(paths) for paths in extra_targets]
+        self.requirements = list(requirements)
+        self.downloaded_paths = dict(downloaded_paths or {})
+
+    def run(self):
+        try:
+            install_requirements(self.requirements, self.downloaded_paths)
+            rp_installed = install_map_files(self.map_info, self.map_archive_path, self.rp_archive_path,
+                                             self.minecraft_paths, self.incremental, self.extra_targets,
+                                             self.snapshot_retention, self.install_world)
+            self.install_finished.emit(rp_installed)
+        except (zipfile.BadZipFile, tarfile.TarError):
+            self.bad_archive.emit()
+        except UnsupportedArchiveError as e:
+            self.install_error.emit(str(e))
+        except Exception as e:
+            self.install_error.emit(str(e))
+
+
+class MapInstallJob(QObject):
+    """
+    One map installation: its downloads (map + optional resource pack + the mod and content
+    packs the map requires but are missing), their combined progress, the install step and
+    the cleanup of its own temporary files.
+    Every job owns its state, so several maps can be installed at the same time.
+    """
+    progress_changed = pyqtSignal(int) # Combined download progress (0-100)
+    downloads_complete = pyqtSignal(object) # Emits the job once every download has finished
+    installing = pyqtSignal(object) # Emits the job when the install step starts
+    install_finished = pyqtSignal(object, bool) # Job, resource pack installed
+    failed = pyqtSignal(object, str, str) # Job, component ('map', 'resourcepack', 'mod', 'content:<id>', 'install', 'archive'), message
+
+    def __init__(self, map_info, temp_root, parent=None, requirements=(), components=None):
+        super().__init__(parent)
+        # Pieces of the map to download: both by default, a subset when repairing
+        self.components = tuple(components) if components else ('map', 'resourcepack')
+        self.requirements = list(requirements) # Steps from plan_map_install, with the instances each one goes to
+        self.job_id = uuid.uuid4().hex[:8]
+        self.map_info = map_info
+        self.map_id = map_info.get('id', map_info.get('name'))
+        self.temp_root = temp_root
+        self.temp_dir = os.path.join(temp_root, f"{self.map_id}-{self.job_id}")
+        self.downloaders = {} # {component: FileDownloaderThread}
+        self.component_progress = {} # {component: 0-100}
+        self.downloaded_paths = {} # {component: local path}
+        self.install_thread = None
+        self.install_targets = [] # Sub paths of the instances installed into, the first being the active one
+        self.progress = 0
+        self.state = "pending" # pending -> downloading -> installing -> done / failed
+
+    def _add_download(self, component, url):
+        file_name = os.path.basename(QUrl(url).path())
+        # One sub folder per component: a content pack and a map may share the same file name
+        downloader = FileDownloaderThread(url, os.path.join(self.temp_dir, component.replace(':', '_'), file_name))
+        downloader.download_progress.connect(lambda value, c=component: self._on_download_progress(c, value))
+        downloader.download_finished.connect(lambda path, c=component: self._on_download_finished(c, path))
+        downloader.download_error.connect(lambda message, c=component: self._on_download_error(c, message))
+        self.downloaders[component] = downloader
+        self.component_progress[component] = 0
+
+    def start(self):
+        """Starts the map download and, if any, the resource pack and missing requirement downloads."""
+        os.makedirs(self.temp_dir, exist_ok=True)
+        if 'map' in self.components:
+            self._add_download('map', self.map_info['download_url'])
+        if 'resourcepack' in self.components and self.map_info.get('resourcepack_url'):
+            self._add_download('resourcepack', self.map_info['resourcepack_url'])
+        for step in self.requirements:
+            self._add_download(step['component'], step['url'])
+        self.state = "downloading"
+        for downloader in self.downloaders.values():
+            downloader.start()
+
+    def is_active(self):
+        return self.state in ("pending", "downloading", "installing")
+
+    def _on_download_progress(self, component, value):
+        self.component_progress[component] = value
+        self.progress = sum(self.component_progress.values()) // len(self.component_progress)
+        self.progress_changed.emit(self.progress)
+
+    def _on_download_finished(self, component, path):
+        if self.state != "downloading":
+            return
+        self.downloaded_paths[component] = path
+        if len(self.downloaded_paths) == len(self.downloaders):
+            self.downloads_complete.emit(self)
+
+    def _on_download_error(self, component, message):
+        if self.state != "downloading":
+            return
+        # Ensure that if one download fails, the others are stopped and the job is cleaned up
+        self.cancel()
+        self.failed.emit(self, component, message)
+
+    def install(self, minecraft_paths, incremental=True, extra_targets=(), snapshot_retention=None):
+        """
+        Runs the install step in a worker thread once the downloads are complete.
+        extra_targets are the sub paths of other instances to install into from the same download.
+        snapshot_retention enables the snapshot of existing worlds (see install_map_files).
+        """
+        self.state = "installing"
+        self.installing.emit(self)
+        self.install_thread = MapInstallThread(self.map_info, self.downloaded_paths.get('map'),
+                                               self.downloaded_paths.get('resourcepack'), minecraft_paths, incremental,
+                                               extra_targets, self.requirements, self.downloaded_paths,
+                                               snapshot_retention, 'map' in self.components)
+        self.install_thread.install_finished.connect(self._on_install_finished)
+        self.install_thread.install_error.connect(lambda message: self._on_install_failed('install', message))
+        self.install_thread.bad_archive.connect(lambda: self._on_install_failed('archive', ""))
+        self.install_thread.start()
+
+    def _on_install_finished(self, rp_installed):
+        self.state = "done"
+        self.cleanup()
+        self.install_finished.emit(self, rp_installed)
+
+    def _on_install_failed(self, component, message):
+        self.state = "failed"
+        self.cleanup()
+        self.failed.emit(self, component, message)
+
+    def cancel(self):
+        """Stops the running downloads of this job and removes its temporary files."""
+        self.state = "failed"
+        for downloader in self.downloaders.values():
+            if downloader.isRunning():
+                downloader.stop()
+                # The thread still holds its partial file: clean up again once it has exited
+                downloader.finished.connect(self.cleanup)
+        self.cleanup()
+
+    def dispose(self):
+        """Deletes the job once none of its threads is running anymore."""
+        threads = list(self.downloaders.values()) + ([self.install_thread] if self.install_thread else [])
+        running = [thread for thread in threads if thread.isRunning()]
+        if running:
+            running[0].finished.connect(self.dispose)
+        else:
+            self.deleteLater()
+
+    def cleanup(self):
+        """Removes this job's temporary folder (and the shared temp root if it became empty)."""
+        if os.path.isdir(self.temp_dir):
+            shutil.rmtree(self.temp_dir, ignore_errors=True)
+        clean_temp_dir(self.temp_root)
@@ -0,0 +1,80 @@
+# ZombieRoolLauncher/main/install_planner.py
+from PyQt6.QtCore import QVersionNumber
+
+from main.content_manifest import load_content_manifest
+
+# Component names used by install jobs for the requirements of a map
+COMPONENT_MOD = "mod"
+CONTENT_COMPONENT_PREFIX = "content:"
+
+
+class UnresolvedRequirementError(Exception):
+    """Raised when a map needs something the catalog cannot provide (unknown pack, mod too old...)."""
+
+
+def _is_older(version_str, minimum_str):
+    """True if version_str is lower than minimum_str (an empty minimum is always satisfied)."""
+    if not minimum_str:
+        return False
+    return QVersionNumber.fromString(version_str or "0.0.0") < QVersionNumber.fromString(minimum_str)
+
+
+def get_map_requirements(map_info):
+    """
+    Reads the "requires" field of a catalog map entry:
+        "requires": {"mod": "1.4.0", "content_packs": ["kino-collection", {"id": "...", "version": "1.1.0"}]}
+    The mod version and pack versions are minimum versions. Returns (mod minimum, [(pack id, minimum)]).
+    """
+    requires = map_info.get('requires') or {}
+    content_packs = []
+    for pack in requires.get('content_packs', []):
+        if isinstance(pack, dict):
+            content_packs.append((pack['id'], pack.get('version', "")))
+        else:
+            content_packs.append((pack, ""))
+    return requires.get('mod', ""), content_packs
+
+
+def plan_map_install(map_info, updates_data, targets):
+    """
+    Resolves the requirements of a map against what is installed in each target instance.
+    targets lists (sub paths, installed mod version) of the instances the map goes to, the first being
+    the one the downloads are installed into.
+    Returns the list of missing pieces to download once with the map, as dicts:
+        {"component": "mod" or "content:<pack id>", "url": download URL, "info": catalog entry,
+         "targets": sub paths of the instances that lack it}
+    Raises UnresolvedRequirementError if a requirement is not available from the catalog.
+    """
+    updates_data = updates_data or {}
+    required_mod_version, required_packs = get_map_requirements(map_info)
+    steps = []
+
+    mod_targets = [paths for paths, local_mod_version in targets if _is_older(local_mod_version, required_mod_version)]
+    if mod_targets:
+        mod_info = updates_data.get('mod') or {}
+        if not mod_info.get('download_url') or _is_older(mod_info.get('latest_version'), required_mod_version):
+            raise UnresolvedRequirementError(
+                f"Map '{map_info['name']}' requires {mod_info.get('name', 'the mod')} v{required_mod_version} or newer, "
+                f"which is not available for download.")
+        steps.append({"component": COMPONENT_MOD, "url": mod_info['download_url'], "info": mod_info, "targets": mod_targets})
+
+    catalog_packs = {pack.get('id'): pack for pack in updates_data.get('content_packs', [])}
+    for pack_id, minimum_version in required_packs:
+        pack_targets = []
+        for paths, _local_mod_version in targets:
+            installed = load_content_manifest(paths['mods'], pack_id) if paths.get('mods') else None
+            if not installed or _is_older(installed.get('version'), minimum_version):
+                pack_targets.append(paths) # Missing, or not recent enough
+        if not pack_targets:
+            continue
+        pack_info = catalog_packs.get(pack_id)
+        if not pack_info or not pack_info.get('download_url') or _is_older(pack_info.get('version'), minimum_version):
+            raise UnresolvedRequirementError(
+                f"Map '{map_info['name']}' requires the content pack '{pack_id}'"
+                f"{f' v{minimum_version} or newer' if minimum_version else ''}, which is not available for download.")
+        steps.append({"component": f"{CONTENT_COMPONENT_PREFIX}{pack_id}", "url": pack_info['download_url'], "info": pack_info,
+                      "targets": pack_targets})
+
+    print(f"DEBUG: Install plan for map '{map_info.get('id')}': "
+          f"{[(step['component'], len(step['targets'])) for step in steps] or 'no requirements missing'}")
+    return steps
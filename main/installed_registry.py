@@ -0,0 +1,88 @@
+# ZombieRoolLauncher/main/installed_registry.py
+import os
+import json
+import time
+
+from main.constants import CACHE_DIR_PATH
+
+# What the launcher installed, per instance: maps, resource packs, content packs and the mod jar
+INSTALLED_REGISTRY_PATH = os.path.join(CACHE_DIR_PATH, 'installed_content.json')
+
+
+def get_instance_key(minecraft_paths):
+    """Key of an instance in the registry: its folder (the parent of its 'saves', 'mods'... folders)."""
+    return os.path.normcase(os.path.abspath(os.path.dirname(minecraft_paths['saves'])))
+
+
+class InstalledContentRegistry:
+    """
+    Content installed by the launcher, per instance and keyed by "<kind>:<id>" (kinds are the
+    KIND_* of main.verify): version, SHA-256 when the catalog publishes one, installed paths and
+    timestamps. A record only counts while all its paths exist, so a world deleted from the
+    saves folder is no longer reported as installed.
+    The registry is written to a temporary file then swapped in: an interrupted save keeps the previous one.
+    """
+    FORMAT_VERSION = 1
+
+    def __init__(self, registry_path=INSTALLED_REGISTRY_PATH):
+        self.registry_path = registry_path
+        self.instances = {} # {instance key: {"<kind>:<id>": record}}
+        self.dirty = False
+        if os.path.exists(registry_path):
+            try:
+                with open(registry_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == self.FORMAT_VERSION:
+                    self.instances = data.get('instances', {})
+            except (json.JSONDecodeError, IOError) as e:
+                print(f"DEBUG: Ignoring unreadable installed content registry: {e}")
+
+    def save(self):
+        if not self.dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.registry_path), exist_ok=True)
+            temp_path = f"{self.registry_path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": self.FORMAT_VERSION, "instances": self.instances}, f, separators=(',', ':'))
+            os.replace(temp_path, self.registry_path)
+            self.dirty = False
+        except IOError as e:
+            print(f"Error saving installed content registry: {e}")
+
+    def record(self, minecraft_paths, kind, item_id, version, sha256=None, paths=()):
+        """Records an install (or update) of an item into an instance. installed_at is kept across updates."""
+        records = self.instances.setdefault(get_instance_key(minecraft_paths), {})
+        key = f"{kind}:{item_id}"
+        now = int(time.time())
+        previous = records.get(key) or {}
+        records[key] = {
+            "kind": kind,
+            "id": item_id,
+            "version": version or "",
+            "sha256": sha256,
+            "paths": [os.path.abspath(path) for path in paths],
+            "installed_at": previous.get('installed_at', now),
+            "updated_at": now
+        }
+        self.dirty = True
+
+    def get(self, minecraft_paths, kind, item_id):
+        """The record of an item installed into an instance, or None if it is not (or no longer) there."""
+        record = self.instances.get(get_instance_key(minecraft_paths), {}).get(f"{kind}:{item_id}")
+        if record is None or not all(os.path.exists(path) for path in record['paths']):
+            return None
+        return record
+
+    def is_installed(self, minecraft_paths, kind, item_id, version, sha256=None):
+        """True if this version of the item is installed into the instance (same SHA-256 when both are known)."""
+        record = self.get(minecraft_paths, kind, item_id)
+        if record is None or record['version'] != (version or ""):
+            return False
+        return not (sha256 and record.get('sha256') and record['sha256'] != sha256)
+
+    def get_installed_versions(self, minecraft_paths, kind):
+        """{item id: installed version} of the items of a kind still present in an instance."""
+        records = self.instances.get(get_instance_key(minecraft_paths), {})
+        return {record['id']: record['version'] for record in records.values()
+                if record['kind'] == kind and all(os.path.exists(path) for path in record['paths'])}
@@ -3,25 +3,44 @@ import sys
 import os
 import platform
 import json
-import shutil # For copying and deleting files/folders
 import subprocess # For launching external processes (needed for updates)
 import time # For pausing in the update script
+import zipfile # For decompressing map and content pack archives
 
 from PyQt6.QtWidgets import (
-    QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
+    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QTabWidget, QProgressBar, QMessageBox,
-    QFileDialog, QLineEdit, QTextEdit, QCheckBox, QScrollArea, QComboBox, QSizePolicy # Import QSizePolicy
+    QFileDialog, QLineEdit, QTextEdit, QCheckBox, QComboBox, QSizePolicy, # Import QSizePolicy
+    QListWidget, QSpinBox, QTreeWidget, QTreeWidgetItem, QHeaderView, QListView
 )
-from PyQt6.QtCore import Qt, QUrl, QThread, pyqtSignal, QVersionNumber, QSize, QTimer
+from PyQt6.QtCore import Qt, QUrl, QThread, pyqtSignal, QVersionNumber, QTimer
 from PyQt6.QtGui import QDesktopServices, QPalette, QColor # For opening external links and theme detection
 
 # Import from fragmented modules
-from main.constants import __version__, UPDATES_JSON_URL, MOD_FILE_PREFIX, GITHUB_REPO_OWNER, GITHUB_REPO_NAME
-from main.utils import load_config, save_config, get_default_minecraft_path, get_minecraft_sub_paths, is_valid_map_zip, make_executable, clean_temp_dir
+from main.constants import __version__, UPDATES_JSON_URL, CATALOG_INDEX_URL, CATALOG_INDEX_GZIP_URL, GITHUB_REPO_OWNER, GITHUB_REPO_NAME
+from main.utils import load_config, save_config, get_default_minecraft_path, get_minecraft_sub_paths, make_executable, clean_temp_dir
+from main.utils import get_minecraft_instances, register_minecraft_instance, unregister_minecraft_instance
 from main.downloader_threads import UpdateCheckerThread, FileDownloaderThread
 from main.github_threads import GitHubUploaderThread, GitHubDeleterThread
 from main.translation_manager import TranslationManager
-from main.widgets import DragDropLineEdit
+from main.widgets import DragDropLineEdit, ToastNotifier
+from main.content_manifest import install_content_pack, uninstall_content_pack, list_installed_content_packs, load_content_manifest
+from main.install_jobs import MapInstallJob, install_mod_jar, mods_folder_lock
+from main.install_planner import plan_map_install, UnresolvedRequirementError, COMPONENT_MOD, CONTENT_COMPONENT_PREFIX
+from main.archive_formats import get_output_formats
+from main.multi_instance import mirror_content_pack
+from main.world_metadata import get_instance_game_version
+from main.thumbnail_renderer import is_thumbnail_renderer_available
+from main.publish_checks import PublishCheckThread, get_file_signature
+from main.verify import VerifyThread, KIND_MOD, KIND_CONTENT_PACK, KIND_MAP, KIND_RESOURCEPACK, STATUS_MISSING
+from main.world_library import WorldLibraryScanThread
+from main.mods_index import ModsIndex, find_launcher_mod_jars, get_launcher_mod_version
+from main.folder_watcher import InstanceFolderWatcher
+from main.map_catalog import MapCatalogModel, MapFilterProxyModel, MapItemDelegate
+from main.thumbnail_cache import ThumbnailCache
+from main.installed_registry import InstalledContentRegistry
+from main.catalog_shards import MapDetailThread, is_map_summary
+from main.world_snapshots import list_world_snapshots, delete_world_snapshot, SnapshotRestoreThread, DEFAULT_SNAPSHOT_RETENTION
 
 # --- MAIN LAUNCHER CLASS ---
 class ZombieRoolLauncher(QMainWindow):
@@ -104,10 +123,6 @@ class ZombieRoolLauncher(QMainWindow):
                 "en": "Download and Install Maps",
                 "fr": "Télécharger et Installer des Cartes"
             },
-            "Search maps by name or description...": {
-                "en": "Search maps by name or description...",
-                "fr": "Rechercher des cartes par nom ou description..."
-            },
             "Refresh Map Catalog": {
                 "en": "Refresh Map Catalog",
                 "fr": "Actualiser le Catalogue de Cartes"
@@ -587,6 +602,171 @@ class ZombieRoolLauncher(QMainWindow):
             "Download failed: {message}": {
                 "en": "Download failed: {message}",
                 "fr": "Échec du téléchargement : {message}"
+            },
+            "Incremental map updates (only rewrite changed files)": {
+                "en": "Incremental map updates (only rewrite changed files)",
+                "fr": "Mises à jour incrémentales des cartes (réécrire uniquement les fichiers modifiés)"
+            },
+            "Archive Format:": {"en": "Archive Format:", "fr": "Format d'Archive :"},
+            "Map Archives (*.zip *.tar.zst)": {"en": "Map Archives (*.zip *.tar.zst)", "fr": "Archives de Carte (*.zip *.tar.zst)"},
+            "Installed Content Packs:": {"en": "Installed Content Packs:", "fr": "Packs de Contenu Installés :"},
+            "Uninstall Content Pack": {"en": "Uninstall Content Pack", "fr": "Désinstaller le Pack de Contenu"},
+            "Remove all files installed by '{name}'?": {
+                "en": "Remove all files installed by '{name}'?",
+                "fr": "Supprimer tous les fichiers installés par '{name}' ?"
+            },
+            "Content Pack uninstalled ({count} files removed).": {
+                "en": "Content Pack uninstalled ({count} files removed).",
+                "fr": "Pack de Contenu désinstallé ({count} fichiers supprimés)."
+            },
+            "Registered Instances:": {"en": "Registered Instances:", "fr": "Instances Enregistrées :"},
+            "Add Instance...": {"en": "Add Instance...", "fr": "Ajouter une Instance..."},
+            "Remove Instance": {"en": "Remove Instance", "fr": "Retirer l'Instance"},
+            "Install to All": {"en": "Install to All", "fr": "Installer Partout"},
+            "Download to All Instances": {"en": "Download to All Instances", "fr": "Télécharger vers Toutes les Instances"},
+            "The active instance cannot be removed. Select another instance folder first.": {
+                "en": "The active instance cannot be removed. Select another instance folder first.",
+                "fr": "L'instance active ne peut pas être retirée. Sélectionnez d'abord un autre dossier d'instance."
+            },
+            "Installed into {count} instances.": {
+                "en": "Installed into {count} instances.",
+                "fr": "Installé dans {count} instances."
+            },
+            "Missing Requirements": {"en": "Missing Requirements", "fr": "Prérequis Manquants"},
+            "Content Pack": {"en": "Content Pack", "fr": "Pack de Contenu"},
+            "Downloading map '{map_name}' with: {requirements}...": {
+                "en": "Downloading map '{map_name}' with: {requirements}...",
+                "fr": "Téléchargement de la carte '{map_name}' avec : {requirements}..."
+            },
+            "Required Mod Version (optional):": {"en": "Required Mod Version (optional):", "fr": "Version du Mod Requise (optionnel) :"},
+            "Required Content Packs (IDs, comma-separated):": {
+                "en": "Required Content Packs (IDs, comma-separated):",
+                "fr": "Packs de Contenu Requis (IDs, séparés par des virgules) :"
+            },
+            "Snapshot worlds before updating maps": {
+                "en": "Snapshot worlds before updating maps",
+                "fr": "Sauvegarder les mondes avant de mettre à jour les cartes"
+            },
+            "Snapshots kept per world:": {"en": "Snapshots kept per world:", "fr": "Sauvegardes conservées par monde :"},
+            "World Snapshots:": {"en": "World Snapshots:", "fr": "Sauvegardes de Mondes :"},
+            "Restore Snapshot": {"en": "Restore Snapshot", "fr": "Restaurer la Sauvegarde"},
+            "Delete Snapshot": {"en": "Delete Snapshot", "fr": "Supprimer la Sauvegarde"},
+            "{world} - {date} (before v{version})": {
+                "en": "{world} - {date} (before v{version})",
+                "fr": "{world} - {date} (avant v{version})"
+            },
+            "Restore '{name}'? Changes made to the world since this snapshot will be lost.": {
+                "en": "Restore '{name}'? Changes made to the world since this snapshot will be lost.",
+                "fr": "Restaurer '{name}' ? Les modifications faites au monde depuis cette sauvegarde seront perdues."
+            },
+            "Snapshot restored ({count} files restored).": {
+                "en": "Snapshot restored ({count} files restored).",
+                "fr": "Sauvegarde restaurée ({count} fichiers restaurés)."
+            },
+            "Snapshot Restore Error": {"en": "Snapshot Restore Error", "fr": "Erreur de Restauration"},
+            "Verify and Repair Installed Content": {"en": "Verify and Repair Installed Content", "fr": "Vérifier et Réparer le Contenu Installé"},
+            "Verify and Repair": {"en": "Verify and Repair", "fr": "Vérifier et Réparer"},
+            "All installed content is intact.": {"en": "All installed content is intact.", "fr": "Tout le contenu installé est intact."},
+            "{name} ({kind}): {missing} missing, {corrupted} modified or corrupted": {
+                "en": "{name} ({kind}): {missing} missing, {corrupted} modified or corrupted",
+                "fr": "{name} ({kind}) : {missing} manquant(s), {corrupted} modifié(s) ou corrompu(s)"
+            },
+            "Problems were found:\n{problems}\n\nRepair them? Only the broken pieces will be downloaded again.": {
+                "en": "Problems were found:\n{problems}\n\nRepair them? Only the broken pieces will be downloaded again.",
+                "fr": "Des problèmes ont été détectés :\n{problems}\n\nLes réparer ? Seuls les éléments endommagés seront téléchargés à nouveau."
+            },
+            "'{name}' is no longer in the catalog and cannot be repaired.": {
+                "en": "'{name}' is no longer in the catalog and cannot be repaired.",
+                "fr": "'{name}' n'est plus dans le catalogue et ne peut pas être réparé."
+            },
+            "Verification Error": {"en": "Verification Error", "fr": "Erreur de Vérification"},
+            "The resource pack ZIP file is invalid.": {"en": "The resource pack ZIP file is invalid.", "fr": "Le fichier ZIP du pack de ressources est invalide."},
+            "Map validation failed: Resource pack ZIP file is invalid.": {
+                "en": "Map validation failed: Resource pack ZIP file is invalid.",
+                "fr": "Échec de la validation : le fichier ZIP du pack de ressources est invalide."
+            },
+            "Could not read the world information from 'level.dat': {error}": {
+                "en": "Could not read the world information from 'level.dat': {error}",
+                "fr": "Impossible de lire les informations du monde dans 'level.dat' : {error}"
+            },
+            "Map '{map_name}' was saved with Minecraft {map_version}, which is newer than the worlds of your instance (Minecraft {instance_version}). It may not load. Install it anyway?": {
+                "en": "Map '{map_name}' was saved with Minecraft {map_version}, which is newer than the worlds of your instance (Minecraft {instance_version}). It may not load. Install it anyway?",
+                "fr": "La carte '{map_name}' a été sauvegardée avec Minecraft {map_version}, plus récent que les mondes de votre instance (Minecraft {instance_version}). Elle risque de ne pas se charger. L'installer quand même ?"
+            },
+            "Minecraft {version}": {"en": "Minecraft {version}", "fr": "Minecraft {version}"},
+            "Survival": {"en": "Survival", "fr": "Survie"},
+            "Creative": {"en": "Creative", "fr": "Créatif"},
+            "Adventure": {"en": "Adventure", "fr": "Aventure"},
+            "Spectator": {"en": "Spectator", "fr": "Spectateur"},
+            "Optimize world before publishing (remove empty chunks, recompress regions)": {
+                "en": "Optimize world before publishing (remove empty chunks, recompress regions)",
+                "fr": "Optimiser le monde avant publication (supprimer les chunks vides, recompresser les régions)"
+            },
+            "Keep only the area (min X, min Z, max X, max Z):": {
+                "en": "Keep only the area (min X, min Z, max X, max Z):",
+                "fr": "Ne garder que la zone (X min, Z min, X max, Z max) :"
+            },
+            "Optional, in blocks: e.g. -200, -200, 200, 200": {
+                "en": "Optional, in blocks: e.g. -200, -200, 200, 200",
+                "fr": "Facultatif, en blocs : ex. -200, -200, 200, 200"
+            },
+            "Remove the Nether and the End": {"en": "Remove the Nether and the End", "fr": "Supprimer le Nether et l'End"},
+            "Render a top-down thumbnail of the map": {"en": "Render a top-down thumbnail of the map", "fr": "Générer une vignette de la carte vue de dessus"},
+            "World Folder...": {"en": "World Folder...", "fr": "Dossier du monde..."},
+            "Checking...": {"en": "Checking...", "fr": "Vérification..."},
+            "Map Catalog": {"en": "Map Catalog", "fr": "Catalogue de Cartes"},
+            "Installed (v{version})": {"en": "Installed (v{version})", "fr": "Installée (v{version})"},
+            "Update available: v{installed} -> v{latest}": {
+                "en": "Update available: v{installed} -> v{latest}",
+                "fr": "Mise à jour disponible : v{installed} -> v{latest}"
+            },
+            "Map '{map_name}' v{version} is already installed. Install it again?": {
+                "en": "Map '{map_name}' v{version} is already installed. Install it again?",
+                "fr": "La carte '{map_name}' v{version} est déjà installée. L'installer à nouveau ?"
+            },
+            "Content Pack '{name}' v{version} is already installed.": {
+                "en": "Content Pack '{name}' v{version} is already installed.",
+                "fr": "Le Pack de Contenu '{name}' v{version} est déjà installé."
+            },
+            "Mod v{version} is already installed.": {"en": "Mod v{version} is already installed.", "fr": "Le Mod v{version} est déjà installé."},
+            "Could not load the map details:": {"en": "Could not load the map details:", "fr": "Impossible de charger les détails de la carte :"},
+            "{count} new map(s) in the catalog.": {
+                "en": "{count} new map(s) in the catalog.",
+                "fr": "{count} nouvelle(s) carte(s) dans le catalogue."
+            },
+            "Search maps by name or description... (author:name, tag:name)": {
+                "en": "Search maps by name or description... (author:name, tag:name)",
+                "fr": "Rechercher des cartes par nom ou description... (author:nom, tag:nom)"
+            },
+            "Mod Status: Several versions installed ({jars}). Remove all but one.": {
+                "en": "Mod Status: Several versions installed ({jars}). Remove all but one.",
+                "fr": "Statut du Mod : Plusieurs versions installées ({jars}). N'en gardez qu'une."
+            },
+            "'{mod_id}' is in several jars: {jars}": {"en": "'{mod_id}' is in several jars: {jars}", "fr": "'{mod_id}' est présent dans plusieurs jars : {jars}"},
+            "Library": {"en": "Library", "fr": "Bibliothèque"},
+            "Worlds in the Saves Folder": {"en": "Worlds in the Saves Folder", "fr": "Mondes du dossier saves"},
+            "Refresh Library": {"en": "Refresh Library", "fr": "Actualiser la bibliothèque"},
+            "Open World Folder": {"en": "Open World Folder", "fr": "Ouvrir le dossier du monde"},
+            "Scanning worlds...": {"en": "Scanning worlds...", "fr": "Analyse des mondes..."},
+            "Could not scan the worlds: {error}": {"en": "Could not scan the worlds: {error}", "fr": "Impossible d'analyser les mondes : {error}"},
+            "{count} worlds, {size} MB in total.": {"en": "{count} worlds, {size} MB in total.", "fr": "{count} mondes, {size} Mo au total."},
+            "World": {"en": "World", "fr": "Monde"},
+            "Catalog Map": {"en": "Catalog Map", "fr": "Carte du catalogue"},
+            "Game Version": {"en": "Game Version", "fr": "Version du jeu"},
+            "Size": {"en": "Size", "fr": "Taille"},
+            "Last Played": {"en": "Last Played", "fr": "Dernière partie"},
+            "Invalid": {"en": "Invalid", "fr": "Invalide"},
+            "Valid": {"en": "Valid", "fr": "Valide"},
+            "Valid ({size} MB)": {"en": "Valid ({size} MB)", "fr": "Valide ({size} Mo)"},
+            "Waiting for the file checks to finish...": {"en": "Waiting for the file checks to finish...", "fr": "En attente de la fin des vérifications des fichiers..."},
+            "Select the world folder:": {"en": "Select the world folder:", "fr": "Sélectionnez le dossier du monde :"},
+            "The area to keep must be four whole numbers: min X, min Z, max X, max Z.": {
+                "en": "The area to keep must be four whole numbers: min X, min Z, max X, max Z.",
+                "fr": "La zone à garder doit être composée de quatre nombres entiers : X min, Z min, X max, Z max."
+            },
+            "Publication complete! World optimized: {chunks} chunks removed, {saved} KB saved ({before} KB -> {after} KB).": {
+                "en": "Publication complete! World optimized: {chunks} chunks removed, {saved} KB saved ({before} KB -> {after} KB).",
+                "fr": "Publication terminée ! Monde optimisé : {chunks} chunks supprimés, {saved} Ko gagnés ({before} Ko -> {after} Ko)."
             }
         }
 
@@ -605,8 +785,26 @@ class ZombieRoolLauncher(QMainWindow):
 
         # Attributes to store Minecraft paths and update data
         self.minecraft_paths = None 
+        self.minecraft_instances = [] # Registered instance folders, the active one first
         self.remote_updates_data = None 
 
+        # Running map installations, one job object per map ({map_id: MapInstallJob})
+        self.install_jobs = {}
+        self.content_repair_queue = [] # (content pack info, jars to rewrite) waiting for the content downloader
+        # Checks of the files picked in the publish tab, started as soon as they are dropped ({kind: result})
+        self.publish_checks = {}
+        self.publish_check_threads = {} # {kind: running PublishCheckThread}
+        self.publish_after_checks = False # Publish was clicked while the checks were still running
+        self.map_detail_threads = {} # {map id: MapDetailThread} fetching the catalog details of a map
+        # Mods declared by the jars of the mods folder, read from their metadata and cached by size and mtime
+        self.mods_index = ModsIndex()
+        self.mods_scan = None # (mods folder, folder mtime, ModsIndex.scan result) of the last scan
+        # Maps, resource packs, content packs and mod jar installed by the launcher, per instance
+        self.installed_registry = InstalledContentRegistry()
+        # Change notifications of the instance folders keep the mod status and library live
+        self.folder_watcher = InstanceFolderWatcher(self)
+        self.folder_watcher.folders_changed.connect(self._handle_instance_folders_changed)
+
         # --- Launcher Header ---
         self.header_label = QLabel("", self) # Text will be set by set_language
         self.header_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -641,11 +839,18 @@ class ZombieRoolLauncher(QMainWindow):
         self.translatable_widgets[self.tabs][3] = "Upload Map"
         self.setup_upload_map_tab()
 
+        # "Library" tab: worlds already in the saves folder
+        self.library_tab = QWidget()
+        self.tabs.addTab(self.library_tab, "") # Text will be set by set_language
+        self.translatable_widgets[self.tabs][4] = "Library"
+        self.setup_library_tab()
+
         # "Settings" tab
         self.settings_tab = QWidget()
         self.tabs.addTab(self.settings_tab, "") # Text will be set by set_language
-        self.translatable_widgets[self.tabs][4] = "Settings"
+        self.translatable_widgets[self.tabs][5] = "Settings"
         self.setup_settings_tab()
+        self.tabs.currentChanged.connect(self._on_tab_changed)
 
         # --- Footer (Status Bar / Launcher Version) ---
         self.status_bar = QLabel(f"", self) # Text will be set by set_language
@@ -653,6 +858,9 @@ class ZombieRoolLauncher(QMainWindow):
         self.main_layout.addWidget(self.status_bar)
         self.translatable_widgets[self.status_bar] = "Launcher Version:"
 
+        # Non-modal notifications: progress and success messages never block a running install
+        self.notifier = ToastNotifier(self.central_widget)
+
         # --- Initialization and startup checks ---
         self.load_settings() # Load saved language and theme first
         self.load_saved_minecraft_path() # Attempts to load the saved Minecraft path
@@ -707,17 +915,19 @@ class ZombieRoolLauncher(QMainWindow):
                 widget.setText(self._(text_key))
 
         # Re-apply placeholder texts for QLineEdits
-        self.map_search_input.setPlaceholderText(self._("Search maps by name or description..."))
+        self.map_search_input.setPlaceholderText(self._("Search maps by name or description... (author:name, tag:name)"))
         self.github_token_input.setPlaceholderText(self._("Enter your GitHub token (not saved!)"))
         self.upload_map_id_input.setPlaceholderText(self._("Enter a unique ID for the map (e.g., 'my-awesome-map')"))
         self.upload_map_name_input.setPlaceholderText(self._("Enter the map's display name (e.g., 'The Asylum Map')"))
         self.upload_map_version_input.setPlaceholderText(self._("Enter the map's version (e.g., '1.0.0')"))
         self.upload_map_description_input.setPlaceholderText(self._("Enter a brief description for the map."))
+        self.optimize_box_input.setPlaceholderText(self._("Optional, in blocks: e.g. -200, -200, 200, 200"))
         self.mc_path_input.setPlaceholderText(self._("Click 'Browse...' to choose your Minecraft folder"))
         self.delete_map_id_input.setPlaceholderText(self._("Enter the ID of the map to delete (e.g., 'old-map-id')"))
         self.content_code_input.setPlaceholderText(self._("Enter the secret code for the content pack"))
+        self.library_tree.setHeaderLabels([self._("World"), self._("Catalog Map"), self._("Game Version"), self._("Size"), self._("Last Played")])
 
-        # Re-load maps to show translated "Install Map" button if needed (or if filter changed text)
+        # Repaint the map rows with the translated texts
         self._load_maps_for_download_logic()
         
         # Save the new language preference
@@ -763,8 +973,8 @@ class ZombieRoolLauncher(QMainWindow):
             
         self.status_bar.setStyleSheet(theme_styles["status_bar"])
 
-        # Apply to map widgets (requires re-creating them or iterating through existing)
-        self._load_maps_for_download_logic() # Rebuilds map widgets with current theme
+        # Map rows are painted by the catalog delegate with the theme colors
+        self._load_maps_for_download_logic()
 
         # Apply to specific buttons
         self.update_mod_button.setStyleSheet(theme_styles["download_button"])
@@ -773,6 +983,7 @@ class ZombieRoolLauncher(QMainWindow):
         self.delete_map_button.setStyleSheet(theme_styles["delete_button"])
         self.refresh_maps_button.setStyleSheet(theme_styles["refresh_button"])
         self.download_content_button.setStyleSheet(theme_styles["download_button"])
+        self.uninstall_content_button.setStyleSheet(theme_styles["delete_button"])
 
         # Update general label text color for dynamic labels (like status)
         # This needs to be applied to labels not covered by specific styles
@@ -780,7 +991,8 @@ class ZombieRoolLauncher(QMainWindow):
                       self.upload_status_label, self.delete_status_label,
                       self.mc_path_label, self.mods_path_label, self.saves_path_label, 
                       self.resourcepacks_path_label, self.language_label, 
-                      self.theme_label, self.code_download_status_label]:
+                      self.theme_label, self.code_download_status_label,
+                      self.installed_content_label]:
             label.setStyleSheet(theme_styles["label_text_color"])
 
         # Apply to QLineEdits
@@ -819,6 +1031,11 @@ class ZombieRoolLauncher(QMainWindow):
         if theme_index != -1:
             self.theme_combo.setCurrentIndex(theme_index)
 
+        self.incremental_install_checkbox.setChecked(config.get('incremental_map_install', True))
+        self.snapshot_checkbox.setChecked(config.get('snapshot_before_update', True))
+        self.snapshot_retention_spinbox.setValue(config.get('snapshot_retention', DEFAULT_SNAPSHOT_RETENTION))
+        self._refresh_world_snapshots()
+
 
     # --- Tab Configuration ---
     def setup_update_tab(self):
@@ -841,7 +1058,7 @@ class ZombieRoolLauncher(QMainWindow):
         layout.addWidget(self.mod_progress_bar)
 
         self.update_mod_button = QPushButton("", self) # Text set by apply_language
-        self.update_mod_button.clicked.connect(self.update_mod) 
+        self.update_mod_button.clicked.connect(lambda: self.update_mod()) 
         self.update_mod_button.setEnabled(False) # Disabled by default, enabled if update is available
         layout.addWidget(self.update_mod_button)
         self.translatable_widgets[self.update_mod_button] = "Update Mod"
@@ -879,20 +1096,40 @@ class ZombieRoolLauncher(QMainWindow):
 
         # Search Bar for Maps
         self.map_search_input = QLineEdit()
-        self.map_search_input.textChanged.connect(self._filter_maps_display)
+        # The query is applied once typing pauses, not on every character
+        self.map_search_timer = QTimer(self)
+        self.map_search_timer.setSingleShot(True)
+        self.map_search_timer.setInterval(150)
+        self.map_search_timer.timeout.connect(self._filter_maps_display)
+        self.map_search_input.textChanged.connect(self.map_search_timer.start)
         layout.addWidget(self.map_search_input)
 
-        # Scroll Area for Maps
-        self.maps_scroll_area = QScrollArea()
-        self.maps_scroll_area.setWidgetResizable(True)
-        self.maps_scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff) # Disable horizontal scrollbar
-
-        self.maps_container_widget = QWidget()
-        self.maps_container_layout = QVBoxLayout(self.maps_container_widget)
-        self.maps_container_layout.setAlignment(Qt.AlignmentFlag.AlignTop) # Align content to top
-
-        self.maps_scroll_area.setWidget(self.maps_container_widget)
-        layout.addWidget(self.maps_scroll_area)
+        # Map catalog: a model/view list whose rows are painted on demand, so thousands of maps
+        # cost no more widgets than five. Install progress is kept in the model.
+        self.map_catalog_model = MapCatalogModel(self)
+        self.map_filter_model = MapFilterProxyModel(self)
+        self.map_filter_model.setSourceModel(self.map_catalog_model)
+        self.map_item_delegate = MapItemDelegate(self._, self)
+        self.map_item_delegate.install_requested.connect(lambda map_info, all_instances: self.install_map(map_info, all_instances=all_instances))
+        # Thumbnails are loaded in the background as their rows are painted
+        self.thumbnail_cache = ThumbnailCache(self)
+        self.thumbnail_cache.thumbnail_loaded.connect(lambda url: self.maps_list_view.viewport().update())
+        self.map_item_delegate.thumbnails = self.thumbnail_cache
+
+        self.maps_list_view = QListView(self)
+        self.maps_list_view.setModel(self.map_filter_model)
+        self.maps_list_view.setItemDelegate(self.map_item_delegate)
+        self.maps_list_view.setUniformItemSizes(True) # Rows are not measured one by one
+        self.maps_list_view.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+        self.maps_list_view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff) # Disable horizontal scrollbar
+        self.maps_list_view.setSelectionMode(QListView.SelectionMode.NoSelection)
+        self.maps_list_view.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        layout.addWidget(self.maps_list_view)
+
+        # Shown instead of the list when there is nothing to display
+        self.maps_status_label = QLabel("", self)
+        self.maps_status_label.hide()
+        layout.addWidget(self.maps_status_label)
 
         # Refresh button for maps catalog
         self.refresh_maps_button = QPushButton("") # Text set by apply_language
@@ -900,6 +1137,17 @@ class ZombieRoolLauncher(QMainWindow):
         layout.addWidget(self.refresh_maps_button)
         self.translatable_widgets[self.refresh_maps_button] = "Refresh Map Catalog"
 
+        # Checks installed maps, resource packs, mod and content packs, and re-fetches what is broken
+        self.verify_button = QPushButton("") # Text set by apply_language
+        self.verify_button.clicked.connect(self.verify_installed_content)
+        layout.addWidget(self.verify_button)
+        self.translatable_widgets[self.verify_button] = "Verify and Repair Installed Content"
+
+        self.verify_progress_bar = QProgressBar(self)
+        self.verify_progress_bar.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.verify_progress_bar.hide()
+        layout.addWidget(self.verify_progress_bar)
+
         layout.addStretch()
 
     def setup_code_download_tab(self):
@@ -925,6 +1173,13 @@ class ZombieRoolLauncher(QMainWindow):
         layout.addWidget(self.download_content_button)
         self.translatable_widgets[self.download_content_button] = "Download Content Pack"
 
+        # Same download, installed into every registered instance
+        self.download_content_all_button = QPushButton("")
+        self.download_content_all_button.clicked.connect(lambda: self.download_content_by_code(all_instances=True))
+        self.download_content_all_button.hide() # Only shown when several instances are registered
+        layout.addWidget(self.download_content_all_button)
+        self.translatable_widgets[self.download_content_all_button] = "Download to All Instances"
+
         # Status Label for Content Tab
         self.code_download_status_label = QLabel("", self) 
         self.code_download_status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -936,11 +1191,61 @@ class ZombieRoolLauncher(QMainWindow):
         self.content_progress_bar.hide()
         layout.addWidget(self.content_progress_bar)
 
+        layout.addSpacing(20)
+
+        # Installed content packs (from their installed manifests) and uninstall action
+        installed_layout = QHBoxLayout()
+        self.installed_content_label = QLabel("", self)
+        installed_layout.addWidget(self.installed_content_label)
+        self.translatable_widgets[self.installed_content_label] = "Installed Content Packs:"
+
+        self.installed_content_combo = QComboBox(self)
+        self.installed_content_combo.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        installed_layout.addWidget(self.installed_content_combo)
+
+        self.uninstall_content_button = QPushButton("")
+        self.uninstall_content_button.clicked.connect(self.uninstall_selected_content_pack)
+        installed_layout.addWidget(self.uninstall_content_button)
+        self.translatable_widgets[self.uninstall_content_button] = "Uninstall Content Pack"
+        layout.addLayout(installed_layout)
+
         layout.addStretch()
 
-    def download_content_by_code(self):
+    def _refresh_installed_content_packs(self):
+        """Fills the installed content packs combo box from the manifests of the current instance."""
+        self.installed_content_combo.clear()
+        if self.minecraft_paths and self.minecraft_paths.get('mods'):
+            for manifest in list_installed_content_packs(self.minecraft_paths['mods']):
+                self.installed_content_combo.addItem(f"{manifest.get('name', manifest['id'])} (v{manifest.get('version', '?')})", manifest['id'])
+        self.uninstall_content_button.setEnabled(self.installed_content_combo.count() > 0)
+
+    def uninstall_selected_content_pack(self):
+        """Removes exactly the files the selected content pack installed."""
+        pack_id = self.installed_content_combo.currentData()
+        if not pack_id or not self.minecraft_paths or not self.minecraft_paths.get('mods'):
+            return
+
+        reply = QMessageBox.question(self, self._("Uninstall Content Pack"),
+                                     self._("Remove all files installed by '{name}'?").format(name=self.installed_content_combo.currentText()),
+                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
+        if reply == QMessageBox.StandardButton.No:
+            return
+
+        try:
+            with mods_folder_lock:
+                removed = uninstall_content_pack(self.minecraft_paths['mods'], pack_id)
+            self.code_download_status_label.setText(self._("Content Pack uninstalled ({count} files removed).").format(count=removed))
+        except OSError as e:
+            QMessageBox.critical(self, self._("Content Installation Error"), self._("An error occurred during content installation: {e}").format(e=e))
+        self._refresh_installed_content_packs()
+
+        self.mod_status_label.setText(self._("Mod Status: Checking..."))
+        self._check_mod_update_logic()
+
+    def download_content_by_code(self, all_instances=False):
         """
         Handles the download of a content pack based on a secret code.
+        With all_instances, the pack is downloaded once and installed into every registered instance.
         """
         content_code = self.content_code_input.text().strip()
         if not content_code:
@@ -975,44 +1280,75 @@ class ZombieRoolLauncher(QMainWindow):
             QMessageBox.warning(self, self._("Content Download Error"), self._("Content download URL not found for '{name}'.").format(name=found_content_pack.get('name', 'N/A')))
             return
 
+        # Nothing to download when this version is already in every target instance
+        if all(self.installed_registry.is_installed(paths, KIND_CONTENT_PACK, found_content_pack['id'], found_content_pack.get('version'),
+                                                    found_content_pack.get('sha256'))
+               for paths in self._get_install_targets(all_instances)):
+            message = self._("Content Pack '{name}' v{version} is already installed.").format(name=found_content_pack['name'], version=found_content_pack.get('version', '?'))
+            self.code_download_status_label.setText(message)
+            self.notifier.notify(self._("Content Installation"), message)
+            return
+
+        self._start_content_pack_download(found_content_pack, all_instances)
+
+    def _start_content_pack_download(self, found_content_pack, all_instances=False, repair_paths=()):
+        """
+        Downloads a content pack, then installs it (see _install_content_from_temp).
+        repair_paths are jars to rewrite even if they look unchanged (found corrupted by a verification).
+        """
+        content_pack_download_url = found_content_pack["download_url"]
         temp_download_dir = os.path.join(os.getcwd(), "temp_downloads")
         os.makedirs(temp_download_dir, exist_ok=True)
         content_pack_filename = os.path.basename(QUrl(content_pack_download_url).path())
         temp_content_pack_path = os.path.join(temp_download_dir, content_pack_filename)
 
-        QMessageBox.information(self, self._("Download Content Pack"), self._("Downloading Content Pack '{name}' (v{version})...").format(name=found_content_pack['name'], version=found_content_pack['version']))
+        self.notifier.notify(self._("Download Content Pack"), self._("Downloading Content Pack '{name}' (v{version})...").format(name=found_content_pack['name'], version=found_content_pack['version']))
         
         self.content_progress_bar.setValue(0)
         self.content_progress_bar.show()
         self.download_content_button.setEnabled(False)
+        self.download_content_all_button.setEnabled(False)
         self.code_download_status_label.setText(self._("Downloading Content Pack '{name}'...").format(name=found_content_pack['name']))
 
         self.content_downloader = FileDownloaderThread(content_pack_download_url, temp_content_pack_path)
         self.content_downloader.download_progress.connect(self.content_progress_bar.setValue)
         self.content_downloader.download_finished.connect(
-            lambda path=temp_content_pack_path, content_pack_name=found_content_pack['name']: self._install_content_from_temp(path, content_pack_name)
+            lambda path=temp_content_pack_path, content_pack_info=found_content_pack: self._install_content_from_temp(path, content_pack_info, all_instances, repair_paths)
         )
         self.content_downloader.download_error.connect(lambda msg: self._handle_content_download_error(msg))
         self.content_downloader.start()
 
 
-    def _install_content_from_temp(self, temp_content_pack_path, content_pack_name):
+    def _install_content_from_temp(self, temp_content_pack_path, content_pack_info, all_instances=False, repair_paths=()):
         """
         Decompresses and installs the content pack into the Minecraft mods folder.
+        Only the jars that changed since the installed version are written, and jars
+        left over from an older version of the pack are removed (see content_manifest).
+        With all_instances, the other registered instances get the pack from the active one
+        (hard-linked jars when they share a volume).
         """
+        content_pack_name = content_pack_info['name']
         self.content_progress_bar.hide()
         self.code_download_status_label.setText(self._("Content Pack '{name}' downloaded. Installing...").format(name=content_pack_name))
-        QMessageBox.information(self, self._("Content Installation"), self._("Content Pack '{name}' downloaded. Installing...").format(name=content_pack_name))
+        self.notifier.notify(self._("Content Installation"), self._("Content Pack '{name}' downloaded. Installing...").format(name=content_pack_name))
         
         try:
             mods_dir = self.minecraft_paths['mods']
-            
-            with zipfile.ZipFile(temp_content_pack_path, 'r') as zip_ref:
-                # Extract all contents of the content pack directly into the mods folder
-                zip_ref.extractall(mods_dir)
 
-            QMessageBox.information(self, self._("Installation Complete"), self._("Content Pack installed successfully!"))
-            self.code_download_status_label.setText(self._("Content Pack installed successfully!"))
+            # Install the content pack into the mods folder and record its manifest
+            other_paths = self._get_other_instance_paths() if all_instances else []
+            with mods_folder_lock: # A map job may be installing requirements into the same folder
+                install_content_pack(temp_content_pack_path, mods_dir, content_pack_info, force_paths=repair_paths)
+                for instance_paths in other_paths:
+                    mirror_content_pack(mods_dir, instance_paths['mods'], content_pack_info['id'])
+            self._record_content_pack(content_pack_info, [self.minecraft_paths] + other_paths)
+            self.installed_registry.save()
+            if all_instances:
+                self.code_download_status_label.setText(self._("Installed into {count} instances.").format(count=len(other_paths) + 1))
+            else:
+                self.code_download_status_label.setText(self._("Content Pack installed successfully!"))
+
+            self.notifier.notify(self._("Installation Complete"), self._("Content Pack installed successfully!"), ToastNotifier.LEVEL_SUCCESS)
         except zipfile.BadZipFile:
             QMessageBox.critical(self, self._("Decompression Error"), self._("The content pack ZIP file is corrupted or invalid. The 'zipfile' module only supports ZIP format (not RAR)."))
             self.code_download_status_label.setText(self._("Decompression Error: Corrupted ZIP."))
@@ -1021,9 +1357,12 @@ class ZombieRoolLauncher(QMainWindow):
             self.code_download_status_label.setText(self._("Content Installation Error: {e}").format(e=e))
         finally:
             self.download_content_button.setEnabled(True)
+            self.download_content_all_button.setEnabled(True)
             if os.path.exists(temp_content_pack_path):
                 os.remove(temp_content_pack_path)
             clean_temp_dir(os.path.dirname(temp_content_pack_path))
+            self._refresh_installed_content_packs()
+            self._start_next_content_repair()
         
         # After content pack installation, re-check mod status as mods might have changed
         self.mod_status_label.setText(self._("Mod Status: Checking...")) 
@@ -1035,6 +1374,8 @@ class ZombieRoolLauncher(QMainWindow):
         QMessageBox.critical(self, self._("Content Download Error"), message)
         self.code_download_status_label.setText(self._("Download failed: {message}").format(message=message))
         self.download_content_button.setEnabled(True)
+        self.download_content_all_button.setEnabled(True)
+        self._start_next_content_repair()
 
     def setup_upload_map_tab(self):
         """Configures the 'Upload Map' tab interface."""
@@ -1106,6 +1447,27 @@ class ZombieRoolLauncher(QMainWindow):
         map_description_layout.addWidget(self.upload_map_description_input)
         layout.addLayout(map_description_layout)
 
+        # Requirements installed together with the map (minimum mod version, content packs)
+        required_mod_layout = QHBoxLayout()
+        required_mod_label = QLabel("") # Text set by apply_language
+        required_mod_layout.addWidget(required_mod_label)
+        self.translatable_widgets[required_mod_label] = "Required Mod Version (optional):"
+
+        self.upload_required_mod_input = QLineEdit()
+        self.upload_required_mod_input.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        required_mod_layout.addWidget(self.upload_required_mod_input)
+        layout.addLayout(required_mod_layout)
+
+        required_packs_layout = QHBoxLayout()
+        required_packs_label = QLabel("") # Text set by apply_language
+        required_packs_layout.addWidget(required_packs_label)
+        self.translatable_widgets[required_packs_label] = "Required Content Packs (IDs, comma-separated):"
+
+        self.upload_required_packs_input = QLineEdit()
+        self.upload_required_packs_input.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        required_packs_layout.addWidget(self.upload_required_packs_input)
+        layout.addLayout(required_packs_layout)
+
         layout.addSpacing(10)
 
         # Map File Selection (using DragDropLineEdit)
@@ -1114,14 +1476,21 @@ class ZombieRoolLauncher(QMainWindow):
         map_file_layout.addWidget(map_file_label)
         self.translatable_widgets[map_file_label] = "Select Map ZIP file:"
 
-        self.upload_map_file_path = DragDropLineEdit(self, allowed_extensions=[".zip"])
+        # A world folder can be published directly: it is packed while being uploaded
+        self.upload_map_file_path = DragDropLineEdit(self, allowed_extensions=[".zip", ".zst"], allow_directories=True)
         self.upload_map_file_path.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed) # Allow horizontal expansion
+        self.upload_map_file_path.textChanged.connect(lambda path: self._start_publish_check(KIND_MAP, self.upload_map_file_path, path))
         map_file_layout.addWidget(self.upload_map_file_path)
         
         self.browse_map_file_button = QPushButton("") # Text set by apply_language
         self.browse_map_file_button.clicked.connect(self.select_map_zip_file)
         map_file_layout.addWidget(self.browse_map_file_button)
         self.translatable_widgets[self.browse_map_file_button] = "Browse..."
+
+        self.browse_map_folder_button = QPushButton("") # Text set by apply_language
+        self.browse_map_folder_button.clicked.connect(self.select_map_world_folder)
+        map_file_layout.addWidget(self.browse_map_folder_button)
+        self.translatable_widgets[self.browse_map_folder_button] = "World Folder..."
         layout.addLayout(map_file_layout)
 
         # Resource Pack Checkbox
@@ -1138,6 +1507,7 @@ class ZombieRoolLauncher(QMainWindow):
 
         self.upload_rp_file_path = DragDropLineEdit(self, allowed_extensions=[".zip"])
         self.upload_rp_file_path.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed) # Allow horizontal expansion
+        self.upload_rp_file_path.textChanged.connect(lambda path: self._start_publish_check(KIND_RESOURCEPACK, self.upload_rp_file_path, path))
         self.rp_file_layout.addWidget(self.upload_rp_file_path)
         
         self.browse_rp_file_button = QPushButton("") # Text set by apply_language
@@ -1149,6 +1519,47 @@ class ZombieRoolLauncher(QMainWindow):
         layout.addLayout(self.rp_file_layout)
         self._toggle_rp_selection() # Initial state set
 
+        # Archive format used to publish the map (zstd unpacks much faster for worlds with many region files)
+        archive_format_layout = QHBoxLayout()
+        archive_format_label = QLabel("") # Text set by apply_language
+        archive_format_layout.addWidget(archive_format_label)
+        self.translatable_widgets[archive_format_label] = "Archive Format:"
+
+        self.archive_format_combo = QComboBox(self)
+        format_labels = {"zip": "ZIP (Deflate)", "tar.zst": "TAR + zstd (.tar.zst)", "zip-zstd": "ZIP + zstd (method 93)"}
+        for format_key in get_output_formats():
+            self.archive_format_combo.addItem(format_labels[format_key], format_key)
+        self.archive_format_combo.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        archive_format_layout.addWidget(self.archive_format_combo)
+        layout.addLayout(archive_format_layout)
+
+        # Optional world optimization: empty chunks removed and region files recompressed before upload
+        self.optimize_world_checkbox = QCheckBox("") # Text set by apply_language
+        self.optimize_world_checkbox.toggled.connect(self._toggle_optimize_options)
+        layout.addWidget(self.optimize_world_checkbox)
+        self.translatable_widgets[self.optimize_world_checkbox] = "Optimize world before publishing (remove empty chunks, recompress regions)"
+
+        optimize_box_layout = QHBoxLayout()
+        self.optimize_box_label = QLabel("") # Text set by apply_language
+        optimize_box_layout.addWidget(self.optimize_box_label)
+        self.translatable_widgets[self.optimize_box_label] = "Keep only the area (min X, min Z, max X, max Z):"
+        self.optimize_box_input = QLineEdit(self)
+        self.optimize_box_input.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        optimize_box_layout.addWidget(self.optimize_box_input)
+        layout.addLayout(optimize_box_layout)
+
+        self.optimize_drop_dimensions_checkbox = QCheckBox("") # Text set by apply_language
+        layout.addWidget(self.optimize_drop_dimensions_checkbox)
+        self.translatable_widgets[self.optimize_drop_dimensions_checkbox] = "Remove the Nether and the End"
+        self._toggle_optimize_options()
+
+        # Top-down preview rendered from the region files and published with the map
+        self.render_thumbnail_checkbox = QCheckBox("") # Text set by apply_language
+        self.render_thumbnail_checkbox.setChecked(is_thumbnail_renderer_available())
+        self.render_thumbnail_checkbox.setEnabled(is_thumbnail_renderer_available())
+        layout.addWidget(self.render_thumbnail_checkbox)
+        self.translatable_widgets[self.render_thumbnail_checkbox] = "Render a top-down thumbnail of the map"
+
         layout.addSpacing(20)
 
         # Upload Button
@@ -1199,13 +1610,76 @@ class ZombieRoolLauncher(QMainWindow):
             if widget_item.widget():
                 widget_item.widget().setVisible(is_checked)
 
+    def _start_publish_check(self, kind, line_edit, path):
+        """
+        Validates, hashes and reads the metadata of a picked map or resource pack in the background,
+        so the publish step can reuse the result instead of blocking the window.
+        """
+        self.publish_checks.pop(kind, None)
+        path = path.strip()
+        if not path:
+            line_edit.clear_badge()
+            return
+        line_edit.set_badge(self._("Checking..."), "pending")
+        thread = PublishCheckThread(path, kind)
+        thread.check_finished.connect(lambda result: self._handle_publish_check_finished(line_edit, thread, result))
+        self.publish_check_threads[kind] = thread
+        thread.start()
+
+    def _handle_publish_check_finished(self, line_edit, thread, result):
+        """Shows the result of a publish check on its field, unless another file was picked meanwhile."""
+        if self.publish_check_threads.get(result['kind']) is thread:
+            del self.publish_check_threads[result['kind']]
+        if result['path'] != line_edit.text().strip():
+            return # Outdated: a newer check is running for the new path
+        self.publish_checks[result['kind']] = result
+        problems = result['problems'] + ([result['metadata_error']] if result['metadata_error'] else [])
+        if problems:
+            line_edit.set_badge(self._("Invalid"), "error", "\n".join(problems))
+        elif result['size'] is not None:
+            line_edit.set_badge(self._("Valid ({size} MB)").format(size=f"{result['size'] / (1024 * 1024):.1f}"), "ok",
+                                f"SHA-256: {result['sha256']}")
+        else:
+            line_edit.set_badge(self._("Valid"), "ok")
+        if self.publish_after_checks and not self.publish_check_threads:
+            self.publish_after_checks = False
+            self.publish_map_to_github()
+
+    def _get_publish_check(self, kind, path):
+        """
+        Result of the checks of a picked file if the file did not change since. Otherwise the checks
+        are started again in the background and None is returned: hashing a large map here would freeze the window.
+        """
+        result = self.publish_checks.get(kind)
+        if result and result['path'] == path:
+            if result['signature'] is not None and result['signature'] == get_file_signature(path):
+                return result
+            if result['signature'] is None and result['problems']:
+                return result # The check itself failed: checking again would fail the same way
+        line_edit = self.upload_map_file_path if kind == KIND_MAP else self.upload_rp_file_path
+        self._start_publish_check(kind, line_edit, path)
+        return None
+
+    def _toggle_optimize_options(self):
+        """The optimizer settings only apply when the world optimization is checked."""
+        is_checked = self.optimize_world_checkbox.isChecked()
+        self.optimize_box_label.setEnabled(is_checked)
+        self.optimize_box_input.setEnabled(is_checked)
+        self.optimize_drop_dimensions_checkbox.setEnabled(is_checked)
+
 
     def select_map_zip_file(self):
         """Opens a file dialog to select the map ZIP file."""
-        file_path, _ = QFileDialog.getOpenFileName(self, self._("Select Map ZIP file:"), "", self._("ZIP Files (*.zip)"))
+        file_path, _ = QFileDialog.getOpenFileName(self, self._("Select Map ZIP file:"), "", self._("Map Archives (*.zip *.tar.zst)"))
         if file_path:
             self.upload_map_file_path.setText(file_path)
 
+    def select_map_world_folder(self):
+        """Opens a folder dialog to publish a world folder without zipping it first."""
+        folder_path = QFileDialog.getExistingDirectory(self, self._("Select the world folder:"), self.minecraft_paths.get('saves', "") if self.minecraft_paths else "")
+        if folder_path:
+            self.upload_map_file_path.setText(folder_path)
+
     def select_rp_zip_file(self):
         """Opens a file dialog to select the resource pack ZIP file."""
         file_path, _ = QFileDialog.getOpenFileName(self, self._("Select Resource Pack ZIP file:"), "", self._("ZIP Files (*.zip)"))
@@ -1231,7 +1705,8 @@ class ZombieRoolLauncher(QMainWindow):
             QMessageBox.warning(self, self._("Missing Information"), self._("Please enter your GitHub Personal Access Token."))
             self.upload_status_label.setText(self._("Publication failed: Missing GitHub token."))
             return
-        if not map_id or not map_name or not map_version or not map_zip_path:
+        # The map name may be left empty: it is then taken from the LevelName of level.dat
+        if not map_id or not map_version or not map_zip_path:
             QMessageBox.warning(self, self._("Missing Information"), self._("Please fill in Map ID, Map Name, Map Version, and select the Map ZIP file."))
             self.upload_status_label.setText(self._("Publication failed: Missing map information."))
             return
@@ -1244,12 +1719,64 @@ class ZombieRoolLauncher(QMainWindow):
             self.upload_status_label.setText(self._("Publication failed: RP ZIP not found."))
             return
 
+        # The files are checked as soon as they are picked: wait for those checks instead of redoing them
+        if self.publish_check_threads:
+            self.publish_after_checks = True
+            self.upload_status_label.setText(self._("Waiting for the file checks to finish..."))
+            return
+
         # --- Pre-upload Map Validation ---
+        # Only the archive index and a few headers are read: nothing is extracted
         self.upload_status_label.setText(self._("Validating map ZIP file..."))
-        if not is_valid_map_zip(map_zip_path):
-            QMessageBox.critical(self, self._("Map validation error"), self._("Map ZIP file is invalid. It must contain 'level.dat' and a 'region' folder at its root or within a single root folder."))
+        map_check = self._get_publish_check(KIND_MAP, map_zip_path)
+        rp_check = self._get_publish_check(KIND_RESOURCEPACK, rp_zip_path) if has_rp else None
+        if map_check is None or (has_rp and rp_check is None):
+            # A file changed since it was checked: publish once its new checks are done
+            self.publish_after_checks = True
+            self.upload_status_label.setText(self._("Waiting for the file checks to finish..."))
+            return
+        map_problems = map_check['problems']
+        if map_problems:
+            QMessageBox.critical(self, self._("Map validation error"), self._("Map ZIP file is invalid. It must contain 'level.dat' and a 'region' folder at its root or within a single root folder.")
+                                 + "\n\n" + "\n".join(map_problems))
+            self.upload_status_label.setText(self._("Map validation failed: Map ZIP file is invalid."))
+            return
+        rp_problems = rp_check['problems'] if rp_check else []
+        if rp_problems:
+            QMessageBox.critical(self, self._("Map validation error"), self._("The resource pack ZIP file is invalid.") + "\n\n" + "\n".join(rp_problems))
+            self.upload_status_label.setText(self._("Map validation failed: Resource pack ZIP file is invalid."))
+            return
+
+        optimize_options = None
+        if self.optimize_world_checkbox.isChecked():
+            bounding_box = None
+            box_text = self.optimize_box_input.text().strip()
+            if box_text:
+                try:
+                    bounding_box = tuple(int(value) for value in box_text.replace(";", ",").split(","))
+                except ValueError:
+                    bounding_box = ()
+                if len(bounding_box) != 4:
+                    QMessageBox.warning(self, self._("Missing Information"), self._("The area to keep must be four whole numbers: min X, min Z, max X, max Z."))
+                    self.upload_status_label.setText(self._("Publication failed: Missing map information."))
+                    return
+            optimize_options = {"bounding_box": bounding_box,
+                                "drop_other_dimensions": self.optimize_drop_dimensions_checkbox.isChecked()}
+
+        # level.dat is streamed out of the archive: the catalog entry then tells which game
+        # version the map needs, so players are warned before downloading a map they cannot load
+        world_metadata = map_check['metadata'] or {}
+        if map_check['metadata_error']:
+            QMessageBox.critical(self, self._("Map validation error"), self._("Could not read the world information from 'level.dat': {error}").format(error=map_check['metadata_error']))
             self.upload_status_label.setText(self._("Map validation failed: Map ZIP file is invalid."))
             return
+        if not map_name:
+            map_name = (world_metadata.get('level_name') or "").strip()
+            if not map_name:
+                QMessageBox.warning(self, self._("Missing Information"), self._("Please fill in Map ID, Map Name, Map Version, and select the Map ZIP file."))
+                self.upload_status_label.setText(self._("Publication failed: Missing map information."))
+                return
+            self.upload_map_name_input.setText(map_name)
         
         # --- Version Conflict Resolution ---
         # Fetch latest updates.json to check for existing maps (if not already fresh)
@@ -1266,9 +1793,28 @@ class ZombieRoolLauncher(QMainWindow):
             "latest_version": map_version,
             "description": map_description
         }
+        world_info = {key: value for key, value in world_metadata.items() if key not in ('level_name', 'last_played') and value is not None}
+        if world_info:
+            map_info["world"] = world_info
+        if map_check['sha256']:
+            map_info["sha256"] = map_check['sha256'] # Published only if the archive is uploaded as is
+            map_info["size"] = map_check['size']
+        if rp_check and rp_check['sha256']:
+            map_info["resourcepack_sha256"] = rp_check['sha256'] # Lets "Verify and Repair" check the installed pack
+        required_mod_version = self.upload_required_mod_input.text().strip()
+        required_packs = [pack_id.strip() for pack_id in self.upload_required_packs_input.text().split(",") if pack_id.strip()]
+        if required_mod_version or required_packs:
+            map_info["requires"] = {}
+            if required_mod_version:
+                map_info["requires"]["mod"] = required_mod_version
+            if required_packs:
+                map_info["requires"]["content_packs"] = required_packs
 
         # Start GitHub upload in a separate thread
-        self.uploader_thread = GitHubUploaderThread(github_token, map_info, map_zip_path, rp_zip_path, self.remote_updates_data)
+        self.uploader_thread = GitHubUploaderThread(github_token, map_info, map_zip_path, rp_zip_path, self.remote_updates_data,
+                                                    output_format=self.archive_format_combo.currentData(),
+                                                    optimize_options=optimize_options,
+                                                    render_thumbnail=self.render_thumbnail_checkbox.isChecked())
         self.uploader_thread.progress_update.connect(self.upload_status_label.setText) # Connect to base class signal
         self.uploader_thread.upload_finished.connect(self._handle_upload_finished)
         self.uploader_thread.error_occurred.connect(self._handle_upload_error) # Connect to base class signal
@@ -1278,8 +1824,14 @@ class ZombieRoolLauncher(QMainWindow):
         """Handles successful map upload."""
         self.publish_map_button.setEnabled(True)
         self.upload_status_label.setText(self._("Publication complete! Check GitHub."))
-        QMessageBox.information(self, self._("Publication Success"), 
-                                self._("Map '{map_name}' (v{map_version}) has been successfully published to GitHub and updates.json has been updated!").format(map_name=map_info['name'], map_version=map_info['latest_version']))
+        stats = self.uploader_thread.optimization_stats
+        if stats:
+            self.upload_status_label.setText(self._("Publication complete! World optimized: {chunks} chunks removed, {saved} KB saved ({before} KB -> {after} KB).").format(
+                chunks=stats['chunks_removed'], saved=(stats['size_before'] - stats['size_after']) // 1024,
+                before=stats['size_before'] // 1024, after=stats['size_after'] // 1024))
+        self.notifier.notify(self._("Publication Success"),
+                             self._("Map '{map_name}' (v{map_version}) has been successfully published to GitHub and updates.json has been updated!").format(map_name=map_info['name'], map_version=map_info['latest_version']),
+                             ToastNotifier.LEVEL_SUCCESS)
         
         # Clear fields after successful upload, but keep token for convenience
         self.upload_map_id_input.clear()
@@ -1338,8 +1890,9 @@ class ZombieRoolLauncher(QMainWindow):
         """Handles successful map deletion."""
         self.delete_map_button.setEnabled(True)
         self.delete_status_label.setText(self._("Deletion complete for map ID '{map_id}'.").format(map_id=map_id))
-        QMessageBox.information(self, self._("Deletion Success"), 
-                                self._("Map ID '{map_id}' and its associated GitHub releases have been successfully deleted, and updates.json has been updated!").format(map_id=map_id))
+        self.notifier.notify(self._("Deletion Success"),
+                             self._("Map ID '{map_id}' and its associated GitHub releases have been successfully deleted, and updates.json has been updated!").format(map_id=map_id),
+                             ToastNotifier.LEVEL_SUCCESS)
         self.delete_map_id_input.clear()
         # Force refresh of map list in download tab with cache bust
         self.check_for_updates(cache_bust=True) 
@@ -1350,6 +1903,87 @@ class ZombieRoolLauncher(QMainWindow):
         self.delete_status_label.setText(self._("Deletion failed: {message}").format(message=message))
         QMessageBox.critical(self, self._("Deletion Error"), message)
 
+    def setup_library_tab(self):
+        """Configures the 'Library' tab interface."""
+        layout = QVBoxLayout(self.library_tab)
+        layout.setContentsMargins(20, 20, 20, 20)
+
+        self.library_label = QLabel("", self) # Text set by apply_language
+        layout.addWidget(self.library_label)
+        self.translatable_widgets[self.library_label] = "Worlds in the Saves Folder"
+
+        self.library_tree = QTreeWidget(self)
+        self.library_tree.setRootIsDecorated(False)
+        self.library_tree.setColumnCount(5)
+        self.library_tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.library_tree.itemDoubleClicked.connect(lambda item, column: self.open_selected_library_world())
+        layout.addWidget(self.library_tree)
+
+        self.library_status_label = QLabel("", self)
+        layout.addWidget(self.library_status_label)
+
+        library_buttons_layout = QHBoxLayout()
+        self.refresh_library_button = QPushButton("") # Text set by apply_language
+        self.refresh_library_button.clicked.connect(self.refresh_world_library)
+        library_buttons_layout.addWidget(self.refresh_library_button)
+        self.translatable_widgets[self.refresh_library_button] = "Refresh Library"
+
+        self.open_library_world_button = QPushButton("") # Text set by apply_language
+        self.open_library_world_button.clicked.connect(self.open_selected_library_world)
+        library_buttons_layout.addWidget(self.open_library_world_button)
+        self.translatable_widgets[self.open_library_world_button] = "Open World Folder"
+        layout.addLayout(library_buttons_layout)
+
+        self.library_scan_thread = None
+        self.library_worlds = []
+
+    def _on_tab_changed(self, index):
+        if self.tabs.widget(index) is self.library_tab:
+            self.refresh_world_library()
+
+    def refresh_world_library(self):
+        """Rescans the saves folder in the background. Only the worlds changed since the last scan are read."""
+        if not self.minecraft_paths or not self.minecraft_paths.get('saves'):
+            self.library_tree.clear()
+            self.library_status_label.setText(self._("Saves Folder: Not Configured"))
+            return
+        if self.library_scan_thread and self.library_scan_thread.isRunning():
+            return
+        self.library_status_label.setText(self._("Scanning worlds..."))
+        catalog_maps = self.remote_updates_data.get('maps', []) if self.remote_updates_data else []
+        self.library_scan_thread = WorldLibraryScanThread(self.minecraft_paths['saves'], catalog_maps)
+        self.library_scan_thread.scan_finished.connect(self._handle_library_scan_finished)
+        self.library_scan_thread.scan_error.connect(lambda error: self.library_status_label.setText(self._("Could not scan the worlds: {error}").format(error=error)))
+        self.library_scan_thread.start()
+
+    def _handle_library_scan_finished(self, worlds):
+        """Fills the library with the scanned worlds."""
+        self.library_worlds = worlds
+        self.library_tree.clear()
+        total_size = 0
+        for world in worlds:
+            total_size += world['size']
+            name = world['folder'] if not world['level_name'] or world['level_name'] == world['folder'] else f"{world['folder']} ({world['level_name']})"
+            catalog_text = world['map_id'] or "-"
+            version_text = world['version_name'] or "-"
+            if world['game_mode']:
+                version_text = f"{version_text} - {self._(world['game_mode'].capitalize())}"
+            last_played = "-"
+            if world['last_played']:
+                last_played = time.strftime("%Y-%m-%d %H:%M", time.localtime(world['last_played'] / 1000))
+            item = QTreeWidgetItem([name, catalog_text, version_text, f"{world['size'] / (1024 * 1024):.1f} MB", last_played])
+            item.setData(0, Qt.ItemDataRole.UserRole, world['path'])
+            item.setTextAlignment(3, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+            self.library_tree.addTopLevelItem(item)
+        self.library_status_label.setText(self._("{count} worlds, {size} MB in total.").format(
+            count=len(worlds), size=f"{total_size / (1024 * 1024):.1f}"))
+
+    def open_selected_library_world(self):
+        """Opens the selected world folder in the file manager."""
+        item = self.library_tree.currentItem()
+        if item:
+            QDesktopServices.openUrl(QUrl.fromLocalFile(item.data(0, Qt.ItemDataRole.UserRole)))
+
     def setup_settings_tab(self):
         """Configures the 'Settings' tab interface."""
         layout = QVBoxLayout(self.settings_tab)
@@ -1387,6 +2021,74 @@ class ZombieRoolLauncher(QMainWindow):
         self.translatable_widgets[self.saves_path_label] = "Saves Folder: Not Detected"
         self.translatable_widgets[self.resourcepacks_path_label] = "Resourcepacks Folder: Not Detected"
 
+        # Incremental map installation (only rewrite files that changed)
+        self.incremental_install_checkbox = QCheckBox("", self) # Text set by apply_language
+        self.incremental_install_checkbox.setChecked(True)
+        self.incremental_install_checkbox.stateChanged.connect(self._on_incremental_install_changed)
+        layout.addWidget(self.incremental_install_checkbox)
+        self.translatable_widgets[self.incremental_install_checkbox] = "Incremental map updates (only rewrite changed files)"
+
+        # Registered instances ("Install to All" installs into every one of them)
+        self.instances_label = QLabel("", self) # Text set by apply_language
+        layout.addWidget(self.instances_label)
+        self.translatable_widgets[self.instances_label] = "Registered Instances:"
+
+        self.instances_list = QListWidget(self)
+        self.instances_list.setMaximumHeight(90)
+        layout.addWidget(self.instances_list)
+
+        instances_buttons_layout = QHBoxLayout()
+        self.add_instance_button = QPushButton("") # Text set by apply_language
+        self.add_instance_button.clicked.connect(self.add_minecraft_instance)
+        instances_buttons_layout.addWidget(self.add_instance_button)
+        self.translatable_widgets[self.add_instance_button] = "Add Instance..."
+
+        self.remove_instance_button = QPushButton("") # Text set by apply_language
+        self.remove_instance_button.clicked.connect(self.remove_selected_minecraft_instance)
+        instances_buttons_layout.addWidget(self.remove_instance_button)
+        self.translatable_widgets[self.remove_instance_button] = "Remove Instance"
+        layout.addLayout(instances_buttons_layout)
+
+        # Snapshots taken before a map update overwrites an existing world
+        self.snapshot_checkbox = QCheckBox("", self) # Text set by apply_language
+        self.snapshot_checkbox.setChecked(True)
+        self.snapshot_checkbox.stateChanged.connect(self._on_snapshot_settings_changed)
+        layout.addWidget(self.snapshot_checkbox)
+        self.translatable_widgets[self.snapshot_checkbox] = "Snapshot worlds before updating maps"
+
+        snapshot_retention_layout = QHBoxLayout()
+        self.snapshot_retention_label = QLabel("", self) # Text set by apply_language
+        snapshot_retention_layout.addWidget(self.snapshot_retention_label)
+        self.translatable_widgets[self.snapshot_retention_label] = "Snapshots kept per world:"
+
+        self.snapshot_retention_spinbox = QSpinBox(self)
+        self.snapshot_retention_spinbox.setRange(1, 20)
+        self.snapshot_retention_spinbox.setValue(DEFAULT_SNAPSHOT_RETENTION)
+        self.snapshot_retention_spinbox.valueChanged.connect(self._on_snapshot_settings_changed)
+        snapshot_retention_layout.addWidget(self.snapshot_retention_spinbox)
+        snapshot_retention_layout.addStretch()
+        layout.addLayout(snapshot_retention_layout)
+
+        snapshots_layout = QHBoxLayout()
+        self.snapshots_label = QLabel("", self) # Text set by apply_language
+        snapshots_layout.addWidget(self.snapshots_label)
+        self.translatable_widgets[self.snapshots_label] = "World Snapshots:"
+
+        self.snapshots_combo = QComboBox(self)
+        self.snapshots_combo.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        snapshots_layout.addWidget(self.snapshots_combo)
+
+        self.restore_snapshot_button = QPushButton("") # Text set by apply_language
+        self.restore_snapshot_button.clicked.connect(self.restore_selected_snapshot)
+        snapshots_layout.addWidget(self.restore_snapshot_button)
+        self.translatable_widgets[self.restore_snapshot_button] = "Restore Snapshot"
+
+        self.delete_snapshot_button = QPushButton("") # Text set by apply_language
+        self.delete_snapshot_button.clicked.connect(self.delete_selected_snapshot)
+        snapshots_layout.addWidget(self.delete_snapshot_button)
+        self.translatable_widgets[self.delete_snapshot_button] = "Delete Snapshot"
+        layout.addLayout(snapshots_layout)
+
         layout.addSpacing(20)
 
         # Language Selection
@@ -1430,7 +2132,8 @@ class ZombieRoolLauncher(QMainWindow):
                 "header_label": "font-size: 24px; font-weight: bold; padding: 20px; color: #E74C3C;",
                 "section_label": "font-size: 18px; font-weight: bold; margin-top: 10px; color: #2C3E50;",
                 "status_bar": "font-size: 10px; padding: 5px; color: #555;",
-                "map_widget": "background-color: #F8F8F8; border: 1px solid #DDD; border-radius: 5px; padding: 10px; margin-bottom: 5px;",
+                "map_row": {"background": "#F8F8F8", "border": "#DDD", "text": "#333", "secondary": "#555", "button": "#2ECC71",
+                            "installed": "#27AE60", "update": "#E67E22"}, # Painted by MapItemDelegate
                 "download_button": "background-color: #2ECC71; color: white; border-radius: 5px; padding: 5px;",
                 "publish_button": "background-color: #3498DB; color: white; border-radius: 5px; padding: 10px;",
                 "delete_button": "background-color: #C0392B; color: white; border-radius: 5px; padding: 10px;",
@@ -1449,7 +2152,8 @@ class ZombieRoolLauncher(QMainWindow):
                 "header_label": "font-size: 24px; font-weight: bold; padding: 20px; color: #E74C3C;", # Red stays
                 "section_label": "font-size: 18px; font-weight: bold; margin-top: 10px; color: #ECF0F1;",
                 "status_bar": "font-size: 10px; padding: 5px; color: #BDC3C7;",
-                "map_widget": "background-color: #34495E; border: 1px solid #555; border-radius: 5px; padding: 10px; margin-bottom: 5px; color: #ECF0F1;",
+                "map_row": {"background": "#34495E", "border": "#555", "text": "#ECF0F1", "secondary": "#BDC3C7", "button": "#27AE60",
+                            "installed": "#2ECC71", "update": "#F39C12"},
                 "download_button": "background-color: #27AE60; color: white; border-radius: 5px; padding: 5px;",
                 "publish_button": "background-color: #2980B9; color: white; border-radius: 5px; padding: 10px;",
                 "delete_button": "background-color: #A03422; color: white; border-radius: 5px; padding: 10px;",
@@ -1469,6 +2173,121 @@ class ZombieRoolLauncher(QMainWindow):
         theme_name = self.theme_combo.itemData(index)
         self.apply_theme(theme_name)
 
+    def _on_incremental_install_changed(self):
+        config = load_config()
+        config['incremental_map_install'] = self.incremental_install_checkbox.isChecked()
+        save_config(config)
+
+    def _on_snapshot_settings_changed(self):
+        config = load_config()
+        config['snapshot_before_update'] = self.snapshot_checkbox.isChecked()
+        config['snapshot_retention'] = self.snapshot_retention_spinbox.value()
+        save_config(config)
+        self.snapshot_retention_spinbox.setEnabled(self.snapshot_checkbox.isChecked())
+
+    def _refresh_world_snapshots(self):
+        """Fills the snapshot combo box with the snapshots of every world, newest first."""
+        self.snapshots_combo.clear()
+        for snapshot in list_world_snapshots():
+            date = time.strftime('%Y-%m-%d %H:%M', time.localtime(snapshot.get('created_at', 0)))
+            self.snapshots_combo.addItem(self._("{world} - {date} (before v{version})").format(
+                world=snapshot.get('world_name', '?'), date=date, version=snapshot.get('label', '?')), snapshot)
+        has_snapshots = self.snapshots_combo.count() > 0
+        self.restore_snapshot_button.setEnabled(has_snapshots)
+        self.delete_snapshot_button.setEnabled(has_snapshots)
+
+    def restore_selected_snapshot(self):
+        """Restores the world of the selected snapshot in a worker thread."""
+        snapshot = self.snapshots_combo.currentData()
+        if not snapshot:
+            return
+        reply = QMessageBox.question(self, self._("Restore Snapshot"),
+                                     self._("Restore '{name}'? Changes made to the world since this snapshot will be lost.").format(name=self.snapshots_combo.currentText()),
+                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
+        if reply == QMessageBox.StandardButton.No:
+            return
+
+        self.restore_snapshot_button.setEnabled(False)
+        self.snapshot_restore_thread = SnapshotRestoreThread(snapshot)
+        self.snapshot_restore_thread.restore_finished.connect(self._handle_snapshot_restored)
+        self.snapshot_restore_thread.restore_error.connect(self._handle_snapshot_restore_error)
+        self.snapshot_restore_thread.start()
+
+    def _handle_snapshot_restored(self, stats):
+        self.restore_snapshot_button.setEnabled(True)
+        self.notifier.notify(self._("Restore Snapshot"), self._("Snapshot restored ({count} files restored).").format(count=stats['restored']),
+                             ToastNotifier.LEVEL_SUCCESS)
+
+    def _handle_snapshot_restore_error(self, message):
+        self.restore_snapshot_button.setEnabled(True)
+        QMessageBox.critical(self, self._("Snapshot Restore Error"), message)
+
+    def delete_selected_snapshot(self):
+        snapshot = self.snapshots_combo.currentData()
+        if not snapshot:
+            return
+        try:
+            delete_world_snapshot(snapshot)
+        except OSError as e:
+            QMessageBox.critical(self, self._("Error"), str(e))
+        self._refresh_world_snapshots()
+
+    def _refresh_minecraft_instances(self):
+        """Reloads the registered instances and updates the widgets that depend on them."""
+        self.minecraft_instances = get_minecraft_instances(load_config())
+        self.instances_list.clear()
+        self.instances_list.addItems(self.minecraft_instances)
+        self.remove_instance_button.setEnabled(len(self.minecraft_instances) > 1)
+        self.download_content_all_button.setVisible(len(self.minecraft_instances) > 1)
+        if self.remote_updates_data:
+            self._load_maps_for_download_logic() # Show or hide the "Install to All" buttons
+
+    def _record_content_pack(self, pack_info, targets):
+        """Records a content pack installed into the target instances, with the jars of their manifests."""
+        for paths in targets:
+            manifest = load_content_manifest(paths['mods'], pack_info['id']) or {}
+            self.installed_registry.record(paths, KIND_CONTENT_PACK, pack_info['id'], pack_info.get('version'), pack_info.get('sha256'),
+                                           [os.path.join(paths['mods'], relative_path) for relative_path in manifest.get('files', {})])
+
+    def _get_install_targets(self, all_instances=False):
+        """Sub paths of the instances an install goes to: the active one, and every other one with all_instances."""
+        return [self.minecraft_paths] + (self._get_other_instance_paths() if all_instances else [])
+
+    def _get_other_instance_paths(self):
+        """Returns the sub paths (mods, saves, resourcepacks) of every registered instance except the active one."""
+        active_path = os.path.normcase(os.path.abspath(self.mc_path_input.text()))
+        other_paths = []
+        for instance_path in self.minecraft_instances:
+            if os.path.normcase(os.path.abspath(instance_path)) == active_path:
+                continue
+            sub_paths = get_minecraft_sub_paths(instance_path)
+            if sub_paths:
+                other_paths.append(sub_paths)
+        return other_paths
+
+    def add_minecraft_instance(self):
+        """Registers another Minecraft instance folder."""
+        selected_path = QFileDialog.getExistingDirectory(self, self._("Select Minecraft Instance Folder"), os.path.expanduser('~'))
+        if not selected_path:
+            return
+        if not get_minecraft_sub_paths(selected_path):
+            QMessageBox.warning(self, self._("Invalid Path"),
+                                self._("The selected path does not appear to be a valid Minecraft instance (mods, saves, resourcepacks folders not found)."))
+            return
+        register_minecraft_instance(selected_path)
+        self._refresh_minecraft_instances()
+
+    def remove_selected_minecraft_instance(self):
+        """Unregisters the selected instance folder (its files are left untouched)."""
+        item = self.instances_list.currentItem()
+        if not item:
+            return
+        if os.path.normcase(os.path.abspath(item.text())) == os.path.normcase(os.path.abspath(self.mc_path_input.text())):
+            QMessageBox.warning(self, self._("Invalid Path"), self._("The active instance cannot be removed. Select another instance folder first."))
+            return
+        unregister_minecraft_instance(item.text())
+        self._refresh_minecraft_instances()
+
 
     # --- Minecraft Path Logic Functions ---
     def load_saved_minecraft_path(self):
@@ -1495,6 +2314,7 @@ class ZombieRoolLauncher(QMainWindow):
             self.mods_path_label.setText(self._("Mods Folder: Not Configured"))
             self.saves_path_label.setText(self._("Saves Folder: Not Configured"))
             self.resourcepacks_path_label.setText(self._("Resourcepacks Folder: Not Configured"))
+            self._refresh_minecraft_instances()
 
     def browse_minecraft_path(self):
         """
@@ -1528,12 +2348,19 @@ class ZombieRoolLauncher(QMainWindow):
             config = load_config()
             config['minecraft_path'] = path
             save_config(config)
+            register_minecraft_instance(path)
+            self.folder_watcher.watch(self.minecraft_paths)
+            self._refresh_installed_content_packs()
+            self._refresh_minecraft_instances()
 
             if show_message:
-                QMessageBox.information(self, self._("Minecraft Path Configured"), 
-                                        f"{self._('The Minecraft folder has been manually configured:')} {path}")
+                self.notifier.notify(self._("Minecraft Path Configured"),
+                                     f"{self._('The Minecraft folder has been manually configured:')} {path}")
         else:
             self.minecraft_paths = None
+            self.folder_watcher.watch(None)
+            self._refresh_installed_content_packs()
+            self._refresh_minecraft_instances()
             self.mods_path_label.setText(self._("Mods Folder: Not Detected"))
             self.saves_path_label.setText(self._("Saves Folder: Not Detected"))
             self.resourcepacks_path_label.setText(self._("Resourcepacks Folder: Not Detected"))
@@ -1572,7 +2399,8 @@ class ZombieRoolLauncher(QMainWindow):
         self.content_progress_bar.hide()
 
         # Create and start the update checker thread
-        self.update_checker_thread = UpdateCheckerThread(UPDATES_JSON_URL, cache_bust=cache_bust)
+        self.update_checker_thread = UpdateCheckerThread(UPDATES_JSON_URL, cache_bust=cache_bust,
+                                                          index_urls=(CATALOG_INDEX_GZIP_URL, CATALOG_INDEX_URL))
         # Connect thread signals to slots (functions) in the main class
         self.update_checker_thread.update_data_ready.connect(self.process_remote_updates)
         self.update_checker_thread.error_occurred.connect(self.handle_update_error)
@@ -1690,7 +2518,7 @@ class ZombieRoolLauncher(QMainWindow):
         temp_destination_path = os.path.join(temp_dir, file_name)
 
         if not auto_trigger: # Only show info if manually triggered
-            QMessageBox.information(self, self._("Launcher Update"), self._("Downloading new launcher version ({latest_version})...").format(latest_version=launcher_info['latest_version']))
+            self.notifier.notify(self._("Launcher Update"), self._("Downloading new launcher version ({latest_version})...").format(latest_version=launcher_info['latest_version']))
         
         self.launcher_progress_bar.setValue(0)
         self.launcher_progress_bar.show()
@@ -1806,36 +2634,67 @@ exit
         except Exception as e:
             self.mod_status_label.setText(f"❌ {self._('Mod Status: Version error ({e})').format(e=e)}")
             print(f"Mod version comparison error: {e}")
+        self._show_mod_conflicts()
 
-    def _get_local_mod_version(self):
+    def _show_mod_conflicts(self):
+        """Warns about several versions of the mod, and lists the mods found in several jars in the status tooltip."""
+        scan_result = self._scan_mods_folder()
+        if not scan_result:
+            self.mod_status_label.setToolTip("")
+            return
+        mod_jars = find_launcher_mod_jars(scan_result)
+        if len(mod_jars) > 1:
+            self.mod_status_label.setText(f"⚠️ {self._('Mod Status: Several versions installed ({jars}). Remove all but one.').format(jars=', '.join(mod_jars))}")
+            self.update_mod_button.setEnabled(True) # Reinstalling the mod removes the other jars
+        self.mod_status_label.setToolTip("\n".join(
+            self._("'{mod_id}' is in several jars: {jars}").format(mod_id=mod_id, jars=", ".join(jars))
+            for mod_id, jars in scan_result['duplicates'].items()))
+
+    def _scan_mods_folder(self):
         """
-        Attempts to find the mod version locally in the 'mods' folder.
-        This is a simplified implementation that assumes a file name prefix.
-        A better approach would be to read a version file if the mod contains one.
+        Returns the ModsIndex.scan result of the mods folder, or None if it is not configured.
+        The folder is only listed again when its mtime changed (a jar was added, removed or renamed).
         """
-        # Ensure minecraft_paths is not None and mods folder is configured
-        if not self.minecraft_paths or not self.minecraft_paths.get('mods') or \
-           not os.path.isdir(self.minecraft_paths['mods']):
-            # Provide a default version if the path is invalid or not configured
-            return "0.0.0" 
-
-        mod_dir = self.minecraft_paths['mods']
-        for filename in os.listdir(mod_dir):
-            if filename.startswith(MOD_FILE_PREFIX) and filename.endswith(".jar"):
-                # Tries to extract the version from the file name, e.g., "ZombieRool-1.3.0.jar" -> "1.3.0"
-                try:
-                    version_part = filename[len(MOD_FILE_PREFIX):-len(".jar")]
-                    # Remove anything that is not a digit or a dot
-                    clean_version = "".join(c for c in version_part if c.isdigit() or c == '.')
-                    return clean_version
-                except:
-                    continue # Ignore if version extraction fails
-        return "0.0.0" # Mod not found or version not extractable
-
-    def update_mod(self):
+        if not self.minecraft_paths or not self.minecraft_paths.get('mods'):
+            return None
+        mods_dir = self.minecraft_paths['mods']
+        try:
+            mtime = os.stat(mods_dir).st_mtime_ns
+        except OSError:
+            return None
+        if self.mods_scan and self.mods_scan[0] == mods_dir and self.mods_scan[1] == mtime:
+            return self.mods_scan[2]
+        scan_result = self.mods_index.scan(mods_dir)
+        self.mods_index.save()
+        self.mods_scan = (mods_dir, mtime, scan_result)
+        return scan_result
+
+    def _handle_instance_folders_changed(self, kinds):
+        """Updates what depends on the instance folders after they changed, inside or outside the launcher."""
+        if "mods" in kinds:
+            self.mods_scan = None # Only the added or changed jars are read again
+            if self.remote_updates_data:
+                self._check_mod_update_logic()
+        if "saves" in kinds:
+            self._refresh_installed_map_states() # A world deleted outside the launcher is no longer installed
+            if self.tabs.currentWidget() is self.library_tab:
+                self.refresh_world_library()
+
+    def _get_local_mod_version(self, mods_dir=None):
+        """
+        Finds the version of the installed mod from the metadata of its jar (mods.toml,
+        fabric.mod.json or MANIFEST.MF), so a renamed jar is still recognized.
+        mods_dir is the mods folder of another instance, the active one by default.
+        Returns "0.0.0" if the mod is not installed or the mods folder is not configured.
+        """
+        scan_result = self._scan_mods_folder() if mods_dir is None else self.mods_index.scan(mods_dir)
+        return get_launcher_mod_version(scan_result) if scan_result else "0.0.0"
+
+    def update_mod(self, repair=False):
         """
         Function called when the "Update Mod" button is clicked.
-        Downloads and installs the mod.
+        Downloads and installs the mod. A version already installed is skipped, unless the jar
+        needs a repair or several versions of the mod were found (reinstalling removes the others).
         """
         # Check for valid mods path before proceeding
         if not self.minecraft_paths or not self.minecraft_paths.get('mods'):
@@ -1848,13 +2707,19 @@ exit
             QMessageBox.warning(self, self._("Mod Update"), self._("Mod download URL not found in update data."))
             return
 
+        scan_result = self._scan_mods_folder()
+        if not repair and len(find_launcher_mod_jars(scan_result) if scan_result else []) <= 1 and \
+                self.installed_registry.is_installed(self.minecraft_paths, KIND_MOD, "mod", mod_info.get('latest_version'), mod_info.get('sha256')):
+            self.notifier.notify(self._("Mod Update"), self._("Mod v{version} is already installed.").format(version=mod_info.get('latest_version')))
+            return
+
         # Path where the temporary file will be downloaded
         temp_download_dir = os.path.join(os.getcwd(), "temp_downloads")
         os.makedirs(temp_download_dir, exist_ok=True)
         mod_filename = os.path.basename(QUrl(download_url).path())
         temp_mod_path = os.path.join(temp_download_dir, mod_filename)
 
-        QMessageBox.information(self, self._("Mod Update"), self._("Downloading mod ({latest_version})...").format(latest_version=mod_info['latest_version']))
+        self.notifier.notify(self._("Mod Update"), self._("Downloading mod ({latest_version})...").format(latest_version=mod_info['latest_version']))
         self.mod_progress_bar.setValue(0)
         self.mod_progress_bar.show()
         self.update_mod_button.setEnabled(False)
@@ -1875,16 +2740,13 @@ exit
         self.mod_status_label.setText(self._("Installing mod..."))
         
         try:
-            mods_dir = self.minecraft_paths['mods']
-            # Delete old mod versions
-            for filename in os.listdir(mod_dir):
-                if filename.startswith(MOD_FILE_PREFIX) and filename.endswith(".jar"):
-                    os.remove(os.path.join(mod_dir, filename))
-                    print(f"Old mod version deleted: {filename}")
-
-            # Move the new downloaded mod
-            shutil.move(temp_mod_path, os.path.join(mods_dir, os.path.basename(temp_mod_path)))
-            QMessageBox.information(self, self._("Mod Update"), self._("Mod updated and installed successfully!"))
+            # Delete old mod versions and move the new downloaded mod
+            with mods_folder_lock: # A map job may be installing requirements into the same folder
+                installed_jar = install_mod_jar(temp_mod_path, self.minecraft_paths['mods'])
+            mod_info = self.remote_updates_data["mod"]
+            self.installed_registry.record(self.minecraft_paths, KIND_MOD, "mod", mod_info.get('latest_version'), mod_info.get('sha256'), [installed_jar])
+            self.installed_registry.save()
+            self.notifier.notify(self._("Mod Update"), self._("Mod updated and installed successfully!"), ToastNotifier.LEVEL_SUCCESS)
             # Ensure local_version_str is defined for the status message
             local_version_after_update = self._get_local_mod_version() 
             self.mod_status_label.setText(f"✔️ {self._('Mod Status: Up to date (v{local_version_str})').format(local_version_str=local_version_after_update)}")
@@ -1907,231 +2769,322 @@ exit
         self.update_mod_button.setEnabled(True)
 
     # --- Map Loading Logic for Download (implementation) ---
+    def verify_installed_content(self):
+        """Verifies the installed content in a worker thread (hashes are cached between runs)."""
+        if not self.minecraft_paths:
+            QMessageBox.warning(self, self._("Installation Error"), self._("Minecraft 'saves' or 'resourcepacks' folders are not configured. Please define them in 'Settings'."))
+            return
+        self.verify_button.setEnabled(False)
+        self.verify_progress_bar.setValue(0)
+        self.verify_progress_bar.show()
+        self.verify_thread = VerifyThread(self.remote_updates_data, self.minecraft_paths, self._get_local_mod_version())
+        self.verify_thread.verify_progress.connect(self.verify_progress_bar.setValue)
+        self.verify_thread.verify_finished.connect(self._handle_verify_finished)
+        self.verify_thread.verify_error.connect(self._handle_verify_error)
+        self.verify_thread.start()
+
+    def _handle_verify_finished(self, issues):
+        self.verify_button.setEnabled(True)
+        self.verify_progress_bar.hide()
+        if not issues:
+            self.notifier.notify(self._("Verify and Repair"), self._("All installed content is intact."), ToastNotifier.LEVEL_SUCCESS)
+            return
+
+        kind_names = {KIND_MOD: "Mod", KIND_CONTENT_PACK: self._("Content Pack"), KIND_MAP: self._("Map"), KIND_RESOURCEPACK: self._("Resource Pack")}
+        problems = []
+        for issue in issues:
+            missing = sum(1 for status in issue['files'].values() if status == STATUS_MISSING)
+            problems.append("- " + self._("{name} ({kind}): {missing} missing, {corrupted} modified or corrupted").format(
+                name=issue['name'], kind=kind_names[issue['kind']], missing=missing, corrupted=len(issue['files']) - missing))
+        reply = QMessageBox.question(self, self._("Verify and Repair"),
+                                     self._("Problems were found:\n{problems}\n\nRepair them? Only the broken pieces will be downloaded again.").format(problems="\n".join(problems)),
+                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.Yes)
+        if reply == QMessageBox.StandardButton.Yes:
+            self._repair_content(issues)
+
+    def _handle_verify_error(self, message):
+        self.verify_button.setEnabled(True)
+        self.verify_progress_bar.hide()
+        QMessageBox.critical(self, self._("Verification Error"), message)
+
+    def _repair_content(self, issues):
+        """Re-fetches only the pieces a verification found broken."""
+        map_components = {} # {map id: (map_info, set of components)}
+        for issue in issues:
+            if issue['kind'] == KIND_MOD:
+                self.update_mod(repair=True)
+            elif issue['kind'] == KIND_CONTENT_PACK:
+                if not issue['info'] or not issue['info'].get('download_url'):
+                    QMessageBox.warning(self, self._("Verify and Repair"), self._("'{name}' is no longer in the catalog and cannot be repaired.").format(name=issue['name']))
+                    continue
+                self.content_repair_queue.append((issue['info'], tuple(issue['files'])))
+            else:
+                _, components = map_components.setdefault(issue['id'], (issue['info'], set()))
+                components.add('map' if issue['kind'] == KIND_MAP else 'resourcepack')
+
+        for map_info, components in map_components.values():
+            self.install_map(map_info, components=components)
+        self._start_next_content_repair()
+
+    def _start_next_content_repair(self):
+        """Content packs share one downloader: repairs are downloaded one after the other."""
+        if self.content_repair_queue and self.download_content_button.isEnabled():
+            pack_info, repair_paths = self.content_repair_queue.pop(0)
+            self._start_content_pack_download(pack_info, repair_paths=repair_paths)
+
     def _load_maps_for_download_logic(self):
         """
-        Loads and displays maps available for download
-        from remote_updates_data, applying search filter if any.
+        Shows the maps of remote_updates_data in the catalog list. A new catalog is applied as a
+        diff with the displayed one (added, removed and changed maps), so a refresh keeps the
+        scroll position and the progress of running installs; a language, theme or instance
+        change just repaints the rows.
         """
-        # Clear existing map container before reloading
-        while self.maps_container_layout.count():
-            child = self.maps_container_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-
-        if not self.remote_updates_data or "maps" not in self.remote_updates_data:
-            map_status = QLabel(self._("No map information available."))
-            map_status.setStyleSheet(self.themes.get(self.current_theme, self.themes["Default"])["label_text_color"])
-            self.maps_container_layout.addWidget(map_status)
-            print(f"DEBUG: _load_maps_for_download_logic: No maps array or remote data.")
-            return
-
-        search_query = self.map_search_input.text().lower()
-        print(f"DEBUG: _load_maps_for_download_logic called. Remote maps available: {len(self.remote_updates_data.get('maps', []))}")
-        if search_query:
-            print(f"DEBUG: Current search query: '{search_query}'")
-        
-        filtered_maps = []
-        for map_info in self.remote_updates_data["maps"]:
-            map_name = map_info.get('name', '').lower()
-            map_description = map_info.get('description', '').lower()
-            map_id = map_info.get('id', '').lower()
-
-            if (not search_query or 
-                search_query in map_name or 
-                search_query in map_description or
-                search_query in map_id):
-                filtered_maps.append(map_info)
-
-        print(f"DEBUG: Maps after filtering: {len(filtered_maps)}")
-        if not filtered_maps:
-            no_results_label = QLabel(self._("No maps found matching your search criteria."))
-            no_results_label.setStyleSheet(self.themes.get(self.current_theme, self.themes["Default"])["label_text_color"])
-            self.maps_container_layout.addWidget(no_results_label)
-        else:
-            for map_info in filtered_maps:
-                self.add_map_to_download_list(map_info)
+        theme_styles = self.themes.get(self.current_theme, self.themes["Default"])
+        self.map_item_delegate.set_colors(theme_styles.get("map_row"))
+        self.map_item_delegate.show_install_all = len(self.minecraft_instances) > 1
+        self.maps_status_label.setStyleSheet(theme_styles["label_text_color"])
+
+        maps = self.remote_updates_data.get("maps", []) if self.remote_updates_data else []
+        if self.map_catalog_model.maps is not maps:
+            had_catalog = bool(self.map_catalog_model.maps)
+            diff = self.map_catalog_model.update_maps(maps)
+            print(f"DEBUG: _load_maps_for_download_logic: {len(maps)} maps in the catalog.")
+            if had_catalog and diff['added']:
+                self.notifier.notify(self._("Map Catalog"), self._("{count} new map(s) in the catalog.").format(count=len(diff['added'])))
+            # Library worlds are linked to catalog maps by name
+            if any(diff.values()) and self.tabs.currentWidget() is self.library_tab:
+                self.refresh_world_library()
+        self._refresh_installed_map_states()
+        self.maps_list_view.viewport().update()
+        self._update_maps_status_label()
+
+    def _refresh_installed_map_states(self):
+        """Marks the catalog rows of the maps installed into the active instance (installed / update available)."""
+        installed_versions = {}
+        if self.minecraft_paths and self.minecraft_paths.get('saves'):
+            installed_versions = self.installed_registry.get_installed_versions(self.minecraft_paths, KIND_MAP)
+        self.map_catalog_model.set_installed_versions(installed_versions)
 
     def _filter_maps_display(self):
         """
-        Triggered by search bar input. Reloads maps based on the current filter.
+        Triggered by search bar input (debounced). Filters and ranks the catalog rows through the
+        search index: words, prefixes and typos in the id, name, author, tags and description,
+        with "author:" and "tag:" filters.
         """
-        self._load_maps_for_download_logic()
+        self.map_filter_model.set_query(self.map_search_input.text())
+        self._update_maps_status_label()
 
-
-    def add_map_to_download_list(self, map_info):
+    def _update_maps_status_label(self):
+        """Replaces the list with a message when there is no map to show."""
+        if not self.remote_updates_data or "maps" not in self.remote_updates_data:
+            message = self._("No map information available.")
+        elif self.map_filter_model.rowCount() == 0:
+            message = self._("No maps found matching your search criteria.")
+        else:
+            message = ""
+        self.maps_status_label.setText(message)
+        self.maps_status_label.setVisible(bool(message))
+        self.maps_list_view.setVisible(not message)
+
+    def _attach_job_to_row(self, job):
+        """Shows the state of a running install job on its map row."""
+        if job.state != "installing" and job.map_id not in self.map_catalog_model.install_states:
+            job.progress_changed.connect(lambda progress, map_id=job.map_id: self.map_catalog_model.set_install_progress(map_id, progress))
+        self.map_catalog_model.set_install_state(job.map_id, job.state, job.progress)
+
+    def _detach_job_from_row(self, job):
+        """Resets the map row of a job that is finished or failed."""
+        self.map_catalog_model.set_install_state(job.map_id, None)
+
+    def _load_map_details(self, summary, on_ready):
         """
-        Adds a visual element for each map in the download tab.
+        Fetches the detail document of a catalog map in the background, shows it in the catalog,
+        then calls on_ready with the full entry.
         """
-        theme_styles = self.themes.get(self.current_theme, self.themes["Default"])
+        if summary['id'] in self.map_detail_threads:
+            return # Already being fetched
+        thread = MapDetailThread([summary])
+        self.map_detail_threads[summary['id']] = thread
+        thread.details_ready.connect(lambda details: (self._apply_map_details(details), on_ready(details[0])))
+        thread.detail_error.connect(lambda message: QMessageBox.warning(self, self._("Map Installation"),
+                                                                        f"{self._('Could not load the map details:')} {message}"))
+        thread.finished.connect(lambda map_id=summary['id']: self.map_detail_threads.pop(map_id, None))
+        thread.start()
+
+    def _apply_map_details(self, details):
+        """Replaces map summaries of the catalog with their full entries (the catalog diff only touches their rows)."""
+        if not self.remote_updates_data:
+            return
+        details_by_id = {map_info['id']: map_info for map_info in details}
+        maps = [details_by_id.get(map_info.get('id'), map_info) for map_info in self.remote_updates_data.get('maps', [])]
+        self.remote_updates_data = dict(self.remote_updates_data, maps=maps)
+        self._load_maps_for_download_logic()
 
-        map_widget = QWidget()
-        map_widget.setStyleSheet(theme_styles["map_widget"])
-        map_layout = QHBoxLayout(map_widget)
-        
-        map_details = QVBoxLayout()
-        map_details.addWidget(QLabel(f"<b>{map_info['name']}</b> <span style='color:#555;'> (v{map_info['latest_version']})</span>"))
-        map_details.addWidget(QLabel(map_info.get('description', self._('No description available.'))))
-        map_layout.addLayout(map_details)
-
-        # Progress bar specific to each map
-        map_progress_bar = QProgressBar(self)
-        map_progress_bar.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        map_progress_bar.setFixedSize(QSize(100, 20)) # Fixed size for progress bar
-        map_progress_bar.hide()
-        map_details.addWidget(map_progress_bar) # Add progress bar below details
-
-        download_button = QPushButton(self._("Install Map"))
-        download_button.setFixedSize(120, 30)
-        download_button.setStyleSheet(theme_styles["download_button"])
-        # Pass the progress bar in addition to map information
-        download_button.clicked.connect(lambda checked, info=map_info, pb=map_progress_bar: self.install_map(info, pb)) 
-        map_layout.addWidget(download_button)
-
-        self.maps_container_layout.addWidget(map_widget)
-
-    def install_map(self, map_info, progress_bar):
+    def install_map(self, map_info, all_instances=False, components=None):
         """
         Function called when the "Install Map" button is clicked.
-        Downloads and installs the map and its associated resource pack concurrently.
+        Creates an install job that downloads and installs the map and its associated
+        resource pack concurrently. Each job keeps its own state, so several maps can be
+        installed at the same time.
+        With all_instances ("Install to All"), the map is downloaded once and installed into
+        every registered instance. components limits the job to 'map' and/or 'resourcepack' (repairs).
+        A version already installed into the target instances is only installed again on confirmation.
         """
         if not self.minecraft_paths or not self.minecraft_paths.get('saves') or not self.minecraft_paths.get('resourcepacks'):
             QMessageBox.warning(self, self._("Installation Error"), self._("Minecraft 'saves' or 'resourcepacks' folders are not configured. Please define them in 'Settings'."))
             return
-            
-        map_download_url = map_info.get("download_url")
-        rp_download_url = map_info.get("resourcepack_url")
 
-        if not map_download_url:
-            QMessageBox.warning(self, self._("Map Installation"), self._("Map download URL not found."))
+        if is_map_summary(map_info):
+            # Only the catalog index entry is known: fetch the details of the map, then install it
+            self._load_map_details(map_info, lambda full_map_info: self.install_map(full_map_info, all_instances, components))
             return
 
-        temp_download_dir = os.path.join(os.getcwd(), "temp_downloads")
-        os.makedirs(temp_download_dir, exist_ok=True)
-        
-        map_filename = os.path.basename(QUrl(map_download_url).path())
-        temp_map_path = os.path.join(temp_download_dir, map_filename)
-
-        rp_filename = os.path.basename(QUrl(rp_download_url).path()) if rp_download_url else None
-        temp_rp_path = os.path.join(temp_download_dir, rp_filename) if rp_filename else None
+        if not map_info.get("download_url"):
+            QMessageBox.warning(self, self._("Map Installation"), self._("Map download URL not found."))
+            return
 
-        QMessageBox.information(self, self._("Map Installation"), # Changed key for consistency
-                                self._("Downloading map '{map_name}'...").format(map_name=map_info['name']))
-        
-        progress_bar.setValue(0)
-        progress_bar.show()
-
-        # Counter to track completed downloads
-        self.downloads_completed = 0
-        self.expected_downloads = 1 # At least the map
-        if rp_download_url:
-            self.expected_downloads += 1
-
-        self.map_download_finished_path = None
-        self.rp_download_finished_path = None
-        self.install_map_info = map_info # Store for later use in _process_downloads_complete
-        self.install_map_progress_bar = progress_bar
-
-        # Start map download
-        self.map_downloader = FileDownloaderThread(map_download_url, temp_map_path)
-        self.map_downloader.download_progress.connect(progress_bar.setValue) # Map download uses the main progress bar
-        self.map_downloader.download_finished.connect(self._on_map_download_finished)
-        self.map_downloader.download_error.connect(lambda msg: self._handle_map_download_error(msg, progress_bar, is_rp=False))
-        self.map_downloader.start()
-
-        # Start resource pack download if applicable
-        if rp_download_url:
-            # Create a separate progress bar for RP or share logic
-            # For simplicity, we'll keep using the same progress bar, but for real async feedback, 
-            # you'd need two or more separate progress bars.
-            # Here, we will just make the progress bar continue for RP after map is done.
-            self.rp_downloader = FileDownloaderThread(rp_download_url, temp_rp_path)
-            self.rp_downloader.download_finished.connect(self._on_rp_download_finished)
-            self.rp_downloader.download_error.connect(lambda msg: self._handle_map_download_error(msg, progress_bar, is_rp=True))
-            self.rp_downloader.start()
-
-    def _on_map_download_finished(self, path):
-        self.map_download_finished_path = path
-        self.downloads_completed += 1
-        self._process_downloads_complete()
-
-    def _on_rp_download_finished(self, path):
-        self.rp_download_finished_path = path
-        self.downloads_completed += 1
-        self._process_downloads_complete()
-
-    def _process_downloads_complete(self):
-        """Checks if all necessary downloads are complete and triggers installation."""
-        if self.downloads_completed == self.expected_downloads:
-            map_info = self.install_map_info
-            progress_bar = self.install_map_progress_bar
-
-            progress_bar.hide()
-            QMessageBox.information(self, self._("Map Installation"), self._("Map '{map_name}' downloaded. Installing...").format(map_name=map_info['name']))
+        # Checked on the full entry (its resource pack and hashes are not in the catalog index)
+        if components is None and self._is_map_installed(map_info, all_instances):
+            reply = QMessageBox.question(self, self._("Map Installation"),
+                                         self._("Map '{map_name}' v{version} is already installed. Install it again?").format(
+                                             map_name=map_info['name'], version=map_info.get('latest_version', '?')),
+                                         QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
+            if reply == QMessageBox.StandardButton.No:
+                return
+
+        map_id = map_info.get('id', map_info.get('name'))
+        existing_job = self.install_jobs.get(map_id)
+        if existing_job and existing_job.is_active():
+            return # This map is already being installed
+
+        # Worlds saved by a newer game version do not load in older ones
+        map_data_version = (map_info.get('world') or {}).get('data_version')
+        if map_data_version and (components is None or 'map' in components):
+            instance_data_version, instance_version_name = get_instance_game_version(self.minecraft_paths['saves'])
+            if instance_data_version and map_data_version > instance_data_version:
+                reply = QMessageBox.question(self, self._("Map Installation"),
+                                             self._("Map '{map_name}' was saved with Minecraft {map_version}, which is newer than the worlds of your instance (Minecraft {instance_version}). It may not load. Install it anyway?").format(
+                                                 map_name=map_info['name'], map_version=map_info['world'].get('version_name') or map_data_version,
+                                                 instance_version=instance_version_name or instance_data_version),
+                                             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
+                if reply == QMessageBox.StandardButton.No:
+                    return
+
+        # The mod and content packs the map requires but are missing from a target instance are installed by the same job
+        install_targets = [dict(paths) for paths in self._get_install_targets(all_instances)]
+        try:
+            requirements = plan_map_install(map_info, self.remote_updates_data,
+                                            [(paths, self._get_local_mod_version(None if index == 0 else paths['mods']))
+                                             for index, paths in enumerate(install_targets)])
+        except UnresolvedRequirementError as e:
+            QMessageBox.warning(self, self._("Missing Requirements"), str(e))
+            return
 
-            try:
-                # 1. Decompress the map
-                saves_dir = self.minecraft_paths['saves']
-                os.makedirs(saves_dir, exist_ok=True)
-
-                if self.map_download_finished_path and os.path.exists(self.map_download_finished_path):
-                    with zipfile.ZipFile(self.map_download_finished_path, 'r') as zip_ref:
-                        map_folder_name = os.path.commonprefix(zip_ref.namelist())
-                        zip_ref.extractall(saves_dir)
-                        extracted_path = os.path.join(saves_dir, map_folder_name.split('/')[0])
-                        if os.path.exists(extracted_path) and os.path.basename(extracted_path) != map_info['name']:
-                            if not os.path.exists(os.path.join(saves_dir, map_info['name'])):
-                                os.rename(extracted_path, os.path.join(saves_dir, map_info['name']))
-                                print(f"Map folder renamed from {extracted_path} to {os.path.join(saves_dir, map_info['name'])}")
-                            else:
-                                print(f"The folder {map_info['name']} already exists, not renaming {extracted_path}")
-                else:
-                    raise Exception("Map ZIP file was not downloaded successfully or path is invalid.")
-
-                # 2. Install the resource pack if necessary
-                if self.rp_download_finished_path and os.path.exists(self.rp_download_finished_path):
-                    rp_dir = self.minecraft_paths['resourcepacks']
-                    os.makedirs(rp_dir, exist_ok=True)
-                    rp_name = os.path.basename(self.rp_download_finished_path)
-                    destination_rp_path = os.path.join(rp_dir, rp_name)
-                    
-                    if os.path.exists(destination_rp_path):
-                        os.remove(destination_rp_path)
-
-                    shutil.move(self.rp_download_finished_path, destination_rp_path)
-                    QMessageBox.information(self, self._("Installation Complete"), self._("Resource Pack installed successfully! Map and Resource Pack are ready."))
+        if requirements:
+            self.notifier.notify(self._("Map Installation"),
+                                 self._("Downloading map '{map_name}' with: {requirements}...").format(
+                                     map_name=map_info['name'],
+                                     requirements=", ".join(f"{step['info'].get('name', step['component'])} v{step['info'].get('latest_version', step['info'].get('version', '?'))}"
+                                                            for step in requirements)))
+        else:
+            self.notifier.notify(self._("Map Installation"), # Changed key for consistency
+                                 self._("Downloading map '{map_name}'...").format(map_name=map_info['name']))
+
+        job = MapInstallJob(map_info, os.path.join(os.getcwd(), "temp_downloads"), self, requirements=requirements,
+                            components=components)
+        job.install_targets = install_targets
+        job.downloads_complete.connect(self._process_downloads_complete)
+        job.installing.connect(self._attach_job_to_row)
+        job.install_finished.connect(self._on_map_install_finished)
+        job.failed.connect(self._handle_map_install_job_failed)
+        self.install_jobs[map_id] = job
+        self._attach_job_to_row(job)
+        job.start()
+
+    def _is_map_installed(self, map_info, all_instances=False):
+        """True if this version of the map, and of its resource pack, is installed into every target instance."""
+        map_id = map_info.get('id', map_info.get('name'))
+        version = map_info.get('latest_version')
+        for paths in self._get_install_targets(all_instances):
+            if not self.installed_registry.is_installed(paths, KIND_MAP, map_id, version, map_info.get('sha256')):
+                return False
+            if map_info.get('resourcepack_url') and not self.installed_registry.is_installed(paths, KIND_RESOURCEPACK, map_id, version,
+                                                                                             map_info.get('resourcepack_sha256')):
+                return False
+        return True
+
+    def _record_map_job(self, job):
+        """Records what an install job installed into each of its instances: the map, its resource pack and the requirements it lacked."""
+        map_info = job.map_info
+        version = map_info.get('latest_version')
+        for paths in job.install_targets:
+            for step in job.requirements:
+                if paths not in step['targets']:
+                    continue # This instance already had it
+                if step['component'] == COMPONENT_MOD:
+                    jar_path = os.path.join(paths['mods'], os.path.basename(job.downloaded_paths[COMPONENT_MOD]))
+                    self.installed_registry.record(paths, KIND_MOD, "mod", step['info'].get('latest_version'), step['info'].get('sha256'), [jar_path])
                 else:
-                    QMessageBox.information(self, self._("Installation Complete"), self._("Map '{map_name}' installed successfully! (No associated Resource Pack)").format(map_name=map_info['name']))
-            except zipfile.BadZipFile:
-                QMessageBox.critical(self, self._("Decompression Error"), self._("The map ZIP file is corrupted or invalid. The 'zipfile' module only supports ZIP format (not RAR)."))
-            except Exception as e:
-                QMessageBox.critical(self, self._("Map Installation Error"), self._("An error occurred during map installation: {e}").format(e=e))
-            finally:
-                if self.map_download_finished_path and os.path.exists(self.map_download_finished_path):
-                    os.remove(self.map_download_finished_path)
-                if self.rp_download_finished_path and os.path.exists(self.rp_download_finished_path):
-                    os.remove(self.rp_download_finished_path)
-                
-                # Clean up the temp_downloads directory if empty
-                temp_download_dir = os.path.join(os.getcwd(), "temp_downloads")
-                clean_temp_dir(temp_download_dir)
-                
-                self.mod_status_label.setText(self._("Mod Status: Checking...")) # Update after installation
-                self._check_mod_update_logic() # To force update check after install
-
-
-    def _handle_map_download_error(self, message, progress_bar, is_rp=False):
-        """Handles map or resource pack download errors."""
-        progress_bar.hide()
-        component_name = self._("Resource Pack") if is_rp else self._("Map")
-        QMessageBox.critical(self, f"{component_name} {self._('Download Error')}", message)
-        # Ensure that if one download fails, the other is stopped to prevent hanging
-        if hasattr(self, 'map_downloader') and self.map_downloader.isRunning():
-            self.map_downloader.stop()
-        if hasattr(self, 'rp_downloader') and self.rp_downloader.isRunning():
-            self.rp_downloader.stop()
-        
-        # Reset counters/paths for a clean retry
-        self.downloads_completed = 0
-        self.map_download_finished_path = None
-        self.rp_download_finished_path = None
-
+                    self._record_content_pack(step['info'], [paths])
+            if 'map' in job.components:
+                self.installed_registry.record(paths, KIND_MAP, job.map_id, version, map_info.get('sha256'),
+                                               [os.path.join(paths['saves'], map_info['name'])])
+            if 'resourcepack' in job.components and map_info.get('resourcepack_url'):
+                rp_path = os.path.join(paths['resourcepacks'], os.path.basename(QUrl(map_info['resourcepack_url']).path()))
+                self.installed_registry.record(paths, KIND_RESOURCEPACK, job.map_id, version, map_info.get('resourcepack_sha256'), [rp_path])
+        self.installed_registry.save()
+
+    def _process_downloads_complete(self, job):
+        """Called once all downloads of an install job are complete: starts its installation."""
+        self.notifier.notify(self._("Map Installation"), self._("Map '{map_name}' downloaded. Installing...").format(map_name=job.map_info['name']))
+        if not self.minecraft_paths:
+            self._handle_map_install_job_failed(job, 'install', self._("Minecraft 'saves' or 'resourcepacks' folders are not configured. Please define them in 'Settings'."))
+            job.cancel()
+            return
+        # The instances the requirements were planned for, recorded in the registry once installed
+        minecraft_paths, *extra_targets = job.install_targets
+        snapshot_retention = self.snapshot_retention_spinbox.value() if self.snapshot_checkbox.isChecked() else None
+        job.install(minecraft_paths, incremental=self.incremental_install_checkbox.isChecked(),
+                    extra_targets=extra_targets, snapshot_retention=snapshot_retention)
+
+    def _on_map_install_finished(self, job, rp_installed):
+        """Handles the successful installation of a map job."""
+        self._detach_job_from_row(job)
+        self.install_jobs.pop(job.map_id, None)
+        job.dispose()
+        self._record_map_job(job)
+        self._refresh_installed_map_states()
+        if rp_installed:
+            self.notifier.notify(self._("Installation Complete"), self._("Resource Pack installed successfully! Map and Resource Pack are ready."),
+                                 ToastNotifier.LEVEL_SUCCESS)
+        else:
+            self.notifier.notify(self._("Installation Complete"), self._("Map '{map_name}' installed successfully! (No associated Resource Pack)").format(map_name=job.map_info['name']),
+                                 ToastNotifier.LEVEL_SUCCESS)
+
+        if job.requirements:
+            self._refresh_installed_content_packs()
+        self._refresh_world_snapshots()
+        self.mod_status_label.setText(self._("Mod Status: Checking...")) # Update after installation
+        self._check_mod_update_logic() # To force update check after install
+
+    def _handle_map_install_job_failed(self, job, component, message):
+        """Handles map or resource pack download errors and installation errors of a job."""
+        self._detach_job_from_row(job)
+        if self.install_jobs.get(job.map_id) is job:
+            del self.install_jobs[job.map_id]
+        job.dispose()
+
+        if component == 'archive':
+            QMessageBox.critical(self, self._("Decompression Error"), self._("The map ZIP file is corrupted or invalid. The 'zipfile' module only supports ZIP format (not RAR)."))
+        elif component == 'install':
+            QMessageBox.critical(self, self._("Map Installation Error"), self._("An error occurred during map installation: {e}").format(e=message))
+        else:
+            if component == 'resourcepack':
+                component_name = self._("Resource Pack")
+            elif component == COMPONENT_MOD:
+                component_name = "Mod"
+            elif component.startswith(CONTENT_COMPONENT_PREFIX):
+                component_name = self._("Content Pack")
+            else:
+                component_name = self._("Map")
+            QMessageBox.critical(self, f"{component_name} {self._('Download Error')}", message)
@@ -0,0 +1,366 @@
+# ZombieRoolLauncher/main/map_catalog.py
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QSortFilterProxyModel, QPoint, QRect, QSize, QEvent, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QPainter, QPen
+from PyQt6.QtWidgets import QStyledItemDelegate, QStyleOptionProgressBar, QStyle, QApplication
+
+from main.map_search import MapSearchIndex
+
+# Data roles of MapCatalogModel
+MapInfoRole = Qt.ItemDataRole.UserRole + 1 # Catalog entry (dict)
+MapIdRole = Qt.ItemDataRole.UserRole + 2
+InstallStateRole = Qt.ItemDataRole.UserRole + 3 # None, or the state of its running install job
+InstallProgressRole = Qt.ItemDataRole.UserRole + 4 # 0-100
+InstalledVersionRole = Qt.ItemDataRole.UserRole + 5 # Version installed in the active instance, or None
+
+
+def get_map_id(map_info):
+    return map_info.get('id', map_info.get('name'))
+
+
+def diff_catalogs(old_maps, new_maps):
+    """
+    Compares two catalogs by map id: {"added": [ids], "removed": [ids], "changed": [ids]}.
+    A map is changed when its entry differs (a new version, description, download URL...).
+    """
+    old_by_id = {get_map_id(map_info): map_info for map_info in old_maps}
+    new_by_id = {get_map_id(map_info): map_info for map_info in new_maps}
+    return {
+        "added": [map_id for map_id in new_by_id if map_id not in old_by_id],
+        "removed": [map_id for map_id in old_by_id if map_id not in new_by_id],
+        "changed": [map_id for map_id, map_info in new_by_id.items() if map_id in old_by_id and old_by_id[map_id] != map_info]
+    }
+
+
+def _row_ranges(rows):
+    """Sorted rows grouped into (first, last) ranges of consecutive rows."""
+    ranges = []
+    for row in rows:
+        if ranges and ranges[-1][1] == row - 1:
+            ranges[-1][1] = row
+        else:
+            ranges.append([row, row])
+    return ranges
+
+
+class MapCatalogModel(QAbstractListModel):
+    """
+    Maps of the catalog, one row per map, with their search index. The state of running installs
+    and the installed versions are kept here too, keyed by map id, so they survive filtering and catalog reloads.
+    A new catalog is applied as a diff (update_maps): only the added, removed and changed rows
+    are touched, so the view keeps its scroll position and selection.
+    """
+    catalog_changed = pyqtSignal(dict) # diff_catalogs result
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.maps = []
+        self.search_index = MapSearchIndex()
+        self.rows_by_id = {}
+        self.install_states = {} # {map id: (state, progress)}
+        self.installed_versions = {} # {map id: version installed in the active instance}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.maps)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.maps):
+            return None
+        map_info = self.maps[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return map_info.get('name', "")
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return map_info.get('description')
+        if role == MapInfoRole:
+            return map_info
+        if role == MapIdRole:
+            return get_map_id(map_info)
+        if role == InstallStateRole:
+            return self.install_states.get(get_map_id(map_info), (None, 0))[0]
+        if role == InstallProgressRole:
+            return self.install_states.get(get_map_id(map_info), (None, 0))[1]
+        if role == InstalledVersionRole:
+            return self.installed_versions.get(get_map_id(map_info))
+        return None
+
+    def _reset_maps(self, maps):
+        """Replaces the displayed catalog entries and rebuilds their search index."""
+        self.beginResetModel()
+        self.maps = maps
+        self.search_index = MapSearchIndex((get_map_id(map_info), map_info) for map_info in maps)
+        self.rows_by_id = {get_map_id(map_info): row for row, map_info in enumerate(self.maps)}
+        self.endResetModel()
+
+    def update_maps(self, maps):
+        """
+        Applies a new catalog as row removals, insertions and changes, and emits catalog_changed
+        with the diff. Falls back to a reset when the maps kept were reordered (or ids are not unique).
+        """
+        diff = diff_catalogs(self.maps, maps)
+        removed, added = set(diff['removed']), set(diff['added'])
+        kept_old_ids = [get_map_id(map_info) for map_info in self.maps if get_map_id(map_info) not in removed]
+        kept_new_ids = [get_map_id(map_info) for map_info in maps if get_map_id(map_info) not in added]
+        if not self.maps or kept_old_ids != kept_new_ids or len(self.rows_by_id) != len(self.maps) \
+                or len(kept_new_ids) + len(added) != len(maps):
+            self._reset_maps(maps)
+        else:
+            current_maps = list(self.maps)
+            removed_rows = [row for row, map_info in enumerate(current_maps) if get_map_id(map_info) in removed]
+            for first, last in reversed(_row_ranges(removed_rows)):
+                self.beginRemoveRows(QModelIndex(), first, last)
+                del current_maps[first:last + 1]
+                self.maps = current_maps
+                self.endRemoveRows()
+            # What is left is the new catalog without the added maps: insert them at their new rows
+            added_rows = [row for row, map_info in enumerate(maps) if get_map_id(map_info) in added]
+            for first, last in _row_ranges(added_rows):
+                self.beginInsertRows(QModelIndex(), first, last)
+                current_maps[first:first] = maps[first:last + 1]
+                self.maps = current_maps
+                self.endInsertRows()
+            self.maps = maps
+            self.rows_by_id = {get_map_id(map_info): row for row, map_info in enumerate(self.maps)}
+            for map_id in diff['removed']:
+                self.search_index.remove(map_id)
+            for map_id in diff['added'] + diff['changed']:
+                self.search_index.add(map_id, self.maps[self.rows_by_id[map_id]])
+            for first, last in _row_ranges(sorted(self.rows_by_id[map_id] for map_id in diff['changed'])):
+                self.dataChanged.emit(self.index(first), self.index(last))
+        if any(diff.values()):
+            print(f"DEBUG: Catalog diff: {len(diff['added'])} added, {len(diff['removed'])} removed, {len(diff['changed'])} changed.")
+        self.catalog_changed.emit(diff)
+        return diff
+
+    def set_install_state(self, map_id, state, progress=0):
+        """Shows the state of an install job on its row; state None clears it."""
+        if state is None:
+            self.install_states.pop(map_id, None)
+        else:
+            self.install_states[map_id] = (state, progress)
+        row = self.rows_by_id.get(map_id)
+        if row is not None:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [InstallStateRole, InstallProgressRole])
+
+    def set_install_progress(self, map_id, progress):
+        state = self.install_states.get(map_id, (None, 0))[0]
+        if state is not None:
+            self.set_install_state(map_id, state, progress)
+
+    def set_installed_versions(self, installed_versions):
+        """Shows which maps are installed ({map id: version}); only the rows that changed are repainted."""
+        changed_ids = set(installed_versions) ^ set(self.installed_versions)
+        changed_ids.update(map_id for map_id, version in installed_versions.items()
+                           if self.installed_versions.get(map_id, version) != version)
+        self.installed_versions = dict(installed_versions)
+        rows = sorted(self.rows_by_id[map_id] for map_id in changed_ids if map_id in self.rows_by_id)
+        for first, last in _row_ranges(rows):
+            self.dataChanged.emit(self.index(first), self.index(last), [InstalledVersionRole])
+
+
+class MapFilterProxyModel(QSortFilterProxyModel):
+    """
+    Rows of the catalog matching the search query, best matches first (see MapSearchIndex).
+    Without a query the catalog order is kept.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.query = ""
+        self.scores = None # {map id: score} of the query, None when everything is shown
+        self.setDynamicSortFilter(False) # Progress updates must not re-sort the rows
+
+    def setSourceModel(self, model):
+        super().setSourceModel(model)
+        model.catalog_changed.connect(self._on_catalog_changed)
+
+    def _on_catalog_changed(self, diff):
+        # Without a query the rows inserted and removed are enough; with one, the scores changed too
+        if self.query and any(diff.values()):
+            self._apply_query()
+
+    def set_query(self, query):
+        query = query.strip()
+        if query != self.query:
+            self.query = query
+            self._apply_query()
+
+    def _apply_query(self):
+        self.scores = self.sourceModel().search_index.search(self.query) if self.query else None
+        self.invalidate()
+        self.sort(0 if self.scores is not None else -1)
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        return self.scores is None or get_map_id(self.sourceModel().maps[source_row]) in self.scores
+
+    def lessThan(self, left, right):
+        maps = self.sourceModel().maps
+        left_score = self.scores.get(get_map_id(maps[left.row()]), 0) if self.scores else 0
+        right_score = self.scores.get(get_map_id(maps[right.row()]), 0) if self.scores else 0
+        if left_score != right_score:
+            return left_score > right_score # Best matches first
+        return left.row() < right.row()
+
+
+class MapItemDelegate(QStyledItemDelegate):
+    """
+    Paints the catalog rows (thumbnail, name, description, game version, installed state or
+    install progress, and buttons) on demand: no widget is created per map, whatever the size of the catalog.
+    Thumbnails come from a ThumbnailCache, so only the painted rows load theirs.
+    """
+    install_requested = pyqtSignal(dict, bool) # Map info, all instances
+
+    ROW_HEIGHT = 110
+    ROW_SPACING = 5
+    PADDING = 10
+    LINE_HEIGHT = 20
+    BUTTON_SIZE = QSize(120, 30)
+    PROGRESS_SIZE = QSize(100, 20)
+    THUMBNAIL_SIZE = QSize(90, 90)
+
+    DEFAULT_COLORS = {"background": "#F8F8F8", "border": "#DDD", "text": "#333", "secondary": "#555", "button": "#2ECC71",
+                      "installed": "#27AE60", "update": "#E67E22"}
+
+    def __init__(self, translate, parent=None):
+        super().__init__(parent)
+        self.translate = translate # Launcher's translation function
+        self.show_install_all = False
+        self.colors = dict(self.DEFAULT_COLORS)
+        self.thumbnails = None # ThumbnailCache
+
+    def set_colors(self, colors):
+        self.colors = dict(self.DEFAULT_COLORS, **(colors or {}))
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def _card_rect(self, rect):
+        return rect.adjusted(0, 0, -1, -self.ROW_SPACING)
+
+    def _button_rects(self, rect):
+        """[(button rect, all instances)] of a row, right-aligned and vertically centered."""
+        card = self._card_rect(rect)
+        top = card.top() + (card.height() - self.BUTTON_SIZE.height()) // 2
+        right = card.right() - self.PADDING
+        buttons = [False, True] if self.show_install_all else [False]
+        rects = []
+        for all_instances in reversed(buttons):
+            left = right - self.BUTTON_SIZE.width()
+            rects.insert(0, (QRect(left, top, self.BUTTON_SIZE.width(), self.BUTTON_SIZE.height()), all_instances))
+            right = left - 6
+        return rects
+
+    def paint(self, painter, option, index):
+        map_info = index.data(MapInfoRole)
+        if map_info is None:
+            return
+        state = index.data(InstallStateRole)
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        card = self._card_rect(option.rect)
+        painter.setPen(QPen(QColor(self.colors["border"])))
+        painter.setBrush(QColor(self.colors["background"]))
+        painter.drawRoundedRect(card, 5, 5)
+
+        buttons = self._button_rects(option.rect)
+        text_left = card.left() + self.PADDING
+
+        # Thumbnail, or an empty frame while it is loading
+        if map_info.get('thumbnail_url') and self.thumbnails is not None:
+            thumbnail_rect = QRect(QPoint(text_left, card.top() + (card.height() - self.THUMBNAIL_SIZE.height()) // 2), self.THUMBNAIL_SIZE)
+            pixmap = self.thumbnails.get(map_info['thumbnail_url'])
+            if pixmap is not None:
+                painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+                target = QRect(QPoint(0, 0), pixmap.size().scaled(self.THUMBNAIL_SIZE, Qt.AspectRatioMode.KeepAspectRatio))
+                target.moveCenter(thumbnail_rect.center())
+                painter.drawPixmap(target, pixmap)
+            else:
+                painter.setPen(QPen(QColor(self.colors["border"])))
+                painter.setBrush(Qt.BrushStyle.NoBrush)
+                painter.drawRoundedRect(thumbnail_rect, 3, 3)
+            text_left = thumbnail_rect.right() + 1 + self.PADDING
+        text_width = buttons[0][0].left() - self.PADDING - text_left
+        y = card.top() + self.PADDING
+
+        # Name and version
+        name_font = QFont(option.font)
+        name_font.setBold(True)
+        painter.setFont(name_font)
+        painter.setPen(QColor(self.colors["text"]))
+        name_rect = QRect(text_left, y, text_width, self.LINE_HEIGHT)
+        name = painter.fontMetrics().elidedText(map_info.get('name', ""), Qt.TextElideMode.ElideRight, text_width)
+        painter.drawText(name_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, name)
+        name_width = painter.fontMetrics().horizontalAdvance(name)
+        painter.setFont(option.font)
+        painter.setPen(QColor(self.colors["secondary"]))
+        painter.drawText(name_rect.adjusted(name_width, 0, 0, 0), Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                         f" (v{map_info.get('latest_version', '?')})")
+        y += self.LINE_HEIGHT
+
+        # Description
+        painter.setPen(QColor(self.colors["text"]))
+        description = map_info.get('description') or self.translate('No description available.')
+        description = painter.fontMetrics().elidedText(description.replace("\n", " "), Qt.TextElideMode.ElideRight, text_width)
+        painter.drawText(QRect(text_left, y, text_width, self.LINE_HEIGHT), Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, description)
+        y += self.LINE_HEIGHT
+
+        # Game version the map was saved with
+        world_info = map_info.get('world') or {}
+        if world_info.get('version_name'):
+            world_text = self.translate("Minecraft {version}").format(version=world_info['version_name'])
+            if world_info.get('game_mode'):
+                world_text += f" - {self.translate(world_info['game_mode'].capitalize())}"
+            painter.setPen(QColor(self.colors["secondary"]))
+            painter.drawText(QRect(text_left, y, text_width, self.LINE_HEIGHT), Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, world_text)
+        y += self.LINE_HEIGHT
+
+        # Install progress
+        progress_rect = QRect(text_left, y + 2, self.PROGRESS_SIZE.width(), self.PROGRESS_SIZE.height())
+        if state == "installing":
+            painter.setPen(QColor(self.colors["secondary"]))
+            painter.drawText(QRect(text_left, y, text_width, self.LINE_HEIGHT), Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                             self.translate("Installing..."))
+        elif state is not None:
+            progress_option = QStyleOptionProgressBar()
+            progress_option.rect = progress_rect
+            progress_option.minimum = 0
+            progress_option.maximum = 100
+            progress_option.progress = index.data(InstallProgressRole)
+            progress_option.text = f"{progress_option.progress}%"
+            progress_option.textVisible = True
+            progress_option.textAlignment = Qt.AlignmentFlag.AlignCenter
+            progress_option.state = QStyle.StateFlag.State_Enabled | QStyle.StateFlag.State_Horizontal
+            style = option.widget.style() if option.widget else QApplication.style()
+            style.drawControl(QStyle.ControlElement.CE_ProgressBar, progress_option, painter, option.widget)
+        elif index.data(InstalledVersionRole) is not None:
+            installed_version = index.data(InstalledVersionRole)
+            if installed_version == map_info.get('latest_version'):
+                painter.setPen(QColor(self.colors["installed"]))
+                installed_text = self.translate("Installed (v{version})").format(version=installed_version)
+            else:
+                painter.setPen(QColor(self.colors["update"]))
+                installed_text = self.translate("Update available: v{installed} -> v{latest}").format(
+                    installed=installed_version, latest=map_info.get('latest_version', '?'))
+            painter.drawText(QRect(text_left, y, text_width, self.LINE_HEIGHT), Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, installed_text)
+
+        # Buttons, disabled while the map is being installed
+        button_color = QColor(self.colors["button"])
+        if state is not None:
+            button_color.setAlpha(110)
+        for button_rect, all_instances in buttons:
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(button_color)
+            painter.drawRoundedRect(button_rect, 5, 5)
+            painter.setPen(QColor("white"))
+            painter.drawText(button_rect, Qt.AlignmentFlag.AlignCenter,
+                             self.translate("Install to All") if all_instances else self.translate("Install Map"))
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        """Turns clicks on the painted buttons into install_requested."""
+        if event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            if index.data(InstallStateRole) is None:
+                for button_rect, all_instances in self._button_rects(option.rect):
+                    if button_rect.contains(event.position().toPoint()):
+                        self.install_requested.emit(index.data(MapInfoRole), all_instances)
+                        return True
+        return super().editorEvent(event, model, option, index)
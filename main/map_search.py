@@ -0,0 +1,230 @@
+# ZombieRoolLauncher/main/map_search.py
+import re
+import bisect
+import unicodedata
+
+# Weight of a match in each field of a catalog entry: id and name rank above the description
+FIELD_WEIGHTS = {"id": 3.0, "name": 3.0, "author": 2.0, "tags": 2.0, "description": 1.0}
+
+# Score multipliers by kind of match of a query term
+EXACT_MATCH = 1.0
+PREFIX_MATCH = 0.7
+SUBSTRING_MATCH = 0.5
+FUZZY_MATCH = 0.4
+
+# Query filters: "author:name" and "tag:name"
+FILTER_PATTERN = re.compile(r'(author|tag):("[^"]*"|\S+)', re.IGNORECASE)
+TOKEN_PATTERN = re.compile(r"[^\W_]+") # Words; "zr_asylum" gives "zr" and "asylum"
+
+TERM_CACHE_SIZE = 256 # Results of the last query terms (typing "asy", "asyl", "asylu" reuses them)
+
+
+def normalize_text(text):
+    """Lowercase text without accents, so "Bibliothèque" matches "bibliotheque"."""
+    text = unicodedata.normalize('NFKD', str(text).lower())
+    return "".join(c for c in text if not unicodedata.combining(c))
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(normalize_text(text))
+
+
+def _trigrams(token):
+    padded = f" {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _max_typos(term):
+    if len(term) < 4:
+        return 0
+    return 1 if len(term) < 8 else 2
+
+
+def _edit_distance(a, b, limit):
+    """Levenshtein distance with adjacent transpositions, or limit + 1 once it is known to exceed limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, char_b in enumerate(b, 1):
+            cost = 0 if char_a == char_b else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if previous_previous is not None and i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+class MapSearchIndex:
+    """
+    In-memory search index over the maps of a catalog, keyed by map id. It is built once per
+    catalog load, then kept up to date map by map (add, remove) when the catalog changes.
+    Query terms are looked up as whole tokens, prefixes (sorted token list), substrings and,
+    from four letters on, with typos (trigram candidates checked by edit distance).
+    Results are ranked by FIELD_WEIGHTS; every term has to match. "author:" and "tag:" filter the results.
+    """
+    def __init__(self, entries=()):
+        self.postings = {} # {token: {map id: best field weight}}
+        self.ids_by_author = {} # {normalized author: {map ids}}
+        self.ids_by_tag = {} # {normalized tag: {map ids}}
+        self.indexed = {} # {map id: (author, tags, tokens)}, what remove() has to undo
+        self.tokens_by_trigram = {}
+        self.term_cache = {}
+        for map_id, map_info in entries:
+            self._index_map(map_id, map_info)
+        self.sorted_tokens = sorted(self.postings)
+
+    def _index_map(self, map_id, map_info):
+        """Adds a map to the postings; returns the tokens that were not indexed before."""
+        author = normalize_text(map_info.get('author') or "")
+        tags = [tag for tag in map_info.get('tags') or [] if isinstance(tag, str)]
+        self.ids_by_author.setdefault(author, set()).add(map_id)
+        for tag in tags:
+            self.ids_by_tag.setdefault(normalize_text(tag), set()).add(map_id)
+        fields = {"id": tokenize(map_info.get('id', "")), "name": tokenize(map_info.get('name', "")),
+                  "author": tokenize(map_info.get('author') or ""), "tags": tokenize(" ".join(tags)),
+                  "description": tokenize(map_info.get('description') or "")}
+        new_tokens = []
+        map_tokens = set()
+        for field, tokens in fields.items():
+            weight = FIELD_WEIGHTS[field]
+            for token in tokens:
+                ids = self.postings.get(token)
+                if ids is None:
+                    ids = self.postings[token] = {}
+                    new_tokens.append(token)
+                    for trigram in _trigrams(token):
+                        self.tokens_by_trigram.setdefault(trigram, set()).add(token)
+                if ids.get(map_id, 0) < weight:
+                    ids[map_id] = weight
+                map_tokens.add(token)
+        self.indexed[map_id] = (author, [normalize_text(tag) for tag in tags], map_tokens)
+        return new_tokens
+
+    def add(self, map_id, map_info):
+        """Indexes a map added to the catalog, or indexes a changed map again."""
+        self.remove(map_id)
+        for token in self._index_map(map_id, map_info):
+            bisect.insort(self.sorted_tokens, token)
+        self.term_cache.clear()
+
+    def remove(self, map_id):
+        """Forgets a map removed from the catalog; tokens used by no other map are dropped."""
+        indexed = self.indexed.pop(map_id, None)
+        if indexed is None:
+            return
+        author, tags, tokens = indexed
+        for key, ids_by_key in [(author, self.ids_by_author)] + [(tag, self.ids_by_tag) for tag in tags]:
+            ids = ids_by_key.get(key)
+            if ids is not None:
+                ids.discard(map_id)
+                if not ids:
+                    del ids_by_key[key]
+        for token in tokens:
+            ids = self.postings[token]
+            ids.pop(map_id, None)
+            if ids:
+                continue
+            del self.postings[token]
+            del self.sorted_tokens[bisect.bisect_left(self.sorted_tokens, token)]
+            for trigram in _trigrams(token):
+                trigram_tokens = self.tokens_by_trigram[trigram]
+                trigram_tokens.discard(token)
+                if not trigram_tokens:
+                    del self.tokens_by_trigram[trigram]
+        self.term_cache.clear()
+
+    def _match_term(self, term):
+        """{map id: score} of the maps matching one query term."""
+        cached = self.term_cache.get(term)
+        if cached is not None:
+            return cached
+
+        matched_tokens = {} # {token: multiplier}
+        # Whole tokens and prefixes: a range of the sorted token list
+        start = bisect.bisect_left(self.sorted_tokens, term)
+        for token in self.sorted_tokens[start:]:
+            if not token.startswith(term):
+                break
+            matched_tokens[token] = EXACT_MATCH if token == term else PREFIX_MATCH
+
+        if len(term) >= 3:
+            # Substrings: the tokens holding every trigram of the term (without the padding)
+            inner_trigrams = [term[i:i + 3] for i in range(len(term) - 2)]
+            candidates = None
+            for trigram in inner_trigrams:
+                tokens = self.tokens_by_trigram.get(trigram, set())
+                candidates = tokens if candidates is None else candidates & tokens
+                if not candidates:
+                    break
+            for token in candidates or ():
+                if token not in matched_tokens and term in token:
+                    matched_tokens[token] = SUBSTRING_MATCH
+
+        max_typos = _max_typos(term)
+        if max_typos:
+            # Typos: tokens sharing enough trigrams with the term, confirmed by edit distance
+            term_trigrams = _trigrams(term)
+            shared = {}
+            for trigram in term_trigrams:
+                for token in self.tokens_by_trigram.get(trigram, ()):
+                    shared[token] = shared.get(token, 0) + 1
+            needed = max(1, len(term_trigrams) - 3 * max_typos)
+            for token, count in shared.items():
+                if count >= needed and token not in matched_tokens and _edit_distance(term, token, max_typos) <= max_typos:
+                    matched_tokens[token] = FUZZY_MATCH
+
+        scores = {}
+        for token, multiplier in matched_tokens.items():
+            posting = self.postings[token]
+            if not scores:
+                scores = {map_id: weight * multiplier for map_id, weight in posting.items()}
+                continue
+            for map_id, weight in posting.items():
+                score = weight * multiplier
+                if scores.get(map_id, 0) < score:
+                    scores[map_id] = score
+
+        if len(self.term_cache) >= TERM_CACHE_SIZE:
+            self.term_cache.clear()
+        self.term_cache[term] = scores
+        return scores
+
+    def search(self, query):
+        """
+        Returns {map id: score} of the maps matching the query, or None for an empty query
+        (everything matches). Maps with a higher score rank first. The result must not be modified.
+        """
+        # Filters: the maps of the authors containing the value, or of the tags starting with it
+        allowed_ids = None
+        for key, value in FILTER_PATTERN.findall(query):
+            value = normalize_text(value.strip('"'))
+            ids = set()
+            if key.lower() == "author":
+                for author, author_ids in self.ids_by_author.items():
+                    if value in author:
+                        ids |= author_ids
+            else:
+                for tag, tag_ids in self.ids_by_tag.items():
+                    if tag.startswith(value):
+                        ids |= tag_ids
+            allowed_ids = ids if allowed_ids is None else allowed_ids & ids
+
+        terms = tokenize(FILTER_PATTERN.sub(" ", query))
+        if not terms:
+            return None if allowed_ids is None else dict.fromkeys(allowed_ids, 0.0)
+
+        scores = None
+        for term in terms:
+            term_scores = self._match_term(term)
+            if scores is None:
+                scores = term_scores if allowed_ids is None else {map_id: score for map_id, score in term_scores.items() if map_id in allowed_ids}
+            else:
+                scores = {map_id: score + term_scores[map_id] for map_id, score in scores.items() if map_id in term_scores}
+            if not scores:
+                return {}
+        return scores
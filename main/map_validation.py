@@ -0,0 +1,161 @@
+# ZombieRoolLauncher/main/map_validation.py
+import os
+import re
+import json
+import struct
+import zipfile
+
+from main.archive_formats import FORMAT_TAR_ZSTD, UnsupportedArchiveError, detect_archive_format, list_archive_names, open_zip_entry
+from main.incremental_install import get_archive_root_prefix
+
+GZIP_MAGIC = b'\x1f\x8b'
+REGION_SECTOR_SIZE = 4096
+REGION_HEADER_SIZE = 2 * REGION_SECTOR_SIZE # Chunk location table + timestamp table
+REGION_FILE_PATTERN = re.compile(r'^r\.-?\d+\.-?\d+\.mca$')
+
+
+def _read_entry_head(zip_ref, info, size):
+    """Reads the first bytes of a ZIP entry, decompressing no more than needed."""
+    with open_zip_entry(zip_ref, info) as source:
+        data = b""
+        while len(data) < size:
+            block = source.read(size - len(data))
+            if not block:
+                break
+            data += block
+    return data
+
+
+def check_region_header(header, file_size):
+    """
+    Checks the location table of a region (.mca) file: every chunk must start after the
+    8 KiB header and inside the file (some editors do not pad the last sector, so the end of
+    a chunk is not checked). Returns an error message, or None if it is valid.
+    """
+    if len(header) < REGION_HEADER_SIZE:
+        return "region file header is truncated"
+    for index in range(1024):
+        location = struct.unpack_from('>I', header, index * 4)[0]
+        offset, sector_count = location >> 8, location & 0xFF
+        if location == 0:
+            continue # Chunk not generated
+        if offset < 2 or sector_count == 0 or offset * REGION_SECTOR_SIZE >= file_size:
+            return f"chunk {index} points outside of the file (sector {offset}, {sector_count} sectors)"
+    return None
+
+
+def _validate_zip_map(path):
+    problems = []
+    with zipfile.ZipFile(path, 'r') as zip_ref:
+        infos = {info.filename: info for info in zip_ref.infolist()} # Central directory only
+        root_prefix = get_archive_root_prefix(infos)
+
+        level_dat = infos.get(f"{root_prefix}level.dat")
+        if level_dat is None:
+            problems.append("'level.dat' not found at the root of the world")
+        elif _read_entry_head(zip_ref, level_dat, 2) != GZIP_MAGIC:
+            problems.append("'level.dat' is not a gzip-compressed NBT file")
+
+        region_prefix = f"{root_prefix}region/"
+        region_files = [info for name, info in infos.items()
+                        if name.startswith(region_prefix) and REGION_FILE_PATTERN.match(name[len(region_prefix):])]
+        if not region_files:
+            problems.append("no region file (region/r.X.Z.mca) found")
+        for info in region_files:
+            if info.file_size == 0:
+                continue # The game leaves empty region files behind, they are harmless
+            if info.file_size < REGION_HEADER_SIZE:
+                problems.append(f"'{info.filename}' has an invalid size ({info.file_size} bytes)")
+                continue
+            error = check_region_header(_read_entry_head(zip_ref, info, REGION_HEADER_SIZE), info.file_size)
+            if error:
+                problems.append(f"'{info.filename}': {error}")
+    return problems
+
+
+def _validate_world_folder(path):
+    problems = []
+    level_dat = os.path.join(path, "level.dat")
+    if not os.path.isfile(level_dat):
+        problems.append("'level.dat' not found at the root of the world")
+    else:
+        with open(level_dat, 'rb') as f:
+            if f.read(2) != GZIP_MAGIC:
+                problems.append("'level.dat' is not a gzip-compressed NBT file")
+
+    region_dir = os.path.join(path, "region")
+    region_files = [entry for entry in (os.scandir(region_dir) if os.path.isdir(region_dir) else [])
+                    if entry.is_file() and REGION_FILE_PATTERN.match(entry.name)]
+    if not region_files:
+        problems.append("no region file (region/r.X.Z.mca) found")
+    for entry in region_files:
+        size = entry.stat().st_size
+        if size == 0:
+            continue
+        if size < REGION_HEADER_SIZE:
+            problems.append(f"'region/{entry.name}' has an invalid size ({size} bytes)")
+            continue
+        with open(entry.path, 'rb') as f:
+            error = check_region_header(f.read(REGION_HEADER_SIZE), size)
+        if error:
+            problems.append(f"'region/{entry.name}': {error}")
+    return problems
+
+
+def validate_map_archive(path):
+    """
+    Validates a map archive without extracting it and returns the list of problems found
+    (empty when the map is valid). For ZIPs only the central directory is read, plus the
+    first bytes of level.dat and the 8 KiB header of each region file.
+    .tar.zst archives have no index: their layout is checked from the entry names.
+    A world folder (published without being zipped first) gets the same checks as a ZIP.
+    """
+    try:
+        if os.path.isdir(path):
+            return _validate_world_folder(path)
+        if detect_archive_format(path) == FORMAT_TAR_ZSTD:
+            names = list_archive_names(path, FORMAT_TAR_ZSTD)
+            root_prefix = get_archive_root_prefix(names)
+            problems = []
+            if f"{root_prefix}level.dat" not in names:
+                problems.append("'level.dat' not found at the root of the world")
+            if not any(name.startswith(f"{root_prefix}region/") and name.endswith(".mca") for name in names):
+                problems.append("no region file (region/r.X.Z.mca) found")
+            return problems
+        return _validate_zip_map(path)
+    except zipfile.BadZipFile:
+        return ["not a valid ZIP file"]
+    except UnsupportedArchiveError as e:
+        return [str(e)]
+    except (OSError, EOFError, zipfile.LargeZipFile) as e:
+        return [f"unreadable archive: {e}"]
+
+
+def validate_resourcepack_archive(path):
+    """
+    Validates a resource pack ZIP without extracting it: 'pack.mcmeta' must be at the root
+    of the archive and describe a pack with a numeric pack_format. Returns the list of problems.
+    """
+    try:
+        with zipfile.ZipFile(path, 'r') as zip_ref:
+            try:
+                info = zip_ref.getinfo('pack.mcmeta')
+            except KeyError:
+                return ["'pack.mcmeta' not found at the root of the resource pack"]
+            if info.file_size > 1024 * 1024:
+                return ["'pack.mcmeta' is too large"]
+            try:
+                metadata = json.loads(_read_entry_head(zip_ref, info, info.file_size).decode('utf-8-sig'))
+            except (UnicodeDecodeError, json.JSONDecodeError) as e:
+                return [f"'pack.mcmeta' is not valid JSON: {e}"]
+            pack = metadata.get('pack') if isinstance(metadata, dict) else None
+            pack_format = pack.get('pack_format') if isinstance(pack, dict) else None
+            if not isinstance(pack_format, int):
+                return ["'pack.mcmeta' has no numeric 'pack.pack_format'"]
+            return []
+    except zipfile.BadZipFile:
+        return ["not a valid ZIP file"]
+    except UnsupportedArchiveError as e:
+        return [str(e)]
+    except OSError as e:
+        return [f"unreadable archive: {e}"]
@@ -0,0 +1,197 @@
+# ZombieRoolLauncher/main/mods_index.py
+import os
+import json
+import zipfile
+import tomllib
+import threading
+
+from PyQt6.QtCore import QVersionNumber
+
+from main.constants import CACHE_DIR_PATH, MOD_FILE_PREFIX, MOD_ID
+
+# Persistent index of the mods found in the jars of the mods folders
+MODS_INDEX_PATH = os.path.join(CACHE_DIR_PATH, 'mods_index.json')
+
+# Metadata files read from a jar, in order of preference
+FORGE_METADATA = ("META-INF/neoforge.mods.toml", "META-INF/mods.toml")
+FABRIC_METADATA = "fabric.mod.json"
+MANIFEST = "META-INF/MANIFEST.MF"
+
+MAX_METADATA_SIZE = 1024 * 1024 # Metadata files are tiny: anything bigger is not read
+
+_save_lock = threading.Lock() # The launcher and install threads save their own ModsIndex to the same file
+
+
+def _parse_manifest(text):
+    """Main attributes of a MANIFEST.MF (continuation lines start with a space)."""
+    attributes = {}
+    last_key = None
+    for line in text.splitlines():
+        if not line.strip():
+            break # End of the main section
+        if line.startswith(" ") and last_key:
+            attributes[last_key] += line[1:]
+        elif ":" in line:
+            last_key, value = line.split(":", 1)
+            attributes[last_key.strip()] = value.strip()
+    return attributes
+
+
+def _read_entry_text(zip_ref, name):
+    try:
+        info = zip_ref.getinfo(name)
+    except KeyError:
+        return None
+    if info.file_size > MAX_METADATA_SIZE:
+        return None
+    return zip_ref.read(info).decode('utf-8', errors='replace').lstrip('\ufeff')
+
+
+def read_jar_metadata(path):
+    """
+    Reads the mods declared by a jar from its metadata (mods.toml, fabric.mod.json, or the
+    MANIFEST.MF as a fallback). Only the jar's central directory and these small entries are read.
+    Returns a list of {"id", "version", "name", "loader"}; empty for a jar that declares nothing.
+    """
+    mods = []
+    with zipfile.ZipFile(path, 'r') as zip_ref:
+        manifest_text = _read_entry_text(zip_ref, MANIFEST)
+        manifest = _parse_manifest(manifest_text) if manifest_text else {}
+        for metadata_name in FORGE_METADATA:
+            text = _read_entry_text(zip_ref, metadata_name)
+            if text is None:
+                continue
+            try:
+                data = tomllib.loads(text)
+            except tomllib.TOMLDecodeError as e:
+                print(f"DEBUG: Invalid {metadata_name} in '{path}': {e}")
+                break
+            for mod in data.get('mods', []):
+                version = str(mod.get('version', ""))
+                if "${" in version: # "${file.jarVersion}" is filled in from the manifest
+                    version = manifest.get('Implementation-Version', "")
+                mods.append({"id": mod.get('modId'), "version": version, "name": mod.get('displayName'),
+                             "loader": "neoforge" if metadata_name.startswith("META-INF/neoforge") else "forge"})
+            break
+        if not mods:
+            text = _read_entry_text(zip_ref, FABRIC_METADATA)
+            if text is not None:
+                try:
+                    data = json.loads(text, strict=False)
+                    mods.append({"id": data.get('id'), "version": str(data.get('version', "")), "name": data.get('name'), "loader": "fabric"})
+                except json.JSONDecodeError as e:
+                    print(f"DEBUG: Invalid {FABRIC_METADATA} in '{path}': {e}")
+        if not mods and manifest.get('Implementation-Version'):
+            title = manifest.get('Implementation-Title') or manifest.get('Specification-Title')
+            mods.append({"id": title.lower() if title else None, "version": manifest['Implementation-Version'],
+                         "name": title, "loader": None})
+    return [mod for mod in mods if mod['id']]
+
+
+class ModsIndex:
+    """
+    Mods declared by the jars of mods folders, cached by (path, size, mtime): a scan only
+    opens the jars that were added or changed since the previous one.
+    """
+    FORMAT_VERSION = 1
+
+    def __init__(self, index_path=MODS_INDEX_PATH):
+        self.index_path = index_path
+        self.entries = {} # {absolute jar path: [size, mtime_ns, mods]}
+        self.dirty = False
+        if os.path.exists(index_path):
+            try:
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == self.FORMAT_VERSION:
+                    self.entries = data.get('entries', {})
+            except (json.JSONDecodeError, IOError) as e:
+                print(f"DEBUG: Ignoring unreadable mods index: {e}")
+
+    def save(self):
+        if not self.dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            temp_path = f"{self.index_path}.tmp"
+            with _save_lock:
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump({"version": self.FORMAT_VERSION, "entries": self.entries}, f, separators=(',', ':'))
+                os.replace(temp_path, self.index_path)
+            self.dirty = False
+        except IOError as e:
+            print(f"Error saving mods index: {e}")
+
+    def get_jar_mods(self, path, st=None):
+        """Mods declared by a jar, read from the cache when its size and mtime did not change."""
+        path = os.path.abspath(path)
+        st = st or os.stat(path)
+        cached = self.entries.get(path)
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            return cached[2]
+        try:
+            mods = read_jar_metadata(path)
+        except (zipfile.BadZipFile, OSError) as e:
+            print(f"DEBUG: Cannot read jar '{path}': {e}")
+            mods = []
+        self.entries[path] = [st.st_size, st.st_mtime_ns, mods]
+        self.dirty = True
+        return mods
+
+    def scan(self, mods_dir):
+        """
+        Lists the jars of a mods folder: {"jars": {file name: [mods]}, "duplicates": {mod id: [file names]}}.
+        A mod id found in several jars means duplicated or conflicting versions.
+        """
+        mods_dir = os.path.abspath(mods_dir)
+        jars = {}
+        try:
+            entries = [entry for entry in os.scandir(mods_dir) if entry.name.lower().endswith(".jar") and entry.is_file()]
+        except OSError as e:
+            print(f"DEBUG: Cannot list mods folder '{mods_dir}': {e}")
+            entries = []
+        for entry in entries:
+            jars[entry.name] = self.get_jar_mods(entry.path, entry.stat())
+
+        # Forget the jars removed from this folder
+        for path in [path for path in self.entries if os.path.dirname(path) == mods_dir and os.path.basename(path) not in jars]:
+            del self.entries[path]
+            self.dirty = True
+
+        files_by_id = {}
+        for filename, mods in jars.items():
+            for mod in mods:
+                files_by_id.setdefault(mod['id'], []).append(filename)
+        duplicates = {mod_id: sorted(files) for mod_id, files in files_by_id.items() if len(files) > 1}
+        if duplicates:
+            print(f"DEBUG: Mods found in several jars of '{mods_dir}': {duplicates}")
+        return {"jars": jars, "duplicates": duplicates}
+
+
+def is_launcher_mod_jar(filename, mods):
+    """True if a jar is the launcher's mod: declared with MOD_ID, or named with MOD_FILE_PREFIX."""
+    return filename.startswith(MOD_FILE_PREFIX) or any(mod['id'] == MOD_ID for mod in mods)
+
+
+def find_launcher_mod_jars(scan_result):
+    """File names of the jars of the launcher's mod in a ModsIndex.scan result, renamed ones included."""
+    return sorted(filename for filename, mods in scan_result['jars'].items() if is_launcher_mod_jar(filename, mods))
+
+
+def get_launcher_mod_version(scan_result):
+    """
+    Version of the launcher's mod in a ModsIndex.scan result, read from the jar metadata, or
+    "0.0.0" if it is not installed. With several jars the highest version is returned.
+    """
+    versions = []
+    for filename in find_launcher_mod_jars(scan_result):
+        mods = scan_result['jars'][filename]
+        version = next((mod['version'] for mod in mods if mod['id'] == MOD_ID and mod['version']), None)
+        if not version and filename.startswith(MOD_FILE_PREFIX):
+            # No metadata: fall back to the version in the file name, e.g. "ZombieRool-1.3.0.jar" -> "1.3.0"
+            version = "".join(c for c in filename[len(MOD_FILE_PREFIX):-len(".jar")] if c.isdigit() or c == '.')
+        if version:
+            versions.append(version)
+    if not versions:
+        return "0.0.0"
+    return max(versions, key=QVersionNumber.fromString)
@@ -0,0 +1,160 @@
+# ZombieRoolLauncher/main/multi_instance.py
+import os
+import shutil
+import platform
+import time
+
+from main.incremental_install import ChecksumIndex, get_checksum_index_path, safe_join, remove_empty_parents
+from main.content_manifest import load_content_manifest, save_content_manifest
+
+# Linux ioctl sharing the extents of one file with another (copy-on-write clone, btrfs/XFS...)
+FICLONE = 0x40049409
+
+LINK_REFLINK = "reflink"
+LINK_HARDLINK = "hardlink"
+LINK_COPY = "copy"
+
+
+def _try_reflink(src, dst):
+    """Clones src into dst without duplicating data blocks. Returns True on success."""
+    if platform.system() != "Linux":
+        return False
+    try:
+        import fcntl
+        with open(src, 'rb') as source, open(dst, 'wb') as target:
+            fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+        shutil.copystat(src, dst)
+        return True
+    except (OSError, ImportError):
+        if os.path.exists(dst):
+            os.remove(dst)
+        return False
+
+
+def link_or_copy(src, dst, allow_hardlink=False):
+    """
+    Places a copy of src at dst while sharing its data on disk when the filesystem allows it:
+    a reflink (copy-on-write clone) first, then a hard link if allowed, then a regular copy.
+    Hard links share one inode, so they are only allowed for files the game never rewrites
+    in place (mod jars, resource pack archives), never for world files.
+    Returns the method used (LINK_REFLINK, LINK_HARDLINK or LINK_COPY).
+    """
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    temp_path = f"{dst}.zrl-part"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    try:
+        if _try_reflink(src, temp_path):
+            method = LINK_REFLINK
+        else:
+            method = LINK_COPY
+            if allow_hardlink:
+                try:
+                    os.link(src, temp_path)
+                    method = LINK_HARDLINK
+                except OSError:
+                    pass # Different volume or unsupported filesystem
+            if method == LINK_COPY:
+                shutil.copy2(src, temp_path)
+        os.replace(temp_path, dst)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return method
+
+
+def _same_file(path_a, path_b):
+    try:
+        return os.path.samefile(path_a, path_b)
+    except OSError:
+        return False
+
+
+def mirror_installed_files(src_dir, dst_dir):
+    """
+    Makes dst_dir hold the same launcher-installed files as src_dir (a world installed in
+    another instance), reusing the checksum indexes of both folders so unchanged files are
+    skipped, and reflinking the others when possible. Files tracked in dst_dir's index that
+    src_dir no longer has are removed; untracked files (game data) are left alone.
+    Returns a dict of statistics.
+    """
+    src_index = ChecksumIndex(get_checksum_index_path(src_dir), src_dir)
+    dst_index = ChecksumIndex(get_checksum_index_path(dst_dir), dst_dir)
+    previously_installed = set(dst_index.files)
+    stats = {"linked": 0, "copied": 0, "skipped": 0, "removed": 0}
+
+    try:
+        for relative_path, (size, _, crc) in src_index.files.items():
+            src_path = safe_join(src_dir, relative_path)
+            dst_path = safe_join(dst_dir, relative_path)
+            if not src_path or not dst_path or not os.path.isfile(src_path):
+                continue
+            if os.path.isfile(dst_path):
+                st = os.stat(dst_path)
+                if st.st_size == size and dst_index.get_crc(relative_path, dst_path, st) == crc:
+                    if relative_path in src_index.installed:
+                        dst_index.installed[relative_path] = src_index.installed[relative_path]
+                    stats["skipped"] += 1
+                    continue
+            method = link_or_copy(src_path, dst_path, allow_hardlink=False)
+            dst_index.record(relative_path, dst_path, crc)
+            if relative_path in src_index.installed:
+                dst_index.installed[relative_path] = src_index.installed[relative_path]
+            stats["linked" if method == LINK_REFLINK else "copied"] += 1
+
+        for relative_path in previously_installed - set(src_index.files):
+            dst_path = safe_join(dst_dir, relative_path)
+            dst_index.forget(relative_path)
+            if dst_path and os.path.isfile(dst_path):
+                os.remove(dst_path)
+                remove_empty_parents(dst_path, dst_dir)
+                stats["removed"] += 1
+    finally:
+        dst_index.save()
+
+    print(f"DEBUG: Mirrored '{src_dir}' into '{dst_dir}': {stats}")
+    return stats
+
+
+def mirror_content_pack(src_mods_dir, dst_mods_dir, pack_id):
+    """
+    Installs a content pack into another instance from the copy already installed in
+    src_mods_dir, hard-linking its jars, and writes the pack manifest of that instance.
+    Returns a dict of statistics.
+    """
+    src_manifest = load_content_manifest(src_mods_dir, pack_id)
+    if not src_manifest:
+        raise Exception(f"Content pack '{pack_id}' is not installed in '{src_mods_dir}'.")
+    previous_files = (load_content_manifest(dst_mods_dir, pack_id) or {}).get('files', {})
+    new_files = {}
+    stats = {"linked": 0, "copied": 0, "skipped": 0, "removed": 0}
+
+    for relative_path, recorded in src_manifest.get('files', {}).items():
+        src_path = safe_join(src_mods_dir, relative_path)
+        dst_path = safe_join(dst_mods_dir, relative_path)
+        if not src_path or not dst_path or not os.path.isfile(src_path):
+            continue
+        if _same_file(src_path, dst_path):
+            stats["skipped"] += 1
+        else:
+            previous = previous_files.get(relative_path)
+            if previous and previous.get('sha256') == recorded['sha256'] and os.path.isfile(dst_path):
+                st = os.stat(dst_path)
+                if st.st_size == previous['size'] and st.st_mtime_ns == previous.get('mtime_ns'):
+                    new_files[relative_path] = previous
+                    stats["skipped"] += 1
+                    continue
+            method = link_or_copy(src_path, dst_path, allow_hardlink=True)
+            stats["copied" if method == LINK_COPY else "linked"] += 1
+        st = os.stat(dst_path)
+        new_files[relative_path] = dict(recorded, size=st.st_size, mtime_ns=st.st_mtime_ns)
+
+    for relative_path in set(previous_files) - set(new_files):
+        dst_path = safe_join(dst_mods_dir, relative_path)
+        if dst_path and os.path.isfile(dst_path):
+            os.remove(dst_path)
+            stats["removed"] += 1
+
+    save_content_manifest(dst_mods_dir, dict(src_manifest, files=new_files, installed_at=int(time.time())))
+    print(f"DEBUG: Mirrored content pack '{pack_id}' into '{dst_mods_dir}': {stats}")
+    return stats
@@ -0,0 +1,239 @@
+# ZombieRoolLauncher/main/nbt.py
+import io
+import gzip
+import zlib
+import struct
+
+# NBT tag types
+TAG_END = 0
+TAG_BYTE = 1
+TAG_SHORT = 2
+TAG_INT = 3
+TAG_LONG = 4
+TAG_FLOAT = 5
+TAG_DOUBLE = 6
+TAG_BYTE_ARRAY = 7
+TAG_STRING = 8
+TAG_LIST = 9
+TAG_COMPOUND = 10
+TAG_INT_ARRAY = 11
+TAG_LONG_ARRAY = 12
+
+_SCALAR_FORMATS = {
+    TAG_BYTE: struct.Struct('>b'),
+    TAG_SHORT: struct.Struct('>h'),
+    TAG_INT: struct.Struct('>i'),
+    TAG_LONG: struct.Struct('>q'),
+    TAG_FLOAT: struct.Struct('>f'),
+    TAG_DOUBLE: struct.Struct('>d')
+}
+_ARRAY_ITEM_SIZES = {TAG_BYTE_ARRAY: 1, TAG_INT_ARRAY: 4, TAG_LONG_ARRAY: 8}
+
+# Nesting limit, so a malicious file cannot exhaust the stack
+MAX_DEPTH = 512
+
+
+class NBTError(Exception):
+    """Raised when NBT data is truncated or malformed."""
+
+
+def open_nbt_stream(fileobj):
+    """
+    Wraps a binary stream so NBT can be read from it, decompressing on the fly when the
+    data is gzip (level.dat) or zlib compressed. The stream is never read in full up front.
+    """
+    if hasattr(fileobj, 'peek'):
+        stream = fileobj
+        magic = stream.peek(2)[:2]
+    else:
+        magic = fileobj.read(2)
+        stream = _PrefixedReader(magic, fileobj)
+    if magic == b'\x1f\x8b':
+        return gzip.GzipFile(fileobj=stream, mode='rb')
+    if magic[:1] == b'\x78':
+        return io.BufferedReader(_ZlibReader(stream))
+    return stream
+
+
+class _PrefixedReader:
+    """Gives back the bytes consumed to sniff the compression before the rest of the stream."""
+    def __init__(self, prefix, fp):
+        self.prefix = prefix
+        self.fp = fp
+
+    def read(self, size=-1):
+        if not self.prefix:
+            return self.fp.read(size)
+        if size is None or size < 0:
+            data, self.prefix = self.prefix + self.fp.read(), b""
+            return data
+        data, self.prefix = self.prefix[:size], self.prefix[size:]
+        if len(data) < size:
+            data += self.fp.read(size - len(data))
+        return data
+
+
+class _ZlibReader(io.RawIOBase):
+    """Streaming zlib decompression (chunks of region files use it)."""
+    def __init__(self, fp):
+        self.fp = fp
+        self.decompressor = zlib.decompressobj()
+        self.buffer = b""
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self.buffer and not self.decompressor.eof:
+            data = self.fp.read(64 * 1024)
+            if not data:
+                break
+            self.buffer = self.decompressor.decompress(data)
+        size = min(len(buffer), len(self.buffer))
+        buffer[:size] = self.buffer[:size]
+        self.buffer = self.buffer[size:]
+        return size
+
+
+class NBTReader:
+    """
+    Reads NBT tags one by one from a stream. Values of the paths a caller is interested in
+    are built, everything else is skipped without being kept in memory.
+    With raw_arrays, int and long arrays are returned as their big-endian bytes, ready for
+    numpy.frombuffer, instead of being unpacked into lists.
+    """
+    def __init__(self, stream, raw_arrays=False):
+        self.stream = stream
+        self.raw_arrays = raw_arrays
+
+    def _read(self, size):
+        try:
+            data = self.stream.read(size)
+        except (EOFError, zlib.error, gzip.BadGzipFile) as e:
+            raise NBTError(f"Corrupted compressed NBT data: {e}") from e
+        if len(data) != size:
+            raise NBTError("Unexpected end of NBT data")
+        return data
+
+    def _skip(self, size):
+        remaining = size
+        while remaining > 0:
+            remaining -= len(self._read(min(remaining, 64 * 1024)))
+
+    def read_type(self):
+        return self._read(1)[0]
+
+    def read_name(self):
+        length = struct.unpack('>H', self._read(2))[0]
+        return self._read(length).decode('utf-8', errors='replace')
+
+    def read_root(self):
+        """Reads the root tag header. Returns (tag type, name)."""
+        tag_type = self.read_type()
+        if tag_type != TAG_COMPOUND:
+            raise NBTError(f"The root tag is not a compound (type {tag_type})")
+        return tag_type, self.read_name()
+
+    def read_payload(self, tag_type, depth=0):
+        """Reads the value of a tag as Python objects (dict, list, int, float, str, bytes)."""
+        if depth > MAX_DEPTH:
+            raise NBTError("NBT data is nested too deeply")
+        if tag_type in _SCALAR_FORMATS:
+            scalar = _SCALAR_FORMATS[tag_type]
+            return scalar.unpack(self._read(scalar.size))[0]
+        if tag_type == TAG_STRING:
+            return self.read_name()
+        if tag_type == TAG_BYTE_ARRAY:
+            length = self._read_length()
+            return self._read(length)
+        if tag_type in (TAG_INT_ARRAY, TAG_LONG_ARRAY):
+            length = self._read_length()
+            if self.raw_arrays:
+                return self._read(length * _ARRAY_ITEM_SIZES[tag_type])
+            item_code = 'i' if tag_type == TAG_INT_ARRAY else 'q'
+            return list(struct.unpack(f'>{length}{item_code}', self._read(length * _ARRAY_ITEM_SIZES[tag_type])))
+        if tag_type == TAG_LIST:
+            item_type = self.read_type()
+            length = self._read_length()
+            return [self.read_payload(item_type, depth + 1) for _ in range(length)]
+        if tag_type == TAG_COMPOUND:
+            compound = {}
+            for child_type, name in self.iter_compound():
+                compound[name] = self.read_payload(child_type, depth + 1)
+            return compound
+        raise NBTError(f"Unknown NBT tag type {tag_type}")
+
+    def skip_payload(self, tag_type, depth=0):
+        """Moves past the value of a tag without building it."""
+        if depth > MAX_DEPTH:
+            raise NBTError("NBT data is nested too deeply")
+        if tag_type in _SCALAR_FORMATS:
+            self._skip(_SCALAR_FORMATS[tag_type].size)
+        elif tag_type == TAG_STRING:
+            self._skip(struct.unpack('>H', self._read(2))[0])
+        elif tag_type in _ARRAY_ITEM_SIZES:
+            self._skip(self._read_length() * _ARRAY_ITEM_SIZES[tag_type])
+        elif tag_type == TAG_LIST:
+            item_type = self.read_type()
+            length = self._read_length()
+            if item_type in _SCALAR_FORMATS:
+                self._skip(length * _SCALAR_FORMATS[item_type].size)
+            else:
+                for _ in range(length):
+                    self.skip_payload(item_type, depth + 1)
+        elif tag_type == TAG_COMPOUND:
+            for child_type, _ in self.iter_compound():
+                self.skip_payload(child_type, depth + 1)
+        else:
+            raise NBTError(f"Unknown NBT tag type {tag_type}")
+
+    def iter_compound(self):
+        """
+        Yields (tag type, name) for each child of the compound being read. The caller must
+        read or skip each child's payload before asking for the next one.
+        """
+        while True:
+            tag_type = self.read_type()
+            if tag_type == TAG_END:
+                return
+            yield tag_type, self.read_name()
+
+    def _read_length(self):
+        length = struct.unpack('>i', self._read(4))[0]
+        if length < 0:
+            raise NBTError("Negative NBT length")
+        return length
+
+    def read_selected(self, tag_type, wanted, depth=0):
+        """
+        Reads a compound keeping only the wanted keys. `wanted` maps a key either to True
+        (keep its whole value) or to a nested `wanted` dict for compounds and lists of compounds.
+        """
+        if tag_type != TAG_COMPOUND:
+            return self.read_payload(tag_type, depth)
+        selected = {}
+        for child_type, name in self.iter_compound():
+            selection = wanted.get(name)
+            if selection is True:
+                selected[name] = self.read_payload(child_type, depth + 1)
+            elif isinstance(selection, dict) and child_type == TAG_COMPOUND:
+                selected[name] = self.read_selected(child_type, selection, depth + 1)
+            elif isinstance(selection, dict) and child_type == TAG_LIST:
+                item_type = self.read_type()
+                length = self._read_length()
+                selected[name] = [self.read_selected(item_type, selection, depth + 1) for _ in range(length)]
+            else:
+                self.skip_payload(child_type, depth + 1)
+        return selected
+
+
+def read_nbt(fileobj, wanted=None, raw_arrays=False):
+    """
+    Reads an NBT document (gzip, zlib or uncompressed) from a binary stream and returns its
+    root compound as a dict, restricted to the `wanted` keys when given (see NBTReader.read_selected).
+    """
+    reader = NBTReader(open_nbt_stream(fileobj), raw_arrays)
+    tag_type, _ = reader.read_root()
+    if wanted is None:
+        return reader.read_payload(tag_type)
+    return reader.read_selected(tag_type, wanted)
@@ -0,0 +1,72 @@
+# ZombieRoolLauncher/main/publish_checks.py
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from main.map_validation import validate_map_archive, validate_resourcepack_archive
+from main.nbt import NBTError
+from main.verify import hash_file, KIND_MAP
+from main.world_metadata import read_map_metadata
+
+
+def get_file_signature(path):
+    """
+    (size, mtime) identifying the current content of a picked file, so checks done when it was
+    dropped can be reused at publish time. For a world folder, its level.dat is used.
+    Returns None if the path does not exist.
+    """
+    try:
+        st = os.stat(os.path.join(path, "level.dat") if os.path.isdir(path) else path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def check_publish_file(path, kind):
+    """
+    Runs every check the publish step needs on a map or resource pack (KIND_MAP or KIND_RESOURCEPACK
+    of main.verify): validation, size and SHA-256 (archives only, world folders are packed at upload
+    time) and, for maps, the level.dat metadata. Hashing runs in a second thread while the archive
+    index is validated.
+    Returns {path, kind, signature, problems, size, sha256, metadata, metadata_error}.
+    """
+    result = {"path": path, "kind": kind, "signature": get_file_signature(path), "problems": [],
+              "size": None, "sha256": None, "metadata": None, "metadata_error": None}
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        hash_future = executor.submit(hash_file, path) if os.path.isfile(path) else None
+        if kind == KIND_MAP:
+            result["problems"] = validate_map_archive(path)
+            if not result["problems"]:
+                try:
+                    result["metadata"] = read_map_metadata(path) or {}
+                except (NBTError, OSError) as e:
+                    result["metadata_error"] = str(e)
+        else:
+            result["problems"] = validate_resourcepack_archive(path)
+        if hash_future:
+            try:
+                result["sha256"] = hash_future.result()[1]
+                result["size"] = os.path.getsize(path)
+            except OSError as e:
+                result["problems"].append(str(e))
+    print(f"DEBUG: Publish checks for {kind} '{path}': problems={result['problems']}, size={result['size']}, sha256={result['sha256']}")
+    return result
+
+
+class PublishCheckThread(QThread):
+    """Runs check_publish_file off the GUI thread, as soon as a file is picked."""
+    check_finished = pyqtSignal(dict) # Result of check_publish_file
+
+    def __init__(self, path, kind):
+        super().__init__()
+        self.path = path
+        self.kind = kind
+
+    def run(self):
+        try:
+            result = check_publish_file(self.path, self.kind)
+        except Exception as e:
+            result = {"path": self.path, "kind": self.kind, "signature": None, "problems": [str(e)],
+                      "size": None, "sha256": None, "metadata": None, "metadata_error": None}
+        self.check_finished.emit(result)
@@ -0,0 +1,206 @@
+# ZombieRoolLauncher/main/thumbnail_cache.py
+import os
+import json
+import time
+import hashlib
+from collections import OrderedDict
+
+import requests
+
+from PyQt6.QtCore import Qt, QObject, QThread, QSize, pyqtSignal
+from PyQt6.QtGui import QImage, QPixmap
+
+from main.constants import CACHE_DIR_PATH
+
+# Downloaded thumbnails, with an index of their ETag / Last-Modified for revalidation
+THUMBNAIL_CACHE_DIR = os.path.join(CACHE_DIR_PATH, 'thumbnails')
+
+THUMBNAIL_SIZE = QSize(180, 180) # Decoded size: twice the painted size, sharp on HiDPI screens
+MEMORY_CACHE_SIZE = 200 # Decoded pixmaps kept in memory
+DISK_CACHE_MAX_BYTES = 64 * 1024 * 1024
+MAX_THUMBNAIL_BYTES = 8 * 1024 * 1024 # Anything bigger is not an image we want to decode
+MAX_PARALLEL_LOADS = 4
+MAX_PENDING_LOADS = 48 # Requests beyond this are dropped, oldest first (rows scrolled past)
+
+
+def _decode_thumbnail(data):
+    """QImage of an encoded image scaled down to THUMBNAIL_SIZE, or None. Safe outside the GUI thread."""
+    image = QImage.fromData(data)
+    if image.isNull():
+        return None
+    if image.width() > THUMBNAIL_SIZE.width() or image.height() > THUMBNAIL_SIZE.height():
+        image = image.scaled(THUMBNAIL_SIZE, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+    return image
+
+
+class ThumbnailLoadThread(QThread):
+    """
+    Loads one thumbnail: the cached file is decoded first, then, with revalidate, the URL is
+    requested with If-None-Match / If-Modified-Since and a new image replaces the file.
+    Decoding and scaling happen here, off the GUI thread.
+    """
+    image_ready = pyqtSignal(str, QImage) # URL, decoded image; can be emitted twice (cached, then new)
+    load_finished = pyqtSignal(str, dict) # URL, {"etag", "last_modified", "size"} if downloaded, {} if unchanged, {"error"}
+
+    def __init__(self, url, cache_path, cache_entry=None, revalidate=True):
+        super().__init__()
+        self.url = url
+        self.cache_path = cache_path
+        self.cache_entry = cache_entry
+        self.revalidate = revalidate
+
+    def run(self):
+        has_cached_image = False
+        if self.cache_entry and os.path.exists(self.cache_path):
+            try:
+                with open(self.cache_path, 'rb') as f:
+                    image = _decode_thumbnail(f.read())
+                if image is not None:
+                    has_cached_image = True
+                    self.image_ready.emit(self.url, image)
+            except OSError as e:
+                print(f"DEBUG: Cannot read cached thumbnail '{self.cache_path}': {e}")
+        if has_cached_image and not self.revalidate:
+            self.load_finished.emit(self.url, {})
+            return
+
+        headers = {}
+        if has_cached_image and self.cache_entry.get('etag'):
+            headers['If-None-Match'] = self.cache_entry['etag']
+        if has_cached_image and self.cache_entry.get('last_modified'):
+            headers['If-Modified-Since'] = self.cache_entry['last_modified']
+        try:
+            response = requests.get(self.url, headers=headers, timeout=15)
+            if response.status_code == 304:
+                self.load_finished.emit(self.url, {})
+                return
+            response.raise_for_status()
+            if len(response.content) > MAX_THUMBNAIL_BYTES:
+                raise ValueError(f"thumbnail too large ({len(response.content)} bytes)")
+            image = _decode_thumbnail(response.content)
+            if image is None:
+                raise ValueError("not a readable image")
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            temp_path = f"{self.cache_path}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(response.content)
+            os.replace(temp_path, self.cache_path)
+            self.image_ready.emit(self.url, image)
+            self.load_finished.emit(self.url, {"etag": response.headers.get('ETag'),
+                                               "last_modified": response.headers.get('Last-Modified'),
+                                               "size": len(response.content)})
+        except (requests.exceptions.RequestException, ValueError, OSError) as e:
+            print(f"DEBUG: Thumbnail '{self.url}' not loaded: {e}")
+            # A cached image that could not be revalidated (offline...) is still shown
+            self.load_finished.emit(self.url, {} if has_cached_image else {"error": str(e)})
+
+
+class ThumbnailCache(QObject):
+    """
+    Map thumbnails for the catalog view. get() answers from a bounded in-memory LRU of
+    QPixmaps and otherwise queues a background load, so only the rows being painted (the
+    visible ones) are loaded, the most recently requested first. Loaded files stay in a
+    disk cache (LRU, DISK_CACHE_MAX_BYTES) and are revalidated with their ETag once per session.
+    The index of the disk cache is only touched on the GUI thread.
+    """
+    thumbnail_loaded = pyqtSignal(str) # URL whose pixmap is now available
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, parent=None, cache_dir=THUMBNAIL_CACHE_DIR):
+        super().__init__(parent)
+        self.cache_dir = cache_dir
+        self.index_path = os.path.join(cache_dir, 'index.json')
+        self.entries = {} # {url: {"file", "etag", "last_modified", "size", "used"}}
+        self.pixmaps = OrderedDict() # {url: QPixmap}, least recently used first
+        self.pending = OrderedDict() # {url: None}, most recently requested last
+        self.load_threads = {} # {url: ThumbnailLoadThread}
+        self.revalidated = set() # URLs checked against the server this session
+        self.failed = set() # URLs not retried this session
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == self.FORMAT_VERSION:
+                    self.entries = data.get('entries', {})
+            except (json.JSONDecodeError, IOError) as e:
+                print(f"DEBUG: Ignoring unreadable thumbnail index: {e}")
+
+    def save(self):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = f"{self.index_path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": self.FORMAT_VERSION, "entries": self.entries}, f, separators=(',', ':'))
+            os.replace(temp_path, self.index_path)
+        except IOError as e:
+            print(f"Error saving thumbnail index: {e}")
+
+    def _get_cache_path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode('utf-8')).hexdigest())
+
+    def get(self, url):
+        """The pixmap of a thumbnail, or None while it is loaded in the background."""
+        pixmap = self.pixmaps.get(url)
+        if pixmap is not None:
+            self.pixmaps.move_to_end(url)
+            return pixmap
+        if url in self.load_threads or url in self.failed:
+            return None
+        self.pending[url] = None
+        self.pending.move_to_end(url)
+        while len(self.pending) > MAX_PENDING_LOADS:
+            self.pending.popitem(last=False)
+        self._start_pending_loads()
+        return None
+
+    def _start_pending_loads(self):
+        while self.pending and len(self.load_threads) < MAX_PARALLEL_LOADS:
+            url, _ = self.pending.popitem(last=True) # Most recently painted first
+            entry = self.entries.get(url)
+            thread = ThumbnailLoadThread(url, self._get_cache_path(url), entry, revalidate=url not in self.revalidated)
+            thread.image_ready.connect(self._handle_image_ready)
+            thread.load_finished.connect(self._handle_load_finished)
+            thread.finished.connect(lambda url=url: self._handle_thread_finished(url))
+            self.load_threads[url] = thread
+            thread.start()
+
+    def _handle_image_ready(self, url, image):
+        self.pixmaps[url] = QPixmap.fromImage(image) # QPixmap can only be created on the GUI thread
+        self.pixmaps.move_to_end(url)
+        while len(self.pixmaps) > MEMORY_CACHE_SIZE:
+            self.pixmaps.popitem(last=False)
+        self.thumbnail_loaded.emit(url)
+
+    def _handle_load_finished(self, url, result):
+        self.revalidated.add(url)
+        if "error" in result:
+            self.failed.add(url)
+        elif result:
+            self.entries[url] = {"file": os.path.basename(self._get_cache_path(url)), "etag": result.get('etag'),
+                                 "last_modified": result.get('last_modified'), "size": result['size'], "used": time.time()}
+            self._evict()
+            self.save()
+        elif url in self.entries:
+            self.entries[url]['used'] = time.time()
+
+    def _handle_thread_finished(self, url):
+        thread = self.load_threads.pop(url, None)
+        if thread is not None:
+            thread.deleteLater()
+        self._start_pending_loads()
+
+    def _evict(self):
+        """Removes the least recently used files while the disk cache is above DISK_CACHE_MAX_BYTES."""
+        total = sum(entry.get('size', 0) for entry in self.entries.values())
+        for url, entry in sorted(self.entries.items(), key=lambda item: item[1].get('used', 0)):
+            if total <= DISK_CACHE_MAX_BYTES:
+                break
+            if url in self.load_threads:
+                continue
+            try:
+                os.remove(os.path.join(self.cache_dir, entry['file']))
+            except OSError:
+                pass
+            total -= entry.get('size', 0)
+            del self.entries[url]
@@ -0,0 +1,271 @@
+# ZombieRoolLauncher/main/thumbnail_renderer.py
+import io
+import os
+import zipfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np # Optional: needed to render map thumbnails
+except ImportError:
+    np = None
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QImage
+
+from main.incremental_install import get_archive_root_prefix
+from main.nbt import NBTError, read_nbt
+from main.world_optimizer import COMPRESSION_EXTERNAL_FLAG, REGION_ENTRY_PATTERN, decompress_chunk, iter_chunk_records, read_region_entry
+
+THUMBNAIL_MAX_SIZE = 512 # Pixels, longest side
+REGION_PIXELS = 512 # One pixel per block column
+HEIGHTMAP_BITS = 9
+SPANNING_LONGS_BEFORE = 2529 # Data version (1.16) before which packed values could span two longs
+
+# Only what is needed to find the top block of each column is decoded
+_CHUNK_KEYS = {
+    "DataVersion": True, "Status": True, "yPos": True,
+    "Heightmaps": {"WORLD_SURFACE": True},
+    "sections": {"Y": True, "block_states": {"palette": {"Name": True}, "data": True}},
+    "Level": {"Status": True, "Heightmaps": {"WORLD_SURFACE": True}, # Before 1.18
+              "Sections": {"Y": True, "Palette": {"Name": True}, "BlockStates": True}}
+}
+
+# Colors picked by the first keyword found in a block name
+_DYE_COLORS = [
+    ("light_gray", (157, 157, 151)), ("light_blue", (58, 179, 218)), ("white", (233, 236, 236)),
+    ("orange", (240, 118, 19)), ("magenta", (189, 68, 179)), ("yellow", (248, 197, 39)),
+    ("lime", (112, 185, 25)), ("pink", (237, 141, 172)), ("gray", (62, 68, 71)), ("cyan", (21, 137, 145)),
+    ("purple", (121, 42, 172)), ("blue", (53, 57, 157)), ("brown", (114, 71, 40)), ("green", (84, 109, 27)),
+    ("red", (160, 39, 34)), ("black", (20, 21, 25))
+]
+_DYED_BLOCKS = ("wool", "concrete", "terracotta", "carpet", "stained_glass", "glazed", "bed", "shulker_box", "candle", "banner")
+_BLOCK_COLORS = [
+    ("water", (63, 118, 228)), ("lava", (207, 92, 15)), ("packed_ice", (141, 180, 250)), ("ice", (160, 188, 255)),
+    ("snow", (240, 248, 255)), ("grass_block", (109, 153, 48)), ("leaves", (55, 110, 30)), ("vine", (55, 110, 30)),
+    ("grass", (109, 153, 48)), ("fern", (90, 140, 40)), ("moss", (89, 109, 45)), ("lily_pad", (32, 128, 48)),
+    ("red_sand", (190, 102, 33)), ("sand", (219, 207, 163)), ("gravel", (136, 126, 126)), ("mud", (60, 57, 60)),
+    ("podzol", (91, 63, 24)), ("mycelium", (111, 99, 105)), ("dirt", (134, 96, 67)), ("farmland", (110, 75, 45)),
+    ("path", (148, 122, 65)), ("clay", (160, 166, 179)), ("planks", (162, 130, 78)), ("log", (102, 81, 51)),
+    ("wood", (102, 81, 51)), ("stem", (92, 25, 29)), ("fence", (143, 119, 72)), ("door", (143, 119, 72)),
+    ("crafting_table", (143, 119, 72)), ("bookshelf", (117, 94, 59)), ("deepslate", (80, 80, 82)),
+    ("blackstone", (42, 36, 41)), ("end_stone", (219, 222, 158)), ("netherrack", (97, 38, 38)),
+    ("nether_brick", (44, 21, 26)), ("brick", (150, 97, 83)), ("quartz", (235, 229, 222)),
+    ("obsidian", (20, 18, 29)), ("bedrock", (85, 85, 85)), ("andesite", (136, 136, 137)),
+    ("diorite", (188, 188, 188)), ("granite", (149, 103, 85)), ("cobblestone", (110, 110, 110)),
+    ("stone", (125, 125, 125)), ("glass", (200, 220, 230)), ("iron", (200, 200, 200)), ("gold", (246, 208, 61)),
+    ("diamond", (98, 237, 228)), ("emerald", (42, 203, 87)), ("redstone", (170, 0, 0)), ("lapis", (31, 67, 140)),
+    ("copper", (192, 107, 79)), ("torch", (255, 200, 80)), ("lantern", (255, 200, 80)), ("glowstone", (255, 220, 140)),
+    ("sea_lantern", (172, 199, 190)), ("rail", (120, 110, 100)), ("pumpkin", (198, 118, 24)),
+    ("melon", (111, 145, 30)), ("hay", (166, 136, 38)), ("cactus", (85, 127, 43)), ("sugar_cane", (148, 192, 101)),
+    ("mushroom", (150, 110, 90)), ("prismarine", (99, 156, 151)), ("purpur", (169, 125, 169)),
+    ("sculk", (12, 29, 36)), ("amethyst", (133, 97, 191)), ("tuff", (108, 109, 102)), ("calcite", (223, 224, 220))
+]
+_DEFAULT_COLOR = (140, 140, 140)
+_AIR_BLOCKS = {"minecraft:air", "minecraft:cave_air", "minecraft:void_air"}
+
+
+def is_thumbnail_renderer_available():
+    return np is not None
+
+
+def get_block_color(name):
+    """Returns the (r, g, b) color of a block name on the thumbnail, or None for air."""
+    if name in _AIR_BLOCKS:
+        return None
+    name = name.removeprefix("minecraft:")
+    if any(block in name for block in _DYED_BLOCKS):
+        for dye, color in _DYE_COLORS:
+            if name.startswith(dye):
+                return color
+    for keyword, color in _BLOCK_COLORS:
+        if keyword in name:
+            return color
+    return _DEFAULT_COLOR
+
+
+def unpack_long_array(raw, bits, count, spanning=False):
+    """
+    Unpacks `count` values of `bits` bits from a packed long array (big-endian bytes).
+    Since 1.16 values never span two longs; before, they do (spanning=True).
+    Returns a uint32 numpy array, or None if the array is too short.
+    """
+    longs = np.frombuffer(raw, dtype='>u8').astype(np.uint64)
+    mask = np.uint64((1 << bits) - 1)
+    if not spanning:
+        per_long = 64 // bits
+        if len(longs) * per_long < count:
+            return None
+        shifts = np.arange(per_long, dtype=np.uint64) * np.uint64(bits)
+        return ((longs[:, None] >> shifts[None, :]) & mask).reshape(-1)[:count].astype(np.uint32)
+    if len(longs) * 64 < count * bits:
+        return None
+    offsets = np.arange(count, dtype=np.uint64) * np.uint64(bits)
+    index = (offsets // np.uint64(64)).astype(np.intp)
+    shift = offsets % np.uint64(64)
+    low = longs[index] >> shift
+    # Bits continuing in the next long (the shift is kept below 64, results are masked out when unused)
+    next_long = longs[np.minimum(index + 1, len(longs) - 1)]
+    high = np.where(shift + np.uint64(bits) > np.uint64(64), next_long << ((np.uint64(64) - shift) % np.uint64(64)), np.uint64(0))
+    return ((low | high) & mask).astype(np.uint32)
+
+
+def _render_chunk(chunk, color_ids, colors):
+    """
+    Returns (color index per column, top block height per column) as 16x16 arrays (z, x),
+    or None if the chunk has no usable heightmap. color_ids / colors are the per-process
+    cache of block name -> index in the colors list (index 0 is "nothing").
+    """
+    level = chunk.get("Level", chunk)
+    status = (chunk.get("Status") or level.get("Status") or "full").removeprefix("minecraft:")
+    if status not in ("full", "postprocessed", "fullchunk"):
+        return None
+    heightmap = level.get("Heightmaps", {}).get("WORLD_SURFACE")
+    if not heightmap:
+        return None
+    spanning = chunk.get("DataVersion", 0) < SPANNING_LONGS_BEFORE
+    heights = unpack_long_array(heightmap, HEIGHTMAP_BITS, 256, spanning)
+    if heights is None:
+        return None
+    min_y = chunk.get("yPos", 0) * 16
+    top_y = heights.astype(np.int32) + min_y - 1 # Height of the top block of each column
+
+    pixels = np.zeros(256, dtype=np.uint16)
+    columns = np.arange(256)
+    section_y = np.floor_divide(top_y, 16)
+    for section in chunk.get("sections", level.get("Sections", [])):
+        selected = section_y == section.get("Y")
+        if not selected.any():
+            continue
+        states = section.get("block_states", {})
+        palette = states.get("palette", section.get("Palette", []))
+        data = states.get("data", section.get("BlockStates"))
+        if not palette:
+            continue
+        palette_colors = np.array([_get_color_id(block.get("Name", ""), color_ids, colors) for block in palette], dtype=np.uint16)
+        local_y = top_y[selected] & 15
+        block_index = (local_y * 16 + columns[selected] // 16) * 16 + columns[selected] % 16
+        if data is None or len(palette) == 1:
+            pixels[selected] = palette_colors[0]
+            continue
+        bits = max(4, (len(palette) - 1).bit_length())
+        indices = unpack_long_array(data, bits, 4096, spanning)
+        if indices is None:
+            continue
+        indices = np.minimum(indices[block_index], len(palette) - 1)
+        pixels[selected] = palette_colors[indices]
+    return pixels.reshape(16, 16), top_y.reshape(16, 16)
+
+
+def _get_color_id(name, color_ids, colors):
+    color_id = color_ids.get(name)
+    if color_id is None:
+        color = get_block_color(name)
+        color_id = 0 if color is None else len(colors)
+        if color is not None:
+            colors.append(color)
+        color_ids[name] = color_id
+    return color_id
+
+
+def render_region(region_bytes):
+    """
+    Renders one region file seen from above. Returns a (512, 512, 4) uint8 RGBA array
+    (rows are z, columns x), transparent where no chunk was generated.
+    """
+    color_ids = {}
+    colors = [(0, 0, 0)]
+    color_map = np.zeros((REGION_PIXELS, REGION_PIXELS), dtype=np.uint16)
+    heights = np.full((REGION_PIXELS, REGION_PIXELS), np.iinfo(np.int32).min, dtype=np.int32)
+    for index, _, compression, record in iter_chunk_records(region_bytes):
+        if record is None or compression & COMPRESSION_EXTERNAL_FLAG:
+            continue
+        try:
+            data = decompress_chunk(compression, record[5:])
+            if data is None:
+                continue
+            rendered = _render_chunk(read_nbt(io.BytesIO(data), _CHUNK_KEYS, raw_arrays=True), color_ids, colors)
+        except (NBTError, OSError, EOFError, ValueError) as e:
+            print(f"DEBUG: Skipping chunk {index} in the thumbnail: {e}")
+            continue
+        if rendered is None:
+            continue
+        x, z = (index % 32) * 16, (index // 32) * 16
+        color_map[z:z + 16, x:x + 16], heights[z:z + 16, x:x + 16] = rendered
+
+    rgb = np.array(colors, dtype=np.float32)[color_map]
+    # Relief shading: lighter when the column is higher than the one north of it, darker when lower
+    north = np.vstack([heights[:1], heights[:-1]])
+    difference = np.where(north == np.iinfo(np.int32).min, 0, heights - north)
+    shade = np.clip(1.0 + difference * 0.08, 0.7, 1.25)
+    image = np.zeros((REGION_PIXELS, REGION_PIXELS, 4), dtype=np.uint8)
+    image[..., :3] = np.clip(rgb * shade[..., None], 0, 255).astype(np.uint8)
+    image[..., 3] = np.where(color_map > 0, 255, 0)
+    return image
+
+
+def _render_region_entry(source_zip_path, entry_name, step):
+    """Process pool task: renders one region of the archive, keeping one pixel out of `step`."""
+    return render_region(read_region_entry(source_zip_path, entry_name))[::step, ::step].copy()
+
+
+def render_map_thumbnail(source_zip_path, output_path, max_size=THUMBNAIL_MAX_SIZE, max_workers=None):
+    """
+    Renders a top-down PNG thumbnail of the overworld of a map ZIP (or world folder), from
+    the heightmaps and the top block of each column. Regions are rendered in parallel on a
+    process pool and assembled with NumPy. Returns the (width, height) of the image, or None
+    if nothing could be rendered.
+    """
+    if np is None:
+        raise RuntimeError("NumPy is required to render map thumbnails.")
+    if os.path.isdir(source_zip_path):
+        region_dir = os.path.join(source_zip_path, "region")
+        files = [(f"region/{entry.name}", entry.stat().st_size) for entry in os.scandir(region_dir)] if os.path.isdir(region_dir) else []
+        root_prefix = ""
+    else:
+        with zipfile.ZipFile(source_zip_path, 'r') as zip_ref:
+            files = [(info.filename, info.file_size) for info in zip_ref.infolist()]
+        root_prefix = get_archive_root_prefix(name for name, _ in files)
+    regions = {}
+    for name, size in files:
+        match = REGION_ENTRY_PATTERN.match(name[len(root_prefix):])
+        if match and not match['dimension'] and match['folder'] == "region" and size > 0:
+            regions[name] = (int(match['x']), int(match['z']))
+    if not regions:
+        return None
+
+    min_x = min(x for x, _ in regions.values())
+    min_z = min(z for _, z in regions.values())
+    width = (max(x for x, _ in regions.values()) - min_x + 1) * REGION_PIXELS
+    height = (max(z for _, z in regions.values()) - min_z + 1) * REGION_PIXELS
+    # Big worlds are sampled while rendering so the canvas stays around twice the thumbnail size
+    step = 1
+    while max(width, height) // step > max_size * 2 and step < REGION_PIXELS:
+        step *= 2
+    tile = REGION_PIXELS // step
+    canvas = np.zeros((height // step, width // step, 4), dtype=np.uint8)
+
+    context = multiprocessing.get_context("spawn") # The GUI process runs threads: do not fork it
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+        futures = {name: executor.submit(_render_region_entry, source_zip_path, name, step) for name in regions}
+        for name, future in futures.items():
+            region_x, region_z = regions[name]
+            top, left = (region_z - min_z) * tile, (region_x - min_x) * tile
+            canvas[top:top + tile, left:left + tile] = future.result()
+
+    # Crop to the generated area
+    opaque_rows = np.flatnonzero(canvas[..., 3].any(axis=1))
+    opaque_columns = np.flatnonzero(canvas[..., 3].any(axis=0))
+    if not len(opaque_rows):
+        return None
+    canvas = np.ascontiguousarray(canvas[opaque_rows[0]:opaque_rows[-1] + 1, opaque_columns[0]:opaque_columns[-1] + 1])
+
+    image = QImage(canvas.data, canvas.shape[1], canvas.shape[0], canvas.strides[0], QImage.Format.Format_RGBA8888)
+    if max(canvas.shape[0], canvas.shape[1]) > max_size:
+        image = image.scaled(max_size, max_size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+    else:
+        image = image.copy() # Detach from the NumPy buffer
+    if not image.save(output_path, "PNG"):
+        raise IOError(f"Could not write the thumbnail to '{output_path}'.")
+    print(f"DEBUG: Thumbnail of {len(regions)} regions rendered ({image.width()}x{image.height()}, 1/{step} sampling).")
+    return image.width(), image.height()
@@ -2,13 +2,13 @@ import os
 import platform
 import json
 import shutil # For copying and deleting files/folders
-import zipfile # For decompressing .zip files
 import stat # For chmod on Unix-like systems
 
 from PyQt6.QtWidgets import QMessageBox # For utility-level error messages
 from PyQt6.QtCore import QUrl
 
 from main.constants import CONFIG_FILE_PATH
+from main.map_validation import validate_map_archive
 
 # --- UTILITY FUNCTIONS FOR MINECRAFT PATHS ---
 def get_default_minecraft_path():
@@ -54,6 +54,35 @@ def get_minecraft_sub_paths(mc_path):
             return None
     return None
 
+def get_minecraft_instances(config):
+    """
+    Returns the list of registered Minecraft instance folders (the active 'minecraft_path'
+    first), without duplicates and without folders that no longer exist.
+    """
+    instances = []
+    for path in [config.get('minecraft_path')] + config.get('minecraft_instances', []):
+        if path and os.path.isdir(path) and os.path.normcase(os.path.abspath(path)) not in \
+                [os.path.normcase(os.path.abspath(p)) for p in instances]:
+            instances.append(path)
+    return instances
+
+def register_minecraft_instance(path):
+    """Adds an instance folder to the registered instances saved in the configuration."""
+    config = load_config()
+    instances = config.get('minecraft_instances', [])
+    if os.path.normcase(os.path.abspath(path)) not in [os.path.normcase(os.path.abspath(p)) for p in instances]:
+        instances.append(path)
+    config['minecraft_instances'] = instances
+    save_config(config)
+
+def unregister_minecraft_instance(path):
+    """Removes an instance folder from the registered instances (files are not touched)."""
+    config = load_config()
+    key = os.path.normcase(os.path.abspath(path))
+    config['minecraft_instances'] = [p for p in config.get('minecraft_instances', [])
+                                     if os.path.normcase(os.path.abspath(p)) != key]
+    save_config(config)
+
 # --- UTILITY FUNCTIONS FOR LOCAL CONFIGURATION ---
 def load_config():
     """Loads configuration from a local JSON file."""
@@ -80,59 +109,19 @@ def save_config(config_data):
 # --- MAP VALIDATION UTILITY ---
 def is_valid_map_zip(zip_path):
     """
-    Checks if a given ZIP file contains the basic structure of a Minecraft world save.
-    A valid map ZIP should typically contain:
-    - level.dat at the root
-    - a 'region' folder (and optionally 'DIM-1', 'DIM1' for Nether/End)
+    Checks if a given ZIP (or .tar.zst) file contains the basic structure of a Minecraft world save:
+    level.dat and region files, at the root or within a single root folder.
+    Nothing is extracted: see map_validation.validate_map_archive.
     """
     if not zip_path or not os.path.exists(zip_path):
         return False
 
-    temp_extract_dir = None
-    is_valid = False
-    try:
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            # Get the list of all files/directories in the zip
-            namelist = zip_ref.namelist()
-
-            # Strategy 1: Check for level.dat and region/ directly at the root of the zip
-            has_level_dat_at_root = 'level.dat' in namelist
-            has_region_folder_at_root = any(name.startswith('region/') for name in namelist)
-
-            if has_level_dat_at_root and has_region_folder_at_root:
-                is_valid = True
-                print("DEBUG: Valid map ZIP (level.dat and region/ at root).")
-                return True
-
-            # Strategy 2: If not at root, extract to a temp dir and check the first level
-            # This handles zips where the map is inside a single root folder
-            temp_extract_dir = os.path.join(os.path.dirname(zip_path), f"temp_map_check_{os.urandom(8).hex()}")
-            os.makedirs(temp_extract_dir, exist_ok=True)
-            zip_ref.extractall(temp_extract_dir)
-
-            extracted_contents = os.listdir(temp_extract_dir)
-            if len(extracted_contents) == 1 and os.path.isdir(os.path.join(temp_extract_dir, extracted_contents[0])):
-                # It's a single root folder, check inside that folder
-                map_root_folder = os.path.join(temp_extract_dir, extracted_contents[0])
-                if os.path.exists(os.path.join(map_root_folder, 'level.dat')) and \
-                   os.path.exists(os.path.join(map_root_folder, 'region')):
-                    is_valid = True
-                    print("DEBUG: Valid map ZIP (level.dat and region/ inside single root folder).")
-                    return True
-            
-            print(f"DEBUG: Map ZIP validation failed for '{zip_path}'. Contents: {namelist}")
-            return False
-
-    except zipfile.BadZipFile:
-        print(f"ERROR: '{zip_path}' is not a valid ZIP file.")
-        return False
-    except Exception as e:
-        print(f"ERROR: An unexpected error occurred during map ZIP validation: {e}")
+    problems = validate_map_archive(zip_path)
+    if problems:
+        print(f"DEBUG: Map archive validation failed for '{zip_path}': {problems}")
         return False
-    finally:
-        if temp_extract_dir and os.path.exists(temp_extract_dir):
-            shutil.rmtree(temp_extract_dir, ignore_errors=True)
-            print(f"DEBUG: Cleaned up temporary map validation directory: {temp_extract_dir}")
+    print(f"DEBUG: Valid map archive: '{zip_path}'.")
+    return True
 
 # --- Helper to make script executable for launcher update ---
 def make_executable(path):
@@ -0,0 +1,228 @@
+# ZombieRoolLauncher/main/verify.py
+import os
+import json
+import mmap
+import zlib
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt6.QtCore import QThread, QUrl, pyqtSignal
+
+from main.constants import CACHE_DIR_PATH
+from main.incremental_install import ChecksumIndex, get_checksum_index_path, safe_join
+from main.content_manifest import list_installed_content_packs
+from main.catalog_shards import load_installed_map_details
+
+# Persistent cache of file hashes, keyed by absolute path and valid while size and mtime match
+HASH_INDEX_PATH = os.path.join(CACHE_DIR_PATH, 'hash_index.json')
+
+HASH_BUFFER_SIZE = 4 * 1024 * 1024 # 4 MB reads for files hashed without mmap
+MMAP_THRESHOLD = 16 * 1024 * 1024 # Files from this size on are hashed through mmap
+
+# Kinds of installed content a verification checks
+KIND_MOD = "mod"
+KIND_CONTENT_PACK = "content"
+KIND_MAP = "map"
+KIND_RESOURCEPACK = "resourcepack"
+
+STATUS_MISSING = "missing"
+STATUS_CORRUPTED = "corrupted"
+
+
+def hash_file(path):
+    """
+    Returns the (crc32, sha256 hex digest) of a file in a single pass.
+    zlib and hashlib release the GIL on large buffers, so several files can be hashed
+    in parallel threads; big files are mapped in memory instead of being copied in blocks.
+    """
+    crc = 0
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    for offset in range(0, size, HASH_BUFFER_SIZE):
+                        block = view[offset:offset + HASH_BUFFER_SIZE]
+                        crc = zlib.crc32(block, crc)
+                        sha256.update(block)
+                finally:
+                    view.release()
+        else:
+            while True:
+                block = f.read(HASH_BUFFER_SIZE)
+                if not block:
+                    break
+                crc = zlib.crc32(block, crc)
+                sha256.update(block)
+    return crc & 0xFFFFFFFF, sha256.hexdigest()
+
+
+class HashIndex:
+    """
+    Cached (crc32, sha256) of local files keyed by (path, size, mtime), so a verification
+    only rehashes the files that changed since the previous one.
+    """
+    FORMAT_VERSION = 1
+
+    def __init__(self, index_path=HASH_INDEX_PATH):
+        self.index_path = index_path
+        self.entries = {} # {absolute path: [size, mtime_ns, crc32, sha256]}
+        if os.path.exists(index_path):
+            try:
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == self.FORMAT_VERSION:
+                    self.entries = data.get('entries', {})
+            except (json.JSONDecodeError, IOError) as e:
+                print(f"DEBUG: Ignoring unreadable hash index: {e}")
+
+    def save(self):
+        # Forget the files that no longer exist so the index does not grow forever
+        self.entries = {path: entry for path, entry in self.entries.items() if os.path.exists(path)}
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            temp_path = f"{self.index_path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": self.FORMAT_VERSION, "entries": self.entries}, f, separators=(',', ':'))
+            os.replace(temp_path, self.index_path)
+        except IOError as e:
+            print(f"Error saving hash index: {e}")
+
+    def hash_files(self, paths, progress_callback=None):
+        """
+        Returns {path: (crc32, sha256)} for the given existing files, hashing the ones
+        missing from the cache in parallel. progress_callback(done, total) is called as files complete.
+        """
+        results = {}
+        to_hash = []
+        for path in dict.fromkeys(os.path.abspath(p) for p in paths):
+            st = os.stat(path)
+            cached = self.entries.get(path)
+            if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+                results[path] = (cached[2], cached[3])
+            else:
+                to_hash.append((path, st))
+
+        total = len(results) + len(to_hash)
+        done = len(results)
+        if progress_callback:
+            progress_callback(done, total)
+        if to_hash:
+            with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+                for (path, st), (crc, sha256) in zip(to_hash, executor.map(lambda item: hash_file(item[0]), to_hash)):
+                    results[path] = (crc, sha256)
+                    self.entries[path] = [st.st_size, st.st_mtime_ns, crc, sha256]
+                    done += 1
+                    if progress_callback:
+                        progress_callback(done, total)
+        print(f"DEBUG: Hashed {len(to_hash)} files ({total - len(to_hash)} from cache).")
+        return results
+
+
+def _add_issue(issues, key, kind, item_id, name, info, relative_path, status):
+    issue = issues.setdefault(key, {"kind": kind, "id": item_id, "name": name, "info": info, "files": {}})
+    issue["files"][relative_path] = status
+
+
+def verify_installed_content(updates_data, minecraft_paths, local_mod_version, progress_callback=None, hash_index=None):
+    """
+    Checks the installed mod jar, content packs, maps and their resource packs against what
+    the catalog published (or what their install recorded).
+    Returns the list of problems found, one dict per piece of content:
+        {"kind", "id", "name", "info": catalog entry or None, "files": {relative path: "missing"/"corrupted"}}
+    """
+    updates_data = updates_data or {}
+    hash_index = hash_index or HashIndex()
+    checks = [] # (issue key, kind, id, name, info, relative path, local path, "crc32"/"sha256", expected value)
+    issues = {}
+
+    # 1. Mod jar (only when the installed version is the one the catalog describes)
+    mod_info = updates_data.get('mod') or {}
+    mods_dir = minecraft_paths.get('mods')
+    if mods_dir and mod_info.get('sha256') and mod_info.get('download_url') and local_mod_version == mod_info.get('latest_version'):
+        jar_name = os.path.basename(QUrl(mod_info['download_url']).path())
+        jar_path = os.path.join(mods_dir, jar_name)
+        if os.path.isfile(jar_path):
+            checks.append(("mod", KIND_MOD, "mod", mod_info.get('name', "Mod"), mod_info, jar_name, jar_path, "sha256", mod_info['sha256']))
+
+    # 2. Content packs, against the hashes recorded in their installed manifest
+    catalog_packs = {pack.get('id'): pack for pack in updates_data.get('content_packs', [])}
+    if mods_dir:
+        for manifest in list_installed_content_packs(mods_dir):
+            key = f"{KIND_CONTENT_PACK}:{manifest['id']}"
+            for relative_path, recorded in manifest.get('files', {}).items():
+                local_path = safe_join(mods_dir, relative_path)
+                if not local_path or not os.path.isfile(local_path):
+                    _add_issue(issues, key, KIND_CONTENT_PACK, manifest['id'], manifest.get('name', manifest['id']),
+                               catalog_packs.get(manifest['id']), relative_path, STATUS_MISSING)
+                    continue
+                checks.append((key, KIND_CONTENT_PACK, manifest['id'], manifest.get('name', manifest['id']),
+                               catalog_packs.get(manifest['id']), relative_path, local_path, "sha256", recorded['sha256']))
+
+    # 3. Maps installed from the catalog, against the CRC32s of the archive they came from
+    for map_info in updates_data.get('maps', []):
+        world_dir = os.path.join(minecraft_paths.get('saves', ""), map_info.get('name', ""))
+        index_path = get_checksum_index_path(world_dir)
+        if not os.path.isdir(world_dir) or not os.path.exists(index_path):
+            continue # Not installed by the launcher
+        map_id = map_info.get('id', map_info.get('name'))
+        installed_files = ChecksumIndex(index_path, world_dir).get_installed_files()
+        for relative_path, (size, crc) in installed_files.items():
+            local_path = safe_join(world_dir, relative_path)
+            if not local_path or not os.path.isfile(local_path):
+                _add_issue(issues, f"{KIND_MAP}:{map_id}", KIND_MAP, map_id, map_info['name'], map_info, relative_path, STATUS_MISSING)
+            elif os.path.getsize(local_path) != size:
+                _add_issue(issues, f"{KIND_MAP}:{map_id}", KIND_MAP, map_id, map_info['name'], map_info, relative_path, STATUS_CORRUPTED)
+            else:
+                checks.append((f"{KIND_MAP}:{map_id}", KIND_MAP, map_id, map_info['name'], map_info, relative_path, local_path, "crc32", crc))
+
+        # Its resource pack, against the published SHA-256
+        if map_info.get('resourcepack_url') and map_info.get('resourcepack_sha256') and minecraft_paths.get('resourcepacks'):
+            rp_name = os.path.basename(QUrl(map_info['resourcepack_url']).path())
+            rp_path = os.path.join(minecraft_paths['resourcepacks'], rp_name)
+            key = f"{KIND_RESOURCEPACK}:{map_id}"
+            if not os.path.isfile(rp_path):
+                _add_issue(issues, key, KIND_RESOURCEPACK, map_id, map_info['name'], map_info, rp_name, STATUS_MISSING)
+            else:
+                checks.append((key, KIND_RESOURCEPACK, map_id, map_info['name'], map_info, rp_name, rp_path, "sha256", map_info['resourcepack_sha256']))
+
+    # Hash everything at once so the thread pool stays busy across all content
+    try:
+        hashes = hash_index.hash_files([check[6] for check in checks], progress_callback)
+    finally:
+        hash_index.save()
+    for key, kind, item_id, name, info, relative_path, local_path, algorithm, expected in checks:
+        crc, sha256 = hashes[os.path.abspath(local_path)]
+        actual = crc if algorithm == "crc32" else sha256
+        if actual != (expected.lower() if isinstance(expected, str) else expected):
+            _add_issue(issues, key, kind, item_id, name, info, relative_path, STATUS_CORRUPTED)
+
+    print(f"DEBUG: Verification checked {len(checks)} files, problems: {[(key, len(issue['files'])) for key, issue in issues.items()]}")
+    return list(issues.values())
+
+
+class VerifyThread(QThread):
+    """Runs verify_installed_content off the GUI thread."""
+    verify_progress = pyqtSignal(int) # 0-100
+    verify_finished = pyqtSignal(list) # Issues
+    verify_error = pyqtSignal(str)
+
+    def __init__(self, updates_data, minecraft_paths, local_mod_version):
+        super().__init__()
+        self.updates_data = updates_data
+        self.minecraft_paths = dict(minecraft_paths)
+        self.local_mod_version = local_mod_version
+
+    def _on_progress(self, done, total):
+        self.verify_progress.emit(int(done * 100 / total) if total else 100)
+
+    def run(self):
+        try:
+            # Installed maps known only from the catalog index need their details (hashes, URLs)
+            updates_data = load_installed_map_details(self.updates_data, self.minecraft_paths.get('saves'))
+            self.verify_finished.emit(verify_installed_content(updates_data, self.minecraft_paths,
+                                                               self.local_mod_version, self._on_progress))
+        except Exception as e:
+            self.verify_error.emit(str(e))
@@ -1,20 +1,56 @@
-from PyQt6.QtWidgets import QLineEdit, QApplication, QMessageBox
+from PyQt6.QtWidgets import QLineEdit, QApplication, QMessageBox, QFrame, QLabel, QVBoxLayout
 from PyQt6.QtGui import QDragEnterEvent, QDropEvent, QDesktopServices
-from PyQt6.QtCore import Qt, QUrl
+from PyQt6.QtCore import Qt, QUrl, QTimer, QEvent, pyqtSignal
 
 import os
+from collections import deque
 
 class DragDropLineEdit(QLineEdit):
     """
     A QLineEdit subclass that supports drag and drop for a single file.
     When a file is dropped, its path is set as the line edit's text.
+    With allow_directories, a folder can be dropped as well.
+    A small status badge can be shown at its right end (see set_badge).
     """
-    def __init__(self, parent=None, allowed_extensions=None):
+    BADGE_COLORS = {
+        "pending": "#7F8C8D",
+        "ok": "#27AE60",
+        "error": "#C0392B"
+    }
+
+    def __init__(self, parent=None, allowed_extensions=None, allow_directories=False):
         super().__init__(parent)
         self.setReadOnly(True) # Make it read-only as content is set by drop
         self.setAcceptDrops(True)
         self.allowed_extensions = allowed_extensions if allowed_extensions is not None else []
+        self.allow_directories = allow_directories
         self.is_valid_drop = False # Flag to track if the current drag event is valid
+        self.badge = QLabel(self)
+        self.badge.hide()
+
+    def set_badge(self, text, state, tooltip=""):
+        """Shows a badge inside the field. state is a key of BADGE_COLORS."""
+        self.badge.setText(text)
+        self.badge.setToolTip(tooltip)
+        self.badge.setStyleSheet(f"background-color: {self.BADGE_COLORS.get(state, self.BADGE_COLORS['pending'])}; "
+                                 f"color: white; border-radius: 4px; padding: 0px 6px;")
+        self.badge.adjustSize()
+        self.badge.show()
+        self._place_badge()
+
+    def clear_badge(self):
+        self.badge.hide()
+        self.setTextMargins(0, 0, 0, 0)
+
+    def _place_badge(self):
+        if self.badge.isHidden():
+            return
+        self.badge.move(self.width() - self.badge.width() - 4, (self.height() - self.badge.height()) // 2)
+        self.setTextMargins(0, 0, self.badge.width() + 4, 0) # Keep the path from running under the badge
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._place_badge()
 
     def dragEnterEvent(self, event: QDragEnterEvent):
         """
@@ -27,7 +63,11 @@ class DragDropLineEdit(QLineEdit):
             if len(urls) == 1 and urls[0].isLocalFile():
                 file_path = urls[0].toLocalFile()
                 _, ext = os.path.splitext(file_path)
-                if not self.allowed_extensions or ext.lower() in [e.lower() for e in self.allowed_extensions]:
+                if os.path.isdir(file_path):
+                    is_allowed = self.allow_directories
+                else:
+                    is_allowed = not self.allowed_extensions or ext.lower() in [e.lower() for e in self.allowed_extensions]
+                if is_allowed:
                     event.acceptProposedAction()
                     self.is_valid_drop = True
                     # Optional: Change visual feedback for valid drop
@@ -55,3 +95,88 @@ class DragDropLineEdit(QLineEdit):
         else:
             event.ignore()
         self.setStyleSheet("") # Reset style after drop
+
+
+class ToastNotifier(QFrame):
+    """
+    Non-modal notification shown over the bottom-right corner of its parent window.
+    Messages are queued and displayed one after the other for a few seconds each, so
+    long-running work (downloads, installs) never waits for the user to click OK.
+    Clicking a notification dismisses it.
+    """
+    LEVEL_INFO = "info"
+    LEVEL_SUCCESS = "success"
+    LEVEL_WARNING = "warning"
+
+    DISPLAY_MS = 4000
+    BUSY_DISPLAY_MS = 1500 # Shorter display while other notifications are waiting
+    MARGIN = 16
+
+    notification_shown = pyqtSignal(str, str) # Title, message (e.g. to mirror it in a status bar)
+
+    LEVEL_COLORS = {
+        LEVEL_INFO: "#34495E",
+        LEVEL_SUCCESS: "#27AE60",
+        LEVEL_WARNING: "#D35400"
+    }
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.queue = deque()
+        self.setMaximumWidth(360)
+        self.setCursor(Qt.CursorShape.PointingHandCursor)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(12, 8, 12, 8)
+        self.title_label = QLabel(self)
+        self.title_label.setStyleSheet("font-weight: bold; color: white; background: transparent;")
+        layout.addWidget(self.title_label)
+        self.message_label = QLabel(self)
+        self.message_label.setWordWrap(True)
+        self.message_label.setStyleSheet("color: white; background: transparent;")
+        layout.addWidget(self.message_label)
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self._show_next)
+
+        parent.installEventFilter(self) # Follow the parent's size to stay in its corner
+        self.hide()
+
+    def notify(self, title, message, level=LEVEL_INFO):
+        """Queues a notification. It is shown right away if nothing else is displayed."""
+        print(f"DEBUG: Notification [{level}] {title}: {message}")
+        self.queue.append((title, message, level))
+        if not self.timer.isActive(): # Nothing displayed (isVisible is False while the window is minimized)
+            self._show_next()
+        elif self.timer.remainingTime() > self.BUSY_DISPLAY_MS:
+            self.timer.start(self.BUSY_DISPLAY_MS) # Let the queue move on faster
+
+    def _show_next(self):
+        if not self.queue:
+            self.hide()
+            return
+        title, message, level = self.queue.popleft()
+        self.title_label.setText(title)
+        self.message_label.setText(message)
+        self.setStyleSheet(f"ToastNotifier {{ background-color: {self.LEVEL_COLORS.get(level, self.LEVEL_COLORS[self.LEVEL_INFO])}; "
+                           f"border-radius: 6px; }}")
+        self.adjustSize()
+        self._reposition()
+        self.show()
+        self.raise_()
+        self.timer.start(self.BUSY_DISPLAY_MS if self.queue else self.DISPLAY_MS)
+        self.notification_shown.emit(title, message)
+
+    def _reposition(self):
+        parent = self.parentWidget()
+        self.move(parent.width() - self.width() - self.MARGIN, parent.height() - self.height() - self.MARGIN)
+
+    def eventFilter(self, watched, event):
+        if watched is self.parentWidget() and event.type() == QEvent.Type.Resize and self.timer.isActive():
+            self._reposition()
+        return super().eventFilter(watched, event)
+
+    def mousePressEvent(self, event):
+        self.timer.stop()
+        self._show_next()
@@ -0,0 +1,154 @@
+# ZombieRoolLauncher/main/world_library.py
+import os
+import json
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from main.constants import CACHE_DIR_PATH
+from main.incremental_install import get_checksum_index_path
+from main.nbt import NBTError
+from main.world_metadata import read_level_dat_metadata
+
+# Persistent index of the worlds found in the saves folders, so the library opens without walking them
+WORLD_LIBRARY_INDEX_PATH = os.path.join(CACHE_DIR_PATH, 'world_library.json')
+
+
+def get_directory_size(path):
+    """Total size in bytes of the files below a folder, walked with os.scandir (symlinks are not followed)."""
+    total = 0
+    pending = [path]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            total += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total
+
+
+def _get_world_signature(entry):
+    """
+    (folder mtime, level.dat mtime) of a world, or None if it has no level.dat.
+    The game rewrites level.dat on every save and the folder changes when files are added or
+    removed, so an unchanged signature means the indexed size and metadata are still right.
+    """
+    try:
+        level_dat_st = os.stat(os.path.join(entry.path, "level.dat"))
+        return [entry.stat().st_mtime_ns, level_dat_st.st_mtime_ns]
+    except OSError:
+        return None
+
+
+class WorldLibraryIndex:
+    """
+    Size and level.dat metadata of the local worlds, keyed by absolute folder path.
+    A scan only reads the worlds whose signature changed since the previous one.
+    """
+    FORMAT_VERSION = 1
+
+    def __init__(self, index_path=WORLD_LIBRARY_INDEX_PATH):
+        self.index_path = index_path
+        self.entries = {} # {absolute world path: {"signature", "size", "metadata"}}
+        if os.path.exists(index_path):
+            try:
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == self.FORMAT_VERSION:
+                    self.entries = data.get('entries', {})
+            except (json.JSONDecodeError, IOError) as e:
+                print(f"DEBUG: Ignoring unreadable world library index: {e}")
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            temp_path = f"{self.index_path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": self.FORMAT_VERSION, "entries": self.entries}, f, separators=(',', ':'))
+            os.replace(temp_path, self.index_path)
+        except IOError as e:
+            print(f"Error saving world library index: {e}")
+
+    def scan(self, saves_dir, catalog_maps=None):
+        """
+        Lists the worlds of a saves folder, newest played first:
+            {"folder", "path", "size", "level_name", "version_name", "data_version", "game_mode",
+             "last_played", "map_id": catalog id or None, "installed_by_launcher"}
+        Worlds are linked to the catalog map installed under the same folder name.
+        """
+        catalog_by_name = {map_info.get('name'): map_info for map_info in catalog_maps or [] if map_info.get('name')}
+        saves_dir = os.path.abspath(saves_dir)
+        worlds = []
+        seen = set()
+        rescanned = 0
+        try:
+            entries = [entry for entry in os.scandir(saves_dir) if entry.is_dir()]
+        except OSError as e:
+            print(f"DEBUG: Cannot list saves folder '{saves_dir}': {e}")
+            entries = []
+
+        for entry in entries:
+            signature = _get_world_signature(entry)
+            if signature is None:
+                continue # Not a world
+            seen.add(entry.path)
+            indexed = self.entries.get(entry.path)
+            if not indexed or indexed.get('signature') != signature:
+                rescanned += 1
+                try:
+                    with open(os.path.join(entry.path, "level.dat"), 'rb') as f:
+                        metadata = read_level_dat_metadata(f)
+                except (NBTError, OSError) as e:
+                    print(f"DEBUG: Could not read the level.dat of '{entry.path}': {e}")
+                    metadata = {}
+                indexed = {"signature": signature, "size": get_directory_size(entry.path), "metadata": metadata}
+                self.entries[entry.path] = indexed
+
+            metadata = indexed['metadata']
+            map_info = catalog_by_name.get(entry.name)
+            worlds.append({
+                "folder": entry.name,
+                "path": entry.path,
+                "size": indexed['size'],
+                "level_name": metadata.get('level_name'),
+                "version_name": metadata.get('version_name'),
+                "data_version": metadata.get('data_version'),
+                "game_mode": metadata.get('game_mode'),
+                "last_played": metadata.get('last_played'),
+                "map_id": map_info.get('id') if map_info else None,
+                "installed_by_launcher": os.path.exists(get_checksum_index_path(entry.path))
+            })
+
+        # Forget the worlds deleted from this saves folder
+        for path in [path for path in self.entries if os.path.dirname(path) == saves_dir and path not in seen]:
+            del self.entries[path]
+
+        worlds.sort(key=lambda world: world['last_played'] or 0, reverse=True)
+        print(f"DEBUG: World library: {len(worlds)} worlds in '{saves_dir}', {rescanned} rescanned.")
+        return worlds
+
+
+class WorldLibraryScanThread(QThread):
+    """Runs WorldLibraryIndex.scan off the GUI thread and saves the index."""
+    scan_finished = pyqtSignal(list) # Worlds
+    scan_error = pyqtSignal(str)
+
+    def __init__(self, saves_dir, catalog_maps=None):
+        super().__init__()
+        self.saves_dir = saves_dir
+        self.catalog_maps = list(catalog_maps or [])
+
+    def run(self):
+        try:
+            index = WorldLibraryIndex()
+            worlds = index.scan(self.saves_dir, self.catalog_maps)
+            index.save()
+            self.scan_finished.emit(worlds)
+        except Exception as e:
+            self.scan_error.emit(str(e))
@@ -0,0 +1,115 @@
+# ZombieRoolLauncher/main/world_metadata.py
+import os
+import zipfile
+
+from main.archive_formats import FORMAT_TAR_ZSTD, detect_archive_format, iter_archive_entries, open_zip_entry
+from main.incremental_install import get_archive_root_prefix
+from main.nbt import NBTError, read_nbt
+
+GAME_MODES = {0: "survival", 1: "creative", 2: "adventure", 3: "spectator"}
+
+# Keys of level.dat read by read_level_dat_metadata, everything else is skipped while streaming
+_LEVEL_DAT_KEYS = {
+    "Data": {
+        "DataVersion": True,
+        "Version": {"Name": True, "Id": True},
+        "LevelName": True,
+        "LastPlayed": True,
+        "SpawnX": True, "SpawnY": True, "SpawnZ": True,
+        "spawn": {"pos": True}, # 1.21.9+ stores the spawn point in a compound
+        "GameType": True,
+        "hardcore": True,
+        "allowCommands": True,
+        "WorldGenSettings": {"seed": True},
+        "RandomSeed": True # Before 1.16
+    }
+}
+
+
+def read_level_dat_metadata(fileobj):
+    """
+    Streams a level.dat (gzip NBT) and returns the world metadata published with a map:
+        {"data_version", "version_name", "level_name", "spawn": [x, y, z], "game_mode", "hardcore", "cheats", "seed",
+         "last_played": epoch milliseconds}
+    Missing values are None. Raises NBTError if the file is not valid NBT.
+    """
+    data = read_nbt(fileobj, _LEVEL_DAT_KEYS).get("Data")
+    if data is None:
+        raise NBTError("level.dat has no 'Data' compound")
+
+    spawn = None
+    if all(isinstance(data.get(key), int) for key in ("SpawnX", "SpawnY", "SpawnZ")):
+        spawn = [data["SpawnX"], data["SpawnY"], data["SpawnZ"]]
+    elif isinstance(data.get("spawn", {}).get("pos"), list) and len(data["spawn"]["pos"]) == 3:
+        spawn = list(data["spawn"]["pos"])
+
+    seed = data.get("WorldGenSettings", {}).get("seed", data.get("RandomSeed"))
+    return {
+        "data_version": data.get("DataVersion"),
+        "version_name": data.get("Version", {}).get("Name"),
+        "level_name": data.get("LevelName"),
+        "spawn": spawn,
+        "game_mode": GAME_MODES.get(data.get("GameType")),
+        "hardcore": bool(data["hardcore"]) if "hardcore" in data else None,
+        "cheats": bool(data["allowCommands"]) if "allowCommands" in data else None,
+        # JSON readers that parse numbers as doubles would round a 64-bit seed
+        "seed": str(seed) if seed is not None else None,
+        "last_played": data.get("LastPlayed")
+    }
+
+
+def read_map_metadata(path):
+    """
+    Reads the world metadata from the level.dat of a map archive (ZIP or .tar.zst) without
+    extracting it. For ZIPs the entry is located through the central directory and only
+    level.dat is decompressed. A world folder is read directly.
+    Returns the metadata dict, or None if there is no level.dat.
+    """
+    if os.path.isdir(path):
+        level_dat = os.path.join(path, "level.dat")
+        if not os.path.isfile(level_dat):
+            return None
+        with open(level_dat, 'rb') as f:
+            return read_level_dat_metadata(f)
+    if detect_archive_format(path) == FORMAT_TAR_ZSTD:
+        for entry in iter_archive_entries(path, FORMAT_TAR_ZSTD):
+            name = entry.name.replace('\\', '/').lstrip('/')
+            if name == "level.dat" or (name.count('/') == 1 and name.endswith("/level.dat")):
+                with entry.open() as source:
+                    return read_level_dat_metadata(source)
+        return None
+
+    with zipfile.ZipFile(path, 'r') as zip_ref:
+        infos = {info.filename: info for info in zip_ref.infolist()}
+        info = infos.get(f"{get_archive_root_prefix(infos)}level.dat")
+        if info is None:
+            return None
+        with open_zip_entry(zip_ref, info) as source:
+            return read_level_dat_metadata(source)
+
+
+def get_instance_game_version(saves_dir):
+    """
+    Returns (data version, version name) of the newest game version that saved a world of an
+    instance, or (None, None) if no world tells it. A map saved by a newer version than
+    this is unlikely to load there.
+    """
+    newest = (None, None)
+    try:
+        entries = list(os.scandir(saves_dir))
+    except OSError:
+        return newest
+    for entry in entries:
+        level_dat = os.path.join(entry.path, "level.dat")
+        if not entry.is_dir() or not os.path.isfile(level_dat):
+            continue
+        try:
+            with open(level_dat, 'rb') as f:
+                metadata = read_level_dat_metadata(f)
+        except (NBTError, OSError) as e:
+            print(f"DEBUG: Could not read '{level_dat}': {e}")
+            continue
+        data_version = metadata.get("data_version")
+        if isinstance(data_version, int) and (newest[0] is None or data_version > newest[0]):
+            newest = (data_version, metadata.get("version_name"))
+    return newest
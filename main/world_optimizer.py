@@ -0,0 +1,333 @@
+# ZombieRoolLauncher/main/world_optimizer.py
+import io
+import os
+import re
+import gzip
+import zlib
+import shutil
+import struct
+import zipfile
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from main.archive_formats import CHUNK_SIZE, open_zip_entry
+from main.nbt import NBTError, read_nbt
+from main.incremental_install import get_archive_root_prefix
+
+REGION_SECTOR_SIZE = 4096
+REGION_CHUNKS = 1024
+MAX_CHUNK_SECTORS = 255 # Larger chunks are stored by the game in external .mcc files
+
+# Chunk compression types of the region format
+COMPRESSION_GZIP = 1
+COMPRESSION_ZLIB = 2
+COMPRESSION_NONE = 3
+COMPRESSION_EXTERNAL_FLAG = 0x80 # Data stored in a c.X.Z.mcc file next to the region
+
+# Region folders of a dimension: terrain first, entities and points of interest refer to it
+TERRAIN_FOLDER = "region"
+LINKED_FOLDERS = ("entities", "poi")
+
+REGION_ENTRY_PATTERN = re.compile(r'^(?P<dimension>(?:.*/)?)(?P<folder>region|entities|poi)/r\.(?P<x>-?\d+)\.(?P<z>-?\d+)\.mca$')
+# Nether, End and datapack dimensions (the overworld lives at the root of the world)
+OTHER_DIMENSION_PATTERN = re.compile(r'^(DIM-1|DIM1|dimensions)/')
+
+# Generation steps of a chunk that was never finished: the game generates it again from scratch
+INCOMPLETE_CHUNK_STATUSES = {
+    "empty", "structure_starts", "structure_references", "biomes", "noise", "surface",
+    "carvers", "liquid_carvers", "features", "initialize_light", "light", "spawn", "heightmaps"
+}
+AIR_BLOCKS = {"minecraft:air", "minecraft:cave_air", "minecraft:void_air"}
+
+# Only the parts of a chunk needed to tell whether it is empty are decoded
+_CHUNK_KEYS = {
+    "Status": True, "sections": True, "block_entities": True,
+    "Level": {"Status": True, "Sections": True, "TileEntities": True, "Entities": True} # Before 1.18
+}
+
+
+def _section_is_air(section):
+    block_states = section.get("block_states")
+    if block_states is not None: # 1.18+
+        return all(block.get("Name") in AIR_BLOCKS for block in block_states.get("palette", []))
+    if "Palette" in section: # 1.13 - 1.17
+        return all(block.get("Name") in AIR_BLOCKS for block in section["Palette"])
+    if "Blocks" in section: # Before 1.13, numeric ids (0 is air)
+        return not any(section["Blocks"])
+    return True # Light data only
+
+
+def _is_incomplete(chunk):
+    level = chunk.get("Level", chunk)
+    status = chunk.get("Status") or level.get("Status") or ""
+    return status.removeprefix("minecraft:") in INCOMPLETE_CHUNK_STATUSES
+
+
+def is_chunk_empty(chunk):
+    """
+    True if a decoded chunk can be dropped: its generation was never completed, or it
+    holds nothing but air, with no block entity nor entity.
+    """
+    if _is_incomplete(chunk):
+        return True
+    level = chunk.get("Level", chunk)
+    if chunk.get("block_entities") or level.get("TileEntities") or level.get("Entities"):
+        return False
+    sections = chunk.get("sections", level.get("Sections", []))
+    return all(_section_is_air(section) for section in sections)
+
+
+def decompress_chunk(compression, data):
+    """Decompresses the data of a stored chunk, or returns None for compressions left untouched."""
+    if compression == COMPRESSION_GZIP:
+        return gzip.decompress(data)
+    if compression == COMPRESSION_ZLIB:
+        return zlib.decompress(data)
+    if compression == COMPRESSION_NONE:
+        return data
+    return None # LZ4 or custom compression: left untouched
+
+
+def _chunk_in_box(chunk_x, chunk_z, chunk_box):
+    if chunk_box is None:
+        return True
+    min_x, min_z, max_x, max_z = chunk_box
+    return min_x <= chunk_x <= max_x and min_z <= chunk_z <= max_z
+
+
+def iter_chunk_records(region_bytes):
+    """Yields (index, timestamp, compression type, stored record) for the chunks of a region file."""
+    if len(region_bytes) < 2 * REGION_SECTOR_SIZE:
+        return
+    for index in range(REGION_CHUNKS):
+        location = struct.unpack_from('>I', region_bytes, index * 4)[0]
+        if location == 0:
+            continue
+        offset = (location >> 8) * REGION_SECTOR_SIZE
+        if offset + 5 > len(region_bytes):
+            yield index, 0, None, None # Points outside of the file: the game would not load it either
+            continue
+        length, compression = struct.unpack_from('>IB', region_bytes, offset)
+        timestamp = struct.unpack_from('>I', region_bytes, REGION_SECTOR_SIZE + index * 4)[0]
+        yield index, timestamp, compression, region_bytes[offset:offset + 4 + length]
+
+
+def _decode_chunk(compression, record, wanted):
+    """Returns the selected keys of a stored chunk, or None if it cannot be decoded."""
+    if compression & COMPRESSION_EXTERNAL_FLAG:
+        return None
+    try:
+        data = decompress_chunk(compression, record[5:])
+        return read_nbt(io.BytesIO(data), wanted) if data is not None else None
+    except (zlib.error, OSError, EOFError, NBTError) as e:
+        print(f"DEBUG: Could not decode a chunk: {e}")
+        return None
+
+
+def find_chunks_with_entities(region_bytes):
+    """
+    Returns the indices of the chunks of an entities region file that hold at least one
+    entity (chunks that cannot be decoded are assumed to hold some).
+    """
+    indices = []
+    for index, _, compression, record in iter_chunk_records(region_bytes):
+        if record is None:
+            continue
+        chunk = _decode_chunk(compression, record, {"Entities": True})
+        if chunk is None or chunk.get("Entities"):
+            indices.append(index)
+    return indices
+
+
+def optimize_region(region_bytes, region_x, region_z, chunk_box=None, kept_chunks=None, check_empty=True, protected_chunks=()):
+    """
+    Rewrites a region (.mca) file: chunks outside chunk_box (min x, min z, max x, max z in
+    chunk coordinates), not in kept_chunks (set of chunk indices) or empty are dropped, the
+    others are recompressed with zlib at the highest level and packed without gaps.
+    Air-only chunks listed in protected_chunks (they hold entities) are kept.
+    Returns (new region bytes or None if no chunk is left, [indices of the kept chunks], chunks removed).
+    """
+    records = []
+    removed = 0
+    for index, timestamp, compression, raw_record in iter_chunk_records(region_bytes):
+        chunk_x, chunk_z = region_x * 32 + index % 32, region_z * 32 + index // 32
+        if (raw_record is None or not _chunk_in_box(chunk_x, chunk_z, chunk_box)
+                or (kept_chunks is not None and index not in kept_chunks)):
+            removed += 1
+            continue
+        if compression & COMPRESSION_EXTERNAL_FLAG:
+            records.append((index, timestamp, raw_record)) # The data lives in a .mcc file
+            continue
+
+        try:
+            data = decompress_chunk(compression, raw_record[5:])
+        except (zlib.error, OSError, EOFError) as e:
+            print(f"DEBUG: Keeping unreadable chunk {index} of r.{region_x}.{region_z}.mca as is: {e}")
+            data = None
+        if data is None:
+            records.append((index, timestamp, raw_record)) # Unknown compression (LZ4...) or unreadable
+            continue
+        if check_empty:
+            try:
+                chunk = read_nbt(io.BytesIO(data), _CHUNK_KEYS)
+                if is_chunk_empty(chunk) and (index not in protected_chunks or _is_incomplete(chunk)):
+                    removed += 1
+                    continue
+            except NBTError as e:
+                print(f"DEBUG: Keeping chunk {index} of r.{region_x}.{region_z}.mca that could not be decoded: {e}")
+        compressed = zlib.compress(data, 9)
+        record = struct.pack('>IB', len(compressed) + 1, COMPRESSION_ZLIB) + compressed
+        records.append((index, timestamp, record if len(record) <= len(raw_record) else raw_record))
+
+    if not records:
+        return None, [], removed
+
+    locations = bytearray(REGION_SECTOR_SIZE)
+    timestamps = bytearray(REGION_SECTOR_SIZE)
+    body = bytearray()
+    sector = 2
+    for index, timestamp, record in records:
+        sector_count = -(-len(record) // REGION_SECTOR_SIZE)
+        if sector_count > MAX_CHUNK_SECTORS:
+            raise ValueError(f"chunk {index} of r.{region_x}.{region_z}.mca is too large for a region file")
+        struct.pack_into('>I', locations, index * 4, (sector << 8) | sector_count)
+        struct.pack_into('>I', timestamps, index * 4, timestamp)
+        body += record
+        body += bytes(sector_count * REGION_SECTOR_SIZE - len(record))
+        sector += sector_count
+    return bytes(locations + timestamps + body), [index for index, _, _ in records], removed
+
+
+def read_region_entry(source_zip_path, entry_name):
+    """Reads a whole region file out of a map ZIP (or a world folder)."""
+    if os.path.isdir(source_zip_path):
+        with open(os.path.join(source_zip_path, entry_name), 'rb') as f:
+            return f.read()
+    with zipfile.ZipFile(source_zip_path, 'r') as zip_ref:
+        with open_zip_entry(zip_ref, zip_ref.getinfo(entry_name)) as source:
+            return source.read()
+
+
+def _scan_entities_entry(source_zip_path, entry_name):
+    """Process pool task: indices of the chunks holding entities in one entities region of the archive."""
+    return find_chunks_with_entities(read_region_entry(source_zip_path, entry_name))
+
+
+def _optimize_region_entry(source_zip_path, entry_name, output_path, region_x, region_z, chunk_box, kept_chunks,
+                           check_empty, protected_chunks):
+    """Process pool task: optimizes one region file of the archive into output_path."""
+    region_bytes = read_region_entry(source_zip_path, entry_name)
+    optimized, kept, removed = optimize_region(region_bytes, region_x, region_z, chunk_box,
+                                               set(kept_chunks) if kept_chunks is not None else None,
+                                               check_empty, set(protected_chunks))
+    if optimized is not None:
+        with open(output_path, 'wb') as f:
+            f.write(optimized)
+    return {"kept": kept, "removed": removed}
+
+
+def get_chunk_box(bounding_box):
+    """Converts a (min x, min z, max x, max z) box in block coordinates to chunk coordinates."""
+    if bounding_box is None:
+        return None
+    x1, z1, x2, z2 = bounding_box
+    return (min(x1, x2) // 16, min(z1, z2) // 16, max(x1, x2) // 16, max(z1, z2) // 16)
+
+
+def optimize_map_archive(source_zip_path, destination_zip_path, bounding_box=None, drop_other_dimensions=False,
+                         progress_callback=None, max_workers=None):
+    """
+    Writes an optimized copy of a map ZIP:
+    - empty chunks (never fully generated, or only air without entities) are removed from
+      the region files, as well as the chunks outside bounding_box (block coordinates, overworld only);
+    - entity and POI chunks whose terrain chunk is gone are removed;
+    - the Nether, the End and datapack dimensions are dropped with drop_other_dimensions;
+    - the remaining chunks are recompressed with zlib at the highest level.
+    Region files are processed in parallel on a process pool; other files are copied as they are.
+    progress_callback(done, total) is called as region files complete.
+    Returns statistics: chunks_removed, regions_removed, size_before, size_after (archive sizes).
+    """
+    chunk_box = get_chunk_box(bounding_box)
+    work_dir = tempfile.mkdtemp(prefix="zrl_optimize_")
+    stats = {"chunks_removed": 0, "regions_removed": 0, "size_before": os.path.getsize(source_zip_path)}
+    try:
+        with zipfile.ZipFile(source_zip_path, 'r') as source_zip:
+            infos = source_zip.infolist()
+            root_prefix = get_archive_root_prefix(info.filename for info in infos)
+
+            skipped = set()
+            regions = {} # Entry name -> (dimension, folder, region x, region z)
+            for info in infos:
+                relative_name = info.filename[len(root_prefix):]
+                if drop_other_dimensions and OTHER_DIMENSION_PATTERN.match(relative_name):
+                    skipped.add(info.filename)
+                    continue
+                match = REGION_ENTRY_PATTERN.match(relative_name)
+                if match and not info.is_dir():
+                    if info.file_size == 0:
+                        skipped.add(info.filename) # Empty region files are left behind by the game
+                        stats["regions_removed"] += 1
+                        continue
+                    regions[info.filename] = (match['dimension'], match['folder'], int(match['x']), int(match['z']))
+
+            outputs = {}
+            done = 0
+            context = multiprocessing.get_context("spawn") # The GUI process runs threads: do not fork it
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+                # 1. Chunks holding entities (stored apart since 1.17) are never dropped as empty
+                entity_futures = {name: executor.submit(_scan_entities_entry, source_zip_path, name)
+                                  for name, (_, folder, _, _) in regions.items() if folder == "entities"}
+                chunks_with_entities = {}
+                for name, future in entity_futures.items():
+                    dimension, _, region_x, region_z = regions[name]
+                    chunks_with_entities[(dimension, region_x, region_z)] = future.result()
+
+                # 2. Terrain, then 3. entities and POI, which only keep the chunks whose terrain was kept
+                kept_terrain = {}
+                for phase_folders in ((TERRAIN_FOLDER,), LINKED_FOLDERS):
+                    futures = {}
+                    for name, (dimension, folder, region_x, region_z) in regions.items():
+                        if folder not in phase_folders:
+                            continue
+                        region_key = (dimension, region_x, region_z)
+                        is_terrain = folder == TERRAIN_FOLDER
+                        outputs[name] = os.path.join(work_dir, f"{len(outputs)}.mca")
+                        futures[name] = executor.submit(
+                            _optimize_region_entry, source_zip_path, name, outputs[name], region_x, region_z,
+                            chunk_box if not dimension else None, # The box only applies to the overworld
+                            None if is_terrain else kept_terrain.get(region_key, []),
+                            is_terrain, chunks_with_entities.get(region_key, []) if is_terrain else [])
+                    for name, future in futures.items():
+                        result = future.result()
+                        dimension, folder, region_x, region_z = regions[name]
+                        if folder == TERRAIN_FOLDER:
+                            kept_terrain[(dimension, region_x, region_z)] = result["kept"]
+                        stats["chunks_removed"] += result["removed"]
+                        if not result["kept"]:
+                            skipped.add(name)
+                            stats["regions_removed"] += 1
+                        done += 1
+                        if progress_callback:
+                            progress_callback(done, len(regions))
+
+            with zipfile.ZipFile(destination_zip_path, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=9) as output_zip:
+                for info in infos:
+                    if info.filename in skipped:
+                        continue
+                    output_info = zipfile.ZipInfo(info.filename, info.date_time)
+                    output_info.external_attr = info.external_attr
+                    output_info.compress_type = zipfile.ZIP_DEFLATED
+                    if info.is_dir():
+                        output_zip.writestr(output_info, b"")
+                        continue
+                    # Optimized region files come from the work folder, everything else from the source archive
+                    source = open(outputs[info.filename], 'rb') if info.filename in outputs else open_zip_entry(source_zip, info)
+                    with source, output_zip.open(output_info, 'w') as target:
+                        shutil.copyfileobj(source, target, CHUNK_SIZE)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    stats["size_after"] = os.path.getsize(destination_zip_path)
+    print(f"DEBUG: World optimized: {stats}")
+    return stats
@@ -0,0 +1,304 @@
+# ZombieRoolLauncher/main/world_packer.py
+import os
+import io
+import time
+import zlib
+import struct
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from main.archive_formats import CHUNK_SIZE
+from main.nbt import NBTError
+from main.world_metadata import read_level_dat_metadata
+
+# Never published: per-player progress, logs and files the game keeps open or rewrites
+DEFAULT_EXCLUDED_FOLDERS = ("playerdata", "stats", "advancements", "logs")
+DEFAULT_EXCLUDED_FILES = ("session.lock", "level.dat_old")
+DEFAULT_EXCLUDED_EXTENSIONS = (".log", ".zrl-part")
+
+REGION_BLOCKS = 512 # Width of a region in blocks
+OVERWORLD_REGION_FOLDERS = ("region", "entities", "poi")
+
+# Compressed data of small entries is kept from the sizing pass so it is not compressed twice
+CACHE_ENTRY_MAX_SIZE = 1024 * 1024
+CACHE_MAX_SIZE = 64 * 1024 * 1024
+
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+ZIP64_LIMIT = 0xFFFFFFFF
+ZIP_UTF8_FLAG = 0x800
+
+
+class WorldChangedError(Exception):
+    """Raised when a world file changes while its archive is being streamed."""
+
+
+def is_excluded(relative_path):
+    """True if a file of the world (path relative to the world folder, '/' separated) is left out."""
+    parts = relative_path.split('/')
+    if parts[0] in DEFAULT_EXCLUDED_FOLDERS and len(parts) > 1:
+        return True
+    name = parts[-1]
+    return name in DEFAULT_EXCLUDED_FILES or name.lower().endswith(DEFAULT_EXCLUDED_EXTENSIONS)
+
+
+def _dos_date_time(mtime):
+    t = time.localtime(max(mtime, 315532800)) # ZIP dates start in 1980
+    return ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday, (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+
+
+def _compress_file(path, level):
+    """Returns (crc32, compressed data) of a file with raw deflate, as stored in a ZIP."""
+    crc = 0
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    output = io.BytesIO()
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(CHUNK_SIZE)
+            if not block:
+                break
+            crc = zlib.crc32(block, crc)
+            output.write(compressor.compress(block))
+    output.write(compressor.flush())
+    return crc & 0xFFFFFFFF, output.getvalue()
+
+
+class _PackEntry:
+    def __init__(self, arcname, path, st):
+        self.arcname = arcname
+        self.path = path
+        self.size = st.st_size
+        self.mtime_ns = st.st_mtime_ns
+        self.date, self.time = _dos_date_time(st.st_mtime)
+        self.crc = 0
+        self.method = ZIP_DEFLATED
+        self.compressed_size = 0
+        self.cached_data = None
+        self.offset = 0
+
+    def local_header(self):
+        name = self.arcname.encode('utf-8')
+        zip64 = self.size >= ZIP64_LIMIT or self.compressed_size >= ZIP64_LIMIT
+        extra = struct.pack('<HHQQ', 1, 16, self.size, self.compressed_size) if zip64 else b""
+        return struct.pack('<IHHHHHIIIHH', 0x04034b50, 45 if zip64 else 20, ZIP_UTF8_FLAG, self.method, self.time, self.date,
+                           self.crc, ZIP64_LIMIT if zip64 else self.compressed_size, ZIP64_LIMIT if zip64 else self.size,
+                           len(name), len(extra)) + name + extra
+
+    def central_header(self):
+        name = self.arcname.encode('utf-8')
+        zip64_values = [value for value in (self.size, self.compressed_size, self.offset) if value >= ZIP64_LIMIT]
+        # ZIP64 extra fields list the overflowing values in this fixed order
+        extra = struct.pack('<HH', 1, 8 * len(zip64_values)) + struct.pack(f'<{len(zip64_values)}Q', *zip64_values) if zip64_values else b""
+        version = 45 if zip64_values else 20
+        return struct.pack('<IHHHHHHIIIHHHHHII', 0x02014b50, (3 << 8) | version, version, ZIP_UTF8_FLAG, self.method,
+                           self.time, self.date, self.crc, min(self.compressed_size, ZIP64_LIMIT), min(self.size, ZIP64_LIMIT),
+                           len(name), len(extra), 0, 0, 0, (0o100644 << 16), min(self.offset, ZIP64_LIMIT)) + name + extra
+
+
+class WorldPacker:
+    """
+    Packs a world folder into a ZIP that can be streamed straight into an upload.
+    Entries are compressed in parallel threads (zlib releases the GIL). A first pass
+    compresses everything once to learn the exact archive size, which an HTTP upload needs
+    up front; the stream then compresses the entries again, a few ahead of the reader,
+    so no full temporary copy of the archive is ever written. Compression is deterministic,
+    and files changed in between are detected.
+    level.dat comes first, then the overworld regions closest to the spawn point.
+    """
+    def __init__(self, world_dir, level=6, max_workers=None):
+        self.world_dir = os.path.abspath(world_dir)
+        self.root_name = os.path.basename(os.path.normpath(world_dir))
+        self.level = level
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self.entries = self._collect_entries()
+        self.total_size = None
+
+    def _get_spawn_region(self):
+        try:
+            with open(os.path.join(self.world_dir, "level.dat"), 'rb') as f:
+                spawn = read_level_dat_metadata(f).get("spawn")
+        except (NBTError, OSError) as e:
+            print(f"DEBUG: Could not read the spawn point of '{self.world_dir}': {e}")
+            spawn = None
+        if not spawn:
+            return 0, 0
+        return spawn[0] // REGION_BLOCKS, spawn[2] // REGION_BLOCKS
+
+    def _collect_entries(self):
+        spawn_x, spawn_z = self._get_spawn_region()
+
+        def sort_key(relative_path):
+            if relative_path == "level.dat":
+                return (0, 0, relative_path)
+            parts = relative_path.split('/')
+            if len(parts) == 2 and parts[0] in OVERWORLD_REGION_FOLDERS and parts[1].startswith("r.") and parts[1].endswith(".mca"):
+                try:
+                    region_x, region_z = (int(value) for value in parts[1][2:-4].split('.'))
+                    return (1, max(abs(region_x - spawn_x), abs(region_z - spawn_z)), relative_path)
+                except ValueError:
+                    pass
+            return (2, 0, relative_path)
+
+        found = []
+        for root, folders, files in os.walk(self.world_dir):
+            folders.sort()
+            for filename in files:
+                path = os.path.join(root, filename)
+                relative_path = os.path.relpath(path, self.world_dir).replace(os.sep, '/')
+                if not is_excluded(relative_path) and os.path.isfile(path):
+                    found.append(relative_path)
+        entries = []
+        for relative_path in sorted(found, key=sort_key):
+            path = os.path.join(self.world_dir, relative_path)
+            entries.append(_PackEntry(f"{self.root_name}/{relative_path}", path, os.stat(path)))
+        return entries
+
+    def _check_unchanged(self, entry):
+        st = os.stat(entry.path)
+        if st.st_size != entry.size or st.st_mtime_ns != entry.mtime_ns:
+            raise WorldChangedError(f"'{entry.arcname}' changed while the world was being packed. Close the game and try again.")
+
+    def _compress_entry(self, entry):
+        """Compresses an entry, checking the file did not change since it was listed."""
+        self._check_unchanged(entry)
+        return _compress_file(entry.path, self.level)
+
+    def compute_size(self, progress_callback=None):
+        """
+        First pass: compresses every entry in parallel to know the exact archive size.
+        Entries that do not shrink are stored. progress_callback(done, total). Returns the size in bytes.
+        """
+        cache_budget = CACHE_MAX_SIZE
+        offset = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for done, (entry, (crc, data)) in enumerate(zip(self.entries, self._map_bounded(executor, self.entries)), 1):
+                entry.crc = crc
+                if len(data) < entry.size:
+                    entry.method, entry.compressed_size = ZIP_DEFLATED, len(data)
+                else:
+                    entry.method, entry.compressed_size = ZIP_STORED, entry.size
+                    data = None
+                if data is not None and len(data) <= CACHE_ENTRY_MAX_SIZE and len(data) <= cache_budget:
+                    entry.cached_data = data
+                    cache_budget -= len(data)
+                entry.offset = offset
+                offset += len(entry.local_header()) + entry.compressed_size
+                if progress_callback:
+                    progress_callback(done, len(self.entries))
+        central_directory_size = sum(len(entry.central_header()) for entry in self.entries)
+        self.total_size = offset + central_directory_size + len(self._end_records(offset, central_directory_size))
+        print(f"DEBUG: World '{self.root_name}' packs into {len(self.entries)} entries, {self.total_size} bytes.")
+        return self.total_size
+
+    def _map_bounded(self, executor, entries):
+        """Like executor.map, but keeps only a few entries in flight so memory stays bounded."""
+        pending = deque()
+        entries = iter(entries)
+        for entry in entries:
+            pending.append(executor.submit(self._compress_entry, entry))
+            if len(pending) >= self.max_workers * 2:
+                break
+        for entry in entries:
+            yield pending.popleft().result()
+            pending.append(executor.submit(self._compress_entry, entry))
+        while pending:
+            yield pending.popleft().result()
+
+    def _end_records(self, central_directory_offset, central_directory_size):
+        count = len(self.entries)
+        records = b""
+        if count >= 0xFFFF or central_directory_offset >= ZIP64_LIMIT or central_directory_size >= ZIP64_LIMIT:
+            zip64_end_offset = central_directory_offset + central_directory_size
+            records += struct.pack('<IQHHIIQQQQ', 0x06064b50, 44, 45, 45, 0, 0, count, count,
+                                   central_directory_size, central_directory_offset)
+            records += struct.pack('<IIQI', 0x07064b50, 0, zip64_end_offset, 1)
+        records += struct.pack('<IHHHHIIH', 0x06054b50, 0, 0, min(count, 0xFFFF), min(count, 0xFFFF),
+                               min(central_directory_size, ZIP64_LIMIT), min(central_directory_offset, ZIP64_LIMIT), 0)
+        return records
+
+    def iter_archive(self):
+        """Second pass: yields the bytes of the archive, compressing entries in parallel ahead of the reader."""
+        if self.total_size is None:
+            self.compute_size()
+        to_compress = [entry for entry in self.entries if entry.method == ZIP_DEFLATED and entry.cached_data is None]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            compressed = self._map_bounded(executor, to_compress)
+            for entry in self.entries:
+                self._check_unchanged(entry)
+                yield entry.local_header()
+                if entry.method == ZIP_STORED:
+                    with open(entry.path, 'rb') as f:
+                        written = 0
+                        while True:
+                            block = f.read(CHUNK_SIZE)
+                            if not block:
+                                break
+                            written += len(block)
+                            yield block
+                    if written != entry.size:
+                        raise WorldChangedError(f"'{entry.arcname}' changed while the world was being packed. Close the game and try again.")
+                elif entry.cached_data is not None:
+                    yield entry.cached_data
+                else:
+                    crc, data = next(compressed)
+                    if crc != entry.crc or len(data) != entry.compressed_size:
+                        raise WorldChangedError(f"'{entry.arcname}' changed while the world was being packed. Close the game and try again.")
+                    yield data
+        central_directory = b"".join(entry.central_header() for entry in self.entries)
+        central_directory_offset = sum(len(entry.local_header()) + entry.compressed_size for entry in self.entries)
+        yield central_directory
+        yield self._end_records(central_directory_offset, len(central_directory))
+
+    def open_stream(self, progress_callback=None):
+        """File-like object reading the archive (see ArchiveStream), for streamed uploads."""
+        if self.total_size is None:
+            self.compute_size()
+        return ArchiveStream(self.iter_archive(), self.total_size, progress_callback)
+
+    def write_to(self, path, progress_callback=None):
+        """Writes the archive to a file."""
+        with self.open_stream(progress_callback) as source, open(path, 'wb') as target:
+            while True:
+                block = source.read(CHUNK_SIZE)
+                if not block:
+                    break
+                target.write(block)
+
+
+class ArchiveStream(io.RawIOBase):
+    """
+    Read-only stream over the chunks of a generated archive. Its length is known, so HTTP
+    clients send it with a Content-Length. progress_callback(bytes read, total) follows the reads.
+    """
+    def __init__(self, chunks, size, progress_callback=None):
+        super().__init__()
+        self.chunks = chunks
+        self.size = size
+        self.position = 0
+        self.buffer = memoryview(b"")
+        self.progress_callback = progress_callback
+
+    def __len__(self):
+        return self.size
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not len(self.buffer):
+            try:
+                self.buffer = memoryview(next(self.chunks))
+            except StopIteration:
+                return 0
+        size = min(len(buffer), len(self.buffer))
+        buffer[:size] = self.buffer[:size]
+        self.buffer = self.buffer[size:]
+        self.position += size
+        if self.progress_callback:
+            self.progress_callback(self.position, self.size)
+        return size
+
+    def close(self):
+        if not self.closed:
+            self.chunks.close() # Stops the compression threads if the upload is aborted
+        super().close()
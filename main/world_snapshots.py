@@ -0,0 +1,286 @@
+# ZombieRoolLauncher/main/world_snapshots.py
+import os
+import json
+import time
+import uuid
+import hashlib
+import threading
+from contextlib import contextmanager
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from main.constants import CACHE_DIR_PATH
+from main.archive_formats import CHUNK_SIZE
+from main.incremental_install import safe_join, remove_empty_parents
+from main.multi_instance import link_or_copy
+
+# Content-addressed store: every distinct file is kept once, whatever the number of snapshots
+SNAPSHOT_DIR = os.path.join(CACHE_DIR_PATH, 'snapshots')
+SNAPSHOT_OBJECTS_DIR = os.path.join(SNAPSHOT_DIR, 'objects')
+SNAPSHOT_WORLDS_DIR = os.path.join(SNAPSHOT_DIR, 'worlds')
+SNAPSHOT_LOCK_PATH = os.path.join(SNAPSHOT_DIR, 'store.lock')
+
+DEFAULT_SNAPSHOT_RETENTION = 3 # Snapshots kept per world
+
+# Files never saved nor restored (held open by the game while the world is running)
+SNAPSHOT_EXCLUDED_FILES = ("session.lock",)
+
+
+# The objects a snapshot stores are only referenced once its manifest is written: a cleanup running
+# meanwhile (another install thread, another launcher) would delete them. Snapshot creation and
+# cleanups hold the store, threads through this lock and processes through SNAPSHOT_LOCK_PATH.
+_store_lock = threading.RLock()
+_store_lock_depth = 0 # Nested holds of the thread owning _store_lock (the lock file is taken once)
+
+
+def _lock_file(f, lock):
+    if os.name == 'nt':
+        import msvcrt
+        f.seek(0)
+        if not lock:
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            return
+        while True:
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1) # Gives up after 10 seconds: wait again
+                return
+            except OSError:
+                continue
+    else:
+        import fcntl
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX if lock else fcntl.LOCK_UN)
+
+
+@contextmanager
+def _locked_store():
+    global _store_lock_depth
+    with _store_lock:
+        if _store_lock_depth:
+            _store_lock_depth += 1
+            try:
+                yield
+            finally:
+                _store_lock_depth -= 1
+            return
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        with open(SNAPSHOT_LOCK_PATH, 'a+b') as lock_file:
+            _lock_file(lock_file, True)
+            _store_lock_depth = 1
+            try:
+                yield
+            finally:
+                _store_lock_depth = 0
+                _lock_file(lock_file, False)
+
+
+def _world_key(world_dir):
+    return hashlib.sha1(os.path.normcase(os.path.abspath(world_dir)).encode('utf-8')).hexdigest()[:16]
+
+
+def _object_path(sha256):
+    return os.path.join(SNAPSHOT_OBJECTS_DIR, sha256[:2], sha256)
+
+
+def compute_file_sha256(path):
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(CHUNK_SIZE)
+            if not block:
+                break
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
+def _iter_world_files(world_dir):
+    """Yields (relative path, absolute path) of every file of a world, except the excluded ones."""
+    for root, _, files in os.walk(world_dir):
+        for filename in files:
+            if filename in SNAPSHOT_EXCLUDED_FILES or filename.endswith(".zrl-part"):
+                continue
+            path = os.path.join(root, filename)
+            yield os.path.relpath(path, world_dir).replace(os.sep, '/'), path
+
+
+def list_world_snapshots(world_dir=None):
+    """
+    Returns the snapshot manifests of a world (or of every world when world_dir is None),
+    newest first.
+    """
+    if world_dir is not None:
+        folders = [os.path.join(SNAPSHOT_WORLDS_DIR, _world_key(world_dir))]
+    elif os.path.isdir(SNAPSHOT_WORLDS_DIR):
+        folders = [os.path.join(SNAPSHOT_WORLDS_DIR, name) for name in os.listdir(SNAPSHOT_WORLDS_DIR)]
+    else:
+        folders = []
+
+    snapshots = []
+    for folder in folders:
+        if not os.path.isdir(folder):
+            continue
+        for filename in os.listdir(folder):
+            if not filename.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(folder, filename), 'r', encoding='utf-8') as f:
+                    snapshots.append(json.load(f))
+            except (json.JSONDecodeError, IOError) as e:
+                print(f"DEBUG: Ignoring unreadable snapshot manifest '{filename}': {e}")
+    snapshots.sort(key=lambda snapshot: snapshot.get('created_at', 0), reverse=True)
+    return snapshots
+
+
+def _get_snapshot_manifest_path(world_dir, snapshot_id):
+    return os.path.join(SNAPSHOT_WORLDS_DIR, _world_key(world_dir), f"{snapshot_id}.json")
+
+
+def create_world_snapshot(world_dir, label="", retention=DEFAULT_SNAPSHOT_RETENTION):
+    """
+    Saves the current state of a world before it gets overwritten. label is free text shown
+    with the snapshot (the map version about to be installed).
+    Files are stored by SHA-256 in a shared object store, so a snapshot only costs the
+    bytes that changed since the previous ones; files whose size and mtime did not change
+    since the latest snapshot are not even rehashed. Objects are reflinked when the
+    filesystem allows it (never hard-linked: the game rewrites world files in place).
+    Returns the snapshot manifest, or None if the world is empty or missing.
+    """
+    if not os.path.isdir(world_dir):
+        return None
+    with _locked_store():
+        return _create_world_snapshot(world_dir, label, retention)
+
+
+def _create_world_snapshot(world_dir, label, retention):
+    previous = list_world_snapshots(world_dir)
+    known_files = previous[0].get('files', {}) if previous else {}
+    files = {}
+    stats = {"stored": 0, "reused": 0, "bytes_stored": 0}
+
+    for relative_path, path in _iter_world_files(world_dir):
+        st = os.stat(path)
+        known = known_files.get(relative_path)
+        if known and known[1] == st.st_size and known[2] == st.st_mtime_ns and os.path.exists(_object_path(known[0])):
+            sha256 = known[0]
+        else:
+            sha256 = compute_file_sha256(path)
+        object_path = _object_path(sha256)
+        if os.path.exists(object_path):
+            stats["reused"] += 1
+        else:
+            link_or_copy(path, object_path, allow_hardlink=False)
+            stats["stored"] += 1
+            stats["bytes_stored"] += st.st_size
+        files[relative_path] = [sha256, st.st_size, st.st_mtime_ns]
+
+    if not files:
+        return None
+
+    created_at = time.time()
+    manifest = {
+        "id": f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(created_at))}-{uuid.uuid4().hex[:6]}",
+        "world_dir": os.path.abspath(world_dir),
+        "world_name": os.path.basename(os.path.normpath(world_dir)),
+        "label": label,
+        "created_at": created_at,
+        "files": files
+    }
+    manifest_path = _get_snapshot_manifest_path(world_dir, manifest['id'])
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    temp_path = f"{manifest_path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, separators=(',', ':'))
+    os.replace(temp_path, manifest_path)
+    print(f"DEBUG: Snapshot '{manifest['id']}' of '{world_dir}': {stats}")
+
+    prune_world_snapshots(world_dir, retention)
+    return manifest
+
+
+def delete_world_snapshot(snapshot):
+    """Deletes one snapshot manifest, then the objects no snapshot references anymore."""
+    manifest_path = _get_snapshot_manifest_path(snapshot['world_dir'], snapshot['id'])
+    with _locked_store():
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+        collect_unreferenced_objects()
+
+
+def prune_world_snapshots(world_dir, retention=DEFAULT_SNAPSHOT_RETENTION):
+    """Keeps only the `retention` newest snapshots of a world."""
+    with _locked_store():
+        removed = 0
+        for snapshot in list_world_snapshots(world_dir)[max(retention, 0):]:
+            os.remove(_get_snapshot_manifest_path(world_dir, snapshot['id']))
+            removed += 1
+        if removed:
+            collect_unreferenced_objects()
+
+
+def collect_unreferenced_objects():
+    """Deletes the stored files that no snapshot manifest references. Returns the bytes freed."""
+    with _locked_store():
+        referenced = {record[0] for snapshot in list_world_snapshots() for record in snapshot.get('files', {}).values()}
+        freed = 0
+        if not os.path.isdir(SNAPSHOT_OBJECTS_DIR):
+            return freed
+        for root, _, files in os.walk(SNAPSHOT_OBJECTS_DIR):
+            for filename in files:
+                if filename not in referenced:
+                    path = os.path.join(root, filename)
+                    freed += os.path.getsize(path)
+                    os.remove(path)
+                    remove_empty_parents(path, SNAPSHOT_OBJECTS_DIR)
+        print(f"DEBUG: Snapshot store cleanup freed {freed} bytes.")
+        return freed
+
+
+def restore_world_snapshot(snapshot):
+    """
+    Puts a world back in the state of a snapshot: changed or deleted files are restored from
+    the object store and files created since the snapshot are removed.
+    Returns a dict of statistics: restored, unchanged, removed.
+    """
+    world_dir = snapshot['world_dir']
+    files = snapshot.get('files', {})
+    stats = {"restored": 0, "unchanged": 0, "removed": 0}
+
+    for relative_path, (sha256, size, mtime_ns) in files.items():
+        path = safe_join(world_dir, relative_path)
+        if path is None:
+            continue
+        if os.path.isfile(path):
+            st = os.stat(path)
+            if st.st_size == size and (st.st_mtime_ns == mtime_ns or compute_file_sha256(path) == sha256):
+                stats["unchanged"] += 1
+                continue
+        object_path = _object_path(sha256)
+        if not os.path.exists(object_path):
+            raise Exception(f"The snapshot is incomplete: the stored copy of '{relative_path}' is missing.")
+        link_or_copy(object_path, path, allow_hardlink=False)
+        stats["restored"] += 1
+
+    if os.path.isdir(world_dir):
+        for relative_path, path in list(_iter_world_files(world_dir)):
+            if relative_path not in files:
+                os.remove(path)
+                remove_empty_parents(path, world_dir)
+                stats["removed"] += 1
+
+    print(f"DEBUG: Snapshot '{snapshot['id']}' restored into '{world_dir}': {stats}")
+    return stats
+
+
+class SnapshotRestoreThread(QThread):
+    """Runs restore_world_snapshot off the GUI thread."""
+    restore_finished = pyqtSignal(dict) # Statistics
+    restore_error = pyqtSignal(str)
+
+    def __init__(self, snapshot):
+        super().__init__()
+        self.snapshot = snapshot
+
+    def run(self):
+        try:
+            self.restore_finished.emit(restore_world_snapshot(self.snapshot))
+        except Exception as e:
+            self.restore_error.emit(str(e))